@@ -0,0 +1,5 @@
+from src.utils.config import Config
+from src.asgi import create_asgi_app
+
+config = Config('config.yaml')
+application = create_asgi_app(config.flask)
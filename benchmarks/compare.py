@@ -0,0 +1,63 @@
+"""Сравнение результатов двух запусков benchmarks.run по медианному времени.
+
+    python -m benchmarks.compare old.json new.json
+"""
+import sys
+import json
+import argparse
+from typing import Dict, List, Tuple
+
+
+def compare(old: dict, new: dict) -> List[Tuple[str, float, float, float]]:
+    """Сопоставляет замеры с одинаковыми названиями.
+
+    Args:
+        old: Результаты предыдущего запуска.
+        new: Результаты нового запуска.
+
+    Returns:
+        Название замера, медианы старого и нового запуска в миллисекундах и
+        их отношение.
+    """
+    old_results: Dict[str, dict] = {x['name']: x for x in old['results']}
+    rows = []
+    for result in new['results']:
+        previous = old_results.get(result['name'])
+        if previous is None:
+            continue
+        ratio = result['median_ms'] / previous['median_ms']
+        rows.append((result['name'], previous['median_ms'],
+                     result['median_ms'], ratio))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('old')
+    parser.add_argument('new')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='доля изменения, начиная с которой замер '
+                             'отмечается как ускорение или замедление')
+    args = parser.parse_args()
+
+    with open(args.old) as file:
+        old = json.load(file)
+    with open(args.new) as file:
+        new = json.load(file)
+
+    rows = compare(old, new)
+    width = max((len(x[0]) for x in rows), default=0)
+    for (name, old_ms, new_ms, ratio) in rows:
+        mark = ''
+        if ratio > 1 + args.threshold:
+            mark = 'slower'
+        elif ratio < 1 - args.threshold:
+            mark = 'faster'
+        print(f'{name:<{width}}  {old_ms:10.2f}  {new_ms:10.2f}  '
+              f'{ratio:6.2f}x  {mark}')
+    if not rows:
+        print('No common results.', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,371 @@
+"""Замеры скорости извлечения и кодирования кадров и обработки запросов
+на синтетических видеофайлах.
+
+    python -m benchmarks.run --profile quick --output bench.json
+    python -m benchmarks.compare old.json bench.json
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import cv2
+
+from benchmarks.synthetic_videos import VideoSpec, make_video
+from src.utils.config import Config
+
+PROFILES = {
+    'quick': {
+        "videos": [
+            VideoSpec(320, 240, 10, 'mp4v'),
+            VideoSpec(1280, 720, 10, 'mp4v'),
+        ],
+        "repeat": 3,
+    },
+    'full': {
+        "videos": [
+            VideoSpec(320, 240, 10, 'mp4v'),
+            VideoSpec(1280, 720, 10, 'mp4v'),
+            VideoSpec(1280, 720, 60, 'mp4v'),
+            VideoSpec(1920, 1080, 60, 'mp4v'),
+            VideoSpec(1280, 720, 60, 'avc1'),
+            VideoSpec(1280, 720, 10, 'MJPG', extension='avi'),
+        ],
+        "repeat": 5,
+    },
+}
+
+# доли длительности видео, на которых извлекаются кадры
+TIME_FRACTIONS = (0, 0.25, 0.5, 0.75, 0.9)
+
+
+def _measure(func: Callable[[], object], repeat: int) -> List[float]:
+    """Возвращает время выполнения функции в миллисекундах."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _result(name: str, samples: List[float], **extra) -> dict:
+    result = {
+        "name": name,
+        "samples_ms": [round(x, 3) for x in samples],
+        "median_ms": round(statistics.median(samples), 3),
+        "min_ms": round(min(samples), 3),
+        "mean_ms": round(statistics.mean(samples), 3),
+    }
+    result.update(extra)
+    return result
+
+
+def _times_in_video(spec: VideoSpec) -> List[int]:
+    return sorted({int(spec.duration * x) for x in TIME_FRACTIONS})
+
+
+def bench_extraction(spec: VideoSpec,
+                     video_path: str,
+                     repeat: int,
+                     linear: bool) -> List[dict]:
+    """Замеряет построение индекса видеофайла и извлечение кадров в
+    зависимости от времени от начала видеофайла.
+    """
+    from src.utils.get_frames import extract_frame
+    from src.utils.video_index import build_video_index, get_video_index
+
+    results = [_result(f'index/{spec.name}',
+                       _measure(lambda: build_video_index(video_path), 1),
+                       video=spec.to_dict())]
+    get_video_index(video_path)
+
+    modes = [('seek', True)] + ([('linear', False)] if linear else [])
+    for time_in_video in _times_in_video(spec):
+        for (mode, seek) in modes:
+            first_frame, frames = extract_frame(video_path, time_in_video,
+                                                seek)
+            if first_frame is None:
+                continue
+            samples = _measure(
+                lambda: extract_frame(video_path, time_in_video, seek),
+                repeat
+            )
+            results.append(_result(
+                f'extract/{spec.name}/t={time_in_video}/{mode}', samples,
+                video=spec.to_dict(), time_in_video=time_in_video,
+                frames=len(frames)
+            ))
+    return results
+
+
+def bench_encoding(spec: VideoSpec,
+                   video_path: str,
+                   repeat: int) -> List[dict]:
+    """Замеряет пропускную способность кодирования кадров в каждом формате
+    с качеством по умолчанию.
+    """
+    from src.utils.encode_frames import (FRAME_FORMATS, encode_frames,
+                                         resolve_encoding)
+    from src.utils.get_frames import extract_frame
+
+    _, frames = extract_frame(video_path, 0)
+    if not frames:
+        return []
+    results = []
+    for name in FRAME_FORMATS:
+        frame_format, quality = resolve_encoding(name)
+        sizes = []
+
+        def encode() -> None:
+            sizes[:] = [len(x) for x in encode_frames(frames, frame_format,
+                                                       quality)]
+
+        samples = _measure(encode, repeat)
+        results.append(_result(
+            f'encode/{spec.name}/{name}', samples,
+            video=spec.to_dict(), format=name, quality=quality,
+            frames=len(frames),
+            frames_per_second=round(
+                len(frames) * 1000 / statistics.median(samples), 2),
+            mean_frame_size=int(statistics.mean(sizes)),
+        ))
+    return results
+
+
+def bench_endpoints(spec: VideoSpec,
+                    app,
+                    frames_dir_path: str,
+                    repeat: int) -> List[dict]:
+    """Замеряет обработку запросов к /api/frames через тестовый клиент Flask:
+    первый запрос с извлечением кадров, повторные запросы из кеша и
+    потоковую передачу кадров без сохранения на диск.
+    """
+    client = app.test_client()
+    results = []
+    for time_in_video in _times_in_video(spec):
+        url = (f'/api/frames?file_name={spec.file_name}'
+               f'&time_in_video={time_in_video}')
+        requests = {
+            'frames/cold': (url, 1),
+            'frames/warm': (url, repeat),
+            'frames/thumbnail-w320': (f'{url}&width=320', 1),
+            'frames/sparse-step30': (f'{url}&count=12&step=30', 1),
+            'frames/stream-zip': (f'{url}&stream=zip&format=jpeg', repeat),
+            'frames/stream-multipart': (
+                f'{url}&stream=multipart&format=jpeg', repeat),
+        }
+        for (name, (request_url, request_repeat)) in requests.items():
+            status_codes = set()
+
+            def get() -> None:
+                response = client.get(request_url)
+                response.get_data()
+                status_codes.add(response.status_code)
+
+            samples = _measure(get, request_repeat)
+            if status_codes != {200}:
+                continue
+            results.append(_result(
+                f'endpoint/{spec.name}/t={time_in_video}/{name}', samples,
+                video=spec.to_dict(), time_in_video=time_in_video
+            ))
+    shutil.rmtree(frames_dir_path)
+    os.mkdir(frames_dir_path)
+    return results
+
+
+# создание приложения так же, как в app.py, без фонового сканирования
+_APP_CODE = """
+from src.utils.config import Config
+config = Config('config.yaml')
+config.flask['VIDEO_SCAN_INTERVAL'] = 0
+from src import create_flask_app
+create_flask_app(config.flask)
+"""
+_FRAME_MODULES_CODE = """
+from src.utils.preload import import_frame_modules
+import_frame_modules()
+"""
+# код, время выполнения которого замеряется в новом процессе
+STARTUP_CASES = {
+    'import-videos-route': 'import src.routes.videos',
+    'app': _APP_CODE,
+    'app-frame-modules': _APP_CODE + _FRAME_MODULES_CODE,
+}
+_STARTUP_SCRIPT = """
+import sys, json, time
+start = time.perf_counter()
+{code}
+print(json.dumps([time.perf_counter() - start, 'cv2' in sys.modules]))
+"""
+# запуск worker'а из главного процесса, создавшего приложение заранее
+_FORK_SCRIPT = _APP_CODE + _FRAME_MODULES_CODE + """
+import os, json, time
+samples = []
+for _ in range({repeat}):
+    start = time.perf_counter()
+    pid = os.fork()
+    if pid == 0:
+        os._exit(0)
+    os.waitpid(pid, 0)
+    samples.append(time.perf_counter() - start)
+print(json.dumps(samples))
+"""
+
+
+def _run_python(code: str) -> object:
+    """Выполняет код в новом процессе интерпретатора и возвращает
+    последнюю строку его вывода, разобранную как JSON.
+    """
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True,
+                            text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def bench_startup(repeat: int) -> List[dict]:
+    """Замеряет запуск процесса приложения: импорт маршрутов, создание
+    приложения без OpenCV и с ним, как при первом запросе к кадрам,
+    и запуск worker'а через fork из процесса с созданным приложением, как
+    в gunicorn с preload_app.
+    """
+    results = []
+    for (name, code) in STARTUP_CASES.items():
+        samples = []
+        for _ in range(repeat):
+            seconds, opencv_loaded = _run_python(
+                _STARTUP_SCRIPT.format(code=code))
+            samples.append(seconds * 1000)
+        results.append(_result(f'startup/{name}', samples,
+                               opencv_loaded=opencv_loaded))
+    samples = _run_python(_FORK_SCRIPT.format(repeat=repeat))
+    results.append(_result('startup/preload-fork',
+                           [x * 1000 for x in samples]))
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+            check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def run(profile: str,
+        work_dir: str,
+        linear: bool,
+        stages: List[str]) -> Dict[str, object]:
+    """Создаёт синтетические видеофайлы и выполняет замеры.
+
+    Args:
+        profile: Набор видеофайлов и количество повторов.
+        work_dir: Каталог для видеофайлов, индексов и кадров.
+        linear: Замерять также последовательное чтение без позиционирования.
+        stages: Этапы замеров: extract, encode, endpoint, startup.
+
+    Returns:
+        Описание окружения и результаты замеров.
+    """
+    video_dir_path = os.path.join(work_dir, 'videos')
+    os.makedirs(video_dir_path, exist_ok=True)
+    run_dir = tempfile.mkdtemp(dir=work_dir)
+    frames_dir_path = os.path.join(run_dir, 'frames')
+    os.mkdir(frames_dir_path)
+
+    # каталоги запуска вместо каталогов приложения
+    config = Config()
+    config.flask['VIDEOS_DIR_PATH'] = video_dir_path
+    config.flask['FRAMES_DIR_PATH'] = frames_dir_path
+    config.flask['VIDEO_INDEX_DIR_PATH'] = os.path.join(run_dir, 'index')
+    config.flask['FRAME_CACHE_INDEX_PATH'] = os.path.join(
+        run_dir, 'frame_cache.sqlite3')
+    config.flask['VIDEO_SCAN_INTERVAL'] = 0
+    os.mkdir(config.flask['VIDEO_INDEX_DIR_PATH'])
+
+    from src import create_flask_app
+    app = create_flask_app(config.flask)
+
+    results = []
+    skipped = []
+    settings = PROFILES[profile]
+    repeat = settings['repeat']
+    try:
+        if 'startup' in stages:
+            print('startup', file=sys.stderr)
+            results.extend(bench_startup(repeat))
+        for spec in settings['videos']:
+            print(f'{spec.name}: generating', file=sys.stderr)
+            video_path = make_video(spec, video_dir_path)
+            if video_path is None:
+                skipped.append({"video": spec.to_dict(),
+                                "reason": "Codec is not available."})
+                continue
+            if 'extract' in stages:
+                print(f'{spec.name}: extract', file=sys.stderr)
+                results.extend(bench_extraction(spec, video_path, repeat,
+                                                linear))
+            if 'encode' in stages:
+                print(f'{spec.name}: encode', file=sys.stderr)
+                results.extend(bench_encoding(spec, video_path, repeat))
+            if 'endpoint' in stages:
+                print(f'{spec.name}: endpoint', file=sys.stderr)
+                results.extend(bench_endpoints(spec, app, frames_dir_path,
+                                               repeat))
+    finally:
+        shutil.rmtree(run_dir)
+
+    return {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(),
+            "git_commit": _git_commit(),
+            "profile": profile,
+            "repeat": repeat,
+            "python": platform.python_version(),
+            "opencv": cv2.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "config": {
+                key: config.flask[key]
+                for key in ('SAVE_FRAMES_COUNT', 'FRAME_FORMAT',
+                            'FRAME_QUALITY', 'ENCODE_THREADS')
+            },
+        },
+        "skipped": skipped,
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--profile', choices=PROFILES, default='quick')
+    parser.add_argument('--work-dir', default='.benchmarks',
+                        help='каталог для синтетических видеофайлов, '
+                             'созданные видеофайлы переиспользуются')
+    parser.add_argument('--output', default='bench.json',
+                        help='файл с результатами в формате JSON')
+    parser.add_argument('--linear', action='store_true',
+                        help='замерять также извлечение без позиционирования')
+    parser.add_argument('--stages', default='extract,encode,endpoint,startup')
+    args = parser.parse_args()
+
+    report = run(args.profile, args.work_dir, args.linear,
+                 args.stages.split(','))
+    with open(args.output, 'w') as file:
+        json.dump(report, file, indent=2, ensure_ascii=False)
+    print(f'{len(report["results"])} results written to {args.output}',
+          file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
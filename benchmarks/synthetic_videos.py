@@ -0,0 +1,119 @@
+import os
+from typing import Optional
+
+import cv2
+import numpy as np
+
+
+class VideoSpec:
+    """Параметры синтетического видеофайла.
+
+    Attributes:
+        width: Ширина кадра.
+        height: Высота кадра.
+        duration: Длительность в секундах.
+        fps: Количество кадров в секунду.
+        codec: FourCC кодека.
+        extension: Расширение файла.
+    """
+
+    def __init__(self,
+                 width: int,
+                 height: int,
+                 duration: int,
+                 codec: str,
+                 fps: int = 30,
+                 extension: str = 'mp4',
+                 ) -> None:
+        """Инициализирует экземпляр класса.
+
+        Args:
+            width: Ширина кадра.
+            height: Высота кадра.
+            duration: Длительность в секундах.
+            codec: FourCC кодека.
+            fps: Количество кадров в секунду.
+            extension: Расширение файла.
+        """
+        self.width = width
+        self.height = height
+        self.duration = duration
+        self.codec = codec
+        self.fps = fps
+        self.extension = extension
+
+    @property
+    def name(self) -> str:
+        """Имя видео в результатах замеров."""
+        return (f'{self.width}x{self.height}-{self.duration}s-'
+                f'{self.codec}-{self.fps}fps')
+
+    @property
+    def file_name(self) -> str:
+        """Имя видеофайла."""
+        return f'{self.name}.{self.extension}'
+
+    def to_dict(self) -> dict:
+        return {
+            "width": self.width,
+            "height": self.height,
+            "duration": self.duration,
+            "codec": self.codec,
+            "fps": self.fps,
+        }
+
+
+def _render_frame(spec: VideoSpec,
+                  frame_number: int,
+                  noise: np.ndarray) -> np.ndarray:
+    """Рисует кадр: движущийся градиент, шум и номер кадра. Шум делает
+    сжатие похожим на сжатие настоящего видео, номер кадра позволяет
+    проверить извлечённые кадры глазами.
+    """
+    x = np.arange(spec.width, dtype=np.uint16)
+    y = np.arange(spec.height, dtype=np.uint16)[:, None]
+    shift = frame_number * 4
+    frame = np.empty((spec.height, spec.width, 3), dtype=np.uint8)
+    frame[..., 0] = (x + shift) % 256
+    frame[..., 1] = (y + shift) % 256
+    frame[..., 2] = (x + y) % 256
+    frame += np.roll(noise, frame_number, axis=1)
+    cv2.putText(frame, str(frame_number), (10, spec.height // 2),
+                cv2.FONT_HERSHEY_SIMPLEX, spec.height / 200,
+                (255, 255, 255), max(1, spec.height // 120))
+    return frame
+
+
+def make_video(spec: VideoSpec, video_dir_path: str) -> Optional[str]:
+    """Создаёт синтетический видеофайл, если его ещё нет. При одних и тех же
+    параметрах содержимое кадров одинаковое.
+
+    Args:
+        spec: Параметры видеофайла.
+        video_dir_path: Каталог с видеофайлами.
+
+    Returns:
+        Полный путь к видеофайлу или None, если кодек недоступен.
+    """
+    video_path = os.path.join(video_dir_path, spec.file_name)
+    if os.path.isfile(video_path):
+        return video_path
+
+    tmp_path = os.path.join(video_dir_path, f'tmp-{spec.file_name}')
+    writer = cv2.VideoWriter(tmp_path, cv2.VideoWriter_fourcc(*spec.codec),
+                             spec.fps, (spec.width, spec.height))
+    if not writer.isOpened():
+        writer.release()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return None
+    try:
+        rng = np.random.default_rng(0)
+        noise = rng.integers(0, 16, (spec.height, spec.width, 3),
+                             dtype=np.uint8)
+        for frame_number in range(spec.duration * spec.fps):
+            writer.write(_render_frame(spec, frame_number, noise))
+    finally:
+        writer.release()
+    os.replace(tmp_path, video_path)
+    return video_path
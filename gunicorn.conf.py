@@ -0,0 +1,43 @@
+import os
+
+from src.utils.config import Config
+
+# в режиме нескольких процессов prometheus_client выбирает хранилище значений
+# при импорте, поэтому каталог задаётся до импорта модулей приложения
+metrics_dir_path = Config('config.yaml').flask.get('METRICS_DIR_PATH')
+if metrics_dir_path:
+    os.makedirs(metrics_dir_path, exist_ok=True)
+    os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', metrics_dir_path)
+
+from src.utils.metrics import (clear_metrics_dir,  # noqa: E402
+                               mark_process_dead)
+from src.utils.preload import import_frame_modules  # noqa: E402
+from src.utils.video_catalog import (defer_video_scanner,  # noqa: E402
+                                     start_deferred_video_scanners)
+
+# с preload_app конфигурационный файл читается и приложение создаётся
+# один раз в главном процессе, worker'ы получают их через fork
+preload_app = Config().flask['PRELOAD_APP']
+
+if preload_app:
+    defer_video_scanner()
+
+
+def on_starting(server) -> None:
+    """Удаляет метрики процессов предыдущего запуска сервера."""
+    clear_metrics_dir()
+    if server.cfg.preload_app:
+        import_frame_modules()
+
+
+def post_worker_init(worker) -> None:
+    """Запускает в worker'е фоновые потоки, отложенные в главном процессе.
+    Соединения с БД, открытые видеофайлы и пулы потоков создаются заново
+    в каждом процессе.
+    """
+    start_deferred_video_scanners()
+
+
+def child_exit(server, worker) -> None:
+    """Удаляет метрики завершённого процесса gunicorn."""
+    mark_process_dead(worker.pid)
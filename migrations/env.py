@@ -0,0 +1,55 @@
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine
+
+from src.models import db
+from src.utils.config import Config
+
+config = context.config
+# соединение передаётся при запуске миграций из кода, например из тестов
+connection = config.attributes.get('connection')
+
+if config.config_file_name is not None and connection is None:
+    fileConfig(config.config_file_name)
+
+target_metadata = db.metadata
+
+
+def database_uri() -> str:
+    """Возвращает адрес БД из конфигурационного файла приложения."""
+    return Config('config.yaml').flask['SQLALCHEMY_DATABASE_URI']
+
+
+def run_migrations_offline() -> None:
+    """Выводит SQL миграций без подключения к БД."""
+    context.configure(url=database_uri(),
+                      target_metadata=target_metadata,
+                      literal_binds=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Применяет миграции к БД."""
+    if connection is not None:
+        context.configure(connection=connection,
+                          target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+    engine = create_engine(database_uri())
+    try:
+        with engine.connect() as new_connection:
+            context.configure(connection=new_connection,
+                              target_metadata=target_metadata)
+            with context.begin_transaction():
+                context.run_migrations()
+    finally:
+        engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
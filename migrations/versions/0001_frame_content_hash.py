@@ -0,0 +1,27 @@
+"""Ключ хранилища кадров в frame_service_information
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # таблица могла быть создана через db.create_all() уже со столбцом
+    op.execute("ALTER TABLE frame_service_information "
+               "ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64)")
+    op.execute("CREATE INDEX IF NOT EXISTS "
+               "ix_frame_service_information_content_hash "
+               "ON frame_service_information (content_hash)")
+
+
+def downgrade() -> None:
+    op.drop_index('ix_frame_service_information_content_hash',
+                  table_name='frame_service_information')
+    op.drop_column('frame_service_information', 'content_hash')
@@ -0,0 +1,49 @@
+"""Время, размер и формат кадров в frame_service_information
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+_COLUMNS = (
+    ('timestamp', 'DOUBLE PRECISION'),
+    ('width', 'INTEGER'),
+    ('height', 'INTEGER'),
+    ('file_size', 'BIGINT'),
+    ('format', 'VARCHAR(8)'),
+)
+
+
+def _backfill() -> None:
+    """Заполняет формат сохранённых кадров по расширению файла. Время и
+    размер кадров заполняет restore_init_db.py --backfill-metadata, так как
+    для них нужны индексы видеофайлов.
+    """
+    op.execute("UPDATE frame_service_information SET format = CASE "
+               "WHEN frame_file_path LIKE '%.png' THEN 'png' "
+               "WHEN frame_file_path LIKE '%.jpg' THEN 'jpeg' "
+               "WHEN frame_file_path LIKE '%.webp' THEN 'webp' END "
+               "WHERE format IS NULL")
+
+
+def upgrade() -> None:
+    for (name, column_type) in _COLUMNS:
+        op.execute(f"ALTER TABLE frame_service_information "
+                   f"ADD COLUMN IF NOT EXISTS {name} {column_type}")
+    op.execute("CREATE INDEX IF NOT EXISTS "
+               "ix_frame_service_information_video_timestamp "
+               "ON frame_service_information (video_file_name, timestamp)")
+    _backfill()
+
+
+def downgrade() -> None:
+    op.drop_index('ix_frame_service_information_video_timestamp',
+                  table_name='frame_service_information')
+    for (name, _) in reversed(_COLUMNS):
+        op.drop_column('frame_service_information', name)
@@ -0,0 +1,26 @@
+"""Перцептивный хеш кадров в frame_service_information
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE frame_service_information "
+               "ADD COLUMN IF NOT EXISTS perceptual_hash VARCHAR(64)")
+    op.execute("CREATE INDEX IF NOT EXISTS "
+               "ix_frame_service_information_perceptual_hash "
+               "ON frame_service_information (perceptual_hash)")
+
+
+def downgrade() -> None:
+    op.drop_index('ix_frame_service_information_perceptual_hash',
+                  table_name='frame_service_information')
+    op.drop_column('frame_service_information', 'perceptual_hash')
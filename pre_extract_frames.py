@@ -0,0 +1,84 @@
+"""Извлечение и сохранение кадров видеофайлов из каталога с видео через
+равные интервалы времени без обращения к HTTP API.
+
+    python pre_extract_frames.py --interval 10 --register
+"""
+import os
+import sys
+import argparse
+from contextlib import nullcontext
+
+from src.utils.config import Config
+from src.utils.encode_frames import FRAME_FORMATS, validate_encoding_params
+from src.utils.pre_extraction import Schedule, pre_extract
+from src.utils.video_index import get_video_index
+from src import create_flask_app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('file_names', nargs='*',
+                        help='имена видеофайлов, по умолчанию все файлы '
+                             'каталога с видео')
+    parser.add_argument('--interval', type=int, default=10,
+                        help='интервал между моментами времени в секундах')
+    parser.add_argument('--start', type=int, default=0,
+                        help='время первого момента в секундах')
+    parser.add_argument('--end', type=int, default=None,
+                        help='время, до которого извлекаются кадры, '
+                             'в секундах')
+    parser.add_argument('--format', choices=FRAME_FORMATS, default=None)
+    parser.add_argument('--quality', type=int, default=None)
+    parser.add_argument('--count', type=int, default=None,
+                        help='количество кадров для каждого момента времени')
+    parser.add_argument('--step', type=int, default=1,
+                        help='разница номеров соседних кадров')
+    parser.add_argument('--processes', type=int, default=None,
+                        help='количество процессов, по умолчанию по числу '
+                             'ядер')
+    parser.add_argument('--chunk-size', type=int, default=20,
+                        help='количество моментов времени в задаче процесса')
+    parser.add_argument('--journal', default='pre_extract_frames.jsonl',
+                        help='журнал обработанных моментов времени для '
+                             'продолжения после остановки')
+    parser.add_argument('--register', action='store_true',
+                        help='сохранять служебную информацию о кадрах в БД')
+    args = parser.parse_args()
+    if args.interval < 1 or args.step < 1 or (args.count is not None
+                                              and args.count < 1):
+        parser.error('--interval, --count and --step must be positive')
+    if args.start < 0:
+        parser.error('--start must not be negative')
+    if args.end is not None and args.end <= args.start:
+        parser.error('--end must be greater than --start')
+    validation_failed, _, _ = validate_encoding_params(args.format,
+                                                       args.quality)
+    if validation_failed is not None:
+        parser.error(f'--quality: {validation_failed["quality"]}')
+
+    config = Config('config.yaml')
+    config.flask['VIDEO_SCAN_INTERVAL'] = 0
+    for file_name in args.file_names:
+        video_path = os.path.join(config.flask['VIDEOS_DIR_PATH'], file_name)
+        if not os.path.isfile(video_path):
+            parser.error(f"{file_name}: file doesn't exist")
+        # неоткрывающиеся видеофайлы учитываются в итогах
+        index = get_video_index(video_path)
+        if (index is not None and index.duration > 0
+                and args.start >= index.duration):
+            parser.error(f'--start: {file_name} is {index.duration:g} '
+                         f'seconds long')
+    schedule = Schedule(args.interval, args.start, args.end, args.format,
+                        args.quality, args.count, args.step)
+    context = nullcontext()
+    if args.register:
+        context = create_flask_app(config.flask).app_context()
+    with context:
+        summary = pre_extract(schedule, args.journal, args.file_names or None,
+                              args.processes, args.chunk_size, args.register)
+    print(', '.join(f'{key}: {value}' for (key, value) in summary.items()),
+          file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,53 @@
+"""Создание таблиц базы данных.
+
+    python restore_init_db.py            # пересоздать таблицы
+    python restore_init_db.py --upgrade  # применить миграции, сохранив данные
+    python restore_init_db.py --backfill-metadata  # заполнить сведения
+                                                   # о сохранённых кадрах
+"""
+import argparse
+
+from alembic import command
+from alembic.config import Config as AlembicConfig
+
 from src.utils.config import Config
 from src.models import db
+from src.utils.pre_extraction import backfill_frame_metadata
 from src import create_flask_app
 
 
-if __name__ == '__main__':
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--upgrade', action='store_true',
+                        help='не удалять таблицы и данные, а создать '
+                             'недостающие таблицы и применить миграции')
+    parser.add_argument('--backfill-metadata', action='store_true',
+                        help='только заполнить время, размеры и формат у '
+                             'сохранённых кадров по индексам видеофайлов')
+    args = parser.parse_args()
+
     config = Config('config.yaml')
+    config.flask['VIDEO_SCAN_INTERVAL'] = 0
     app = create_flask_app(config.flask)
 
     with app.app_context():
-        db.drop_all()
+        if args.backfill_metadata:
+            print(f'Updated frames: {backfill_frame_metadata()}')
+            return
+        if not args.upgrade:
+            db.drop_all()
+        # существующие таблицы не изменяются, их приводят к схеме миграции
         db.create_all()
         db.session.commit()
+        with db.engine.begin() as connection:
+            alembic_config = AlembicConfig('alembic.ini')
+            alembic_config.attributes['connection'] = connection
+            if args.upgrade:
+                command.upgrade(alembic_config, 'head')
+            else:
+                # таблицы созданы по моделям, миграции к ним применять не нужно
+                command.stamp(alembic_config, 'head', purge=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,9 @@
 from flask import Flask
 
-from src.models import db
-from src.routes import frames_bp, saved_frames_bp, videos_bp
+from src.models import init_db
+from src.routes import frames_bp, metrics_bp, saved_frames_bp, videos_bp
+from src.utils.metrics import init_metrics
+from src.utils.video_catalog import start_video_scanner
 
 
 def create_flask_app(config: dict) -> Flask:
@@ -19,6 +21,9 @@ def create_flask_app(config: dict) -> Flask:
     app.register_blueprint(videos_bp, url_prefix='/api/videos')
     app.register_blueprint(frames_bp, url_prefix='/api/frames')
     app.register_blueprint(saved_frames_bp, url_prefix='/api/saved_frames')
+    app.register_blueprint(metrics_bp, url_prefix='/metrics')
 
-    db.init_app(app)
+    init_db(app)
+    init_metrics(app)
+    start_video_scanner(app)
     return app
@@ -0,0 +1,274 @@
+import io
+import os
+import sys
+import json
+import time
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Awaitable, Callable, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl
+
+from werkzeug.datastructures import MultiDict
+
+from src import create_flask_app
+from src.routes.frames import FramesQuery, parse_frames_query
+from src.utils.config import Config
+from src.utils.metrics import REQUEST_SECONDS, timed
+
+Receive = Callable[[], Awaitable[dict]]
+Send = Callable[[dict], Awaitable[None]]
+
+
+def _init_worker(flask_config: dict) -> None:
+    """Передаёт процессу пула конфигурацию родительского процесса."""
+    Config().flask.update(flask_config)
+
+
+class AsgiApp:
+    """ASGI приложение. Запрос GET /api/frames обрабатывается в цикле
+    событий: проверка параметров и поиск в кеше выполняются в пуле потоков,
+    а извлечение и кодирование кадров в пуле процессов, поэтому ожидающие
+    извлечения запросы не занимают потоки. Остальные запросы передаются
+    Flask приложению, которое выполняется в пуле потоков.
+
+        uvicorn asgi:application --workers 4
+    """
+
+    def __init__(self, config: dict) -> None:
+        """Инициализирует экземпляр класса.
+
+        Args:
+            config: Конфигурация Flask приложения.
+        """
+        self.flask_app = create_flask_app(config)
+        self._config = config
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._executors_pid: Optional[int] = None
+
+    def _get_executors(
+            self
+        ) -> Tuple[ThreadPoolExecutor, ProcessPoolExecutor]:
+        """Возвращает пулы потоков и процессов, созданные в текущем
+        процессе.
+        """
+        if self._executors_pid != os.getpid():
+            self._threads = ThreadPoolExecutor(
+                max_workers=self._config['ASYNC_THREADS'],
+                thread_name_prefix='asgi'
+            )
+            # процессы создаются через spawn, так как в родительском процессе
+            # работают потоки пула и цикл событий
+            self._processes = ProcessPoolExecutor(
+                max_workers=self._config['ASYNC_EXTRACTION_WORKERS'],
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(self._config,)
+            )
+            self._executors_pid = os.getpid()
+        return self._threads, self._processes
+
+    def close(self) -> None:
+        """Завершает пулы потоков и процессов."""
+        if self._executors_pid == os.getpid():
+            self._processes.shutdown()
+            self._threads.shutdown()
+            self._executors_pid = None
+
+    async def __call__(self, scope: dict, receive: Receive,
+                       send: Send) -> None:
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] != 'http':
+            return
+        elif (scope['method'] == 'GET'
+              and scope['path'] == scope.get('root_path', '') + '/api/frames'):
+            await self._get_frames(scope, receive, send)
+        else:
+            await self._call_wsgi(scope, receive, send)
+
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({"type": "lifespan.startup.complete"})
+            elif message['type'] == 'lifespan.shutdown':
+                await asyncio.get_running_loop().run_in_executor(
+                    None, self.close)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _run_in_thread(self, func: Callable, *args):
+        threads, _ = self._get_executors()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(threads, func, *args)
+
+    async def _get_frames(self, scope: dict, receive: Receive,
+                          send: Send) -> None:
+        """Асинхронный вариант маршрута GET /api/frames, см.
+        src.routes.frames.get_frames. Потоковая передача кадров выполняется
+        Flask приложением.
+        """
+        start = time.perf_counter()
+        args = MultiDict(parse_qsl(scope['query_string'].decode(),
+                                   keep_blank_values=True))
+
+        def lookup():
+            validation_failed, query = parse_frames_query(args)
+            if validation_failed is not None or query.stream is not None:
+                return validation_failed, query, None
+            with timed('cache_lookup'):
+                return None, query, query.cached()
+
+        validation_failed, query, cached = await self._run_in_thread(lookup)
+        if validation_failed is not None:
+            status, body = 400, validation_failed
+        elif query.stream is not None:
+            await self._call_wsgi(scope, receive, send)
+            return
+        elif cached is not None:
+            status, body = 200, {"first_frame": cached[0],
+                                 "file_paths": cached[1]}
+        else:
+            status, body = await self._save_frames(query)
+
+        if isinstance(body, dict):
+            content_type = b'application/json'
+            body = json.dumps(body).encode()
+        else:
+            content_type = b'text/html; charset=utf-8'
+            body = body.encode()
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b'content-type', content_type),
+                        (b'content-length', str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+        REQUEST_SECONDS.labels('frames.get_frames', 'GET', status).observe(
+            time.perf_counter() - start)
+
+    async def _save_frames(self, query: FramesQuery) -> Tuple[int, object]:
+        """Извлекает и сохраняет кадры в пуле процессов.
+
+        Returns:
+            Код ответа и тело ответа.
+        """
+        _, processes = self._get_executors()
+        loop = asyncio.get_running_loop()
+        try:
+            first_frame, frame_paths = await loop.run_in_executor(
+                processes, query.save)
+        except NotADirectoryError:
+            return 500, 'Frame directory is file'
+        except Exception:
+            return 500, 'Something went wrong'
+        if first_frame is None:
+            return 500, {"message": "Failed to extract frames."}
+        return 200, {"first_frame": first_frame, "file_paths": frame_paths}
+
+    async def _call_wsgi(self, scope: dict, receive: Receive,
+                         send: Send) -> None:
+        """Передаёт запрос Flask приложению, которое выполняется в пуле
+        потоков. Тело ответа читается из Flask приложения и отправляется
+        по частям.
+        """
+        body = bytearray()
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return
+            body.extend(message.get('body', b''))
+            if not message.get('more_body', False):
+                break
+
+        response_start = {}
+
+        def start_response(status: str,
+                           headers: List[Tuple[str, str]],
+                           exc_info=None) -> Callable[[bytes], None]:
+            response_start['status'] = int(status.split(' ', 1)[0])
+            response_start['headers'] = [
+                (name.lower().encode('latin-1'), value.encode('latin-1'))
+                for (name, value) in headers
+            ]
+            return lambda data: None
+
+        def call() -> Iterator[bytes]:
+            return iter(self.flask_app(_wsgi_environ(scope, bytes(body)),
+                                       start_response))
+
+        chunks = await self._run_in_thread(call)
+        try:
+            # первая часть тела нужна, чтобы потоковый ответ вызвал
+            # start_response
+            chunk = await self._run_in_thread(next, chunks, None)
+            await send({"type": "http.response.start", **response_start})
+            while chunk is not None:
+                if chunk:
+                    await send({"type": "http.response.body", "body": chunk,
+                                "more_body": True})
+                chunk = await self._run_in_thread(next, chunks, None)
+            await send({"type": "http.response.body", "body": b''})
+        finally:
+            close = getattr(chunks, 'close', None)
+            if close is not None:
+                await self._run_in_thread(close)
+
+
+def _wsgi_environ(scope: dict, body: bytes) -> dict:
+    """Возвращает окружение WSGI для запроса ASGI.
+
+    Args:
+        scope: Описание запроса ASGI.
+        body: Тело запроса.
+    """
+    server = scope.get('server') or ('localhost', 80)
+    root_path = scope.get('root_path', '')
+    path = scope['path']
+    if path.startswith(root_path):
+        path = path[len(root_path):]
+    environ = {
+        "REQUEST_METHOD": scope['method'],
+        "SCRIPT_NAME": root_path.encode().decode('latin-1'),
+        "PATH_INFO": path.encode().decode('latin-1'),
+        "QUERY_STRING": scope['query_string'].decode('latin-1'),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get('scheme', 'http'),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    client: Optional[Tuple[str, int]] = scope.get('client')
+    if client is not None:
+        environ['REMOTE_ADDR'] = client[0]
+        environ['REMOTE_PORT'] = str(client[1])
+    for (name, value) in scope.get('headers', []):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if name in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            key = name
+        else:
+            key = f'HTTP_{name}'
+        if key in environ:
+            value = f'{environ[key]},{value}'
+        environ[key] = value
+    return environ
+
+
+def create_asgi_app(config: dict) -> AsgiApp:
+    """Функция для создания ASGI приложения.
+
+    Args:
+        config: Конфигурация Flask приложения.
+
+    Returns:
+        ASGI приложение.
+    """
+    return AsgiApp(config)
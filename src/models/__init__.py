@@ -1,7 +1,12 @@
-from src.models.tables import FrameServiceInformation
-from src.models.database import db
+from src.models.tables import (FrameServiceInformation, ExtractionJob, Video,
+                               VideoCatalogState)
+from src.models.database import db, init_db
 
 __all__ = [
     db,
-    FrameServiceInformation
+    init_db,
+    FrameServiceInformation,
+    ExtractionJob,
+    Video,
+    VideoCatalogState
 ]
@@ -1,3 +1,57 @@
+import os
+import weakref
+from typing import TYPE_CHECKING
+
 from flask_sqlalchemy import SQLAlchemy
 
+if TYPE_CHECKING:
+    from flask import Flask
+
 db = SQLAlchemy()
+
+# движки всех приложений процесса, пул которых сбрасывается после fork
+_engines: 'weakref.WeakSet' = weakref.WeakSet()
+
+
+def engine_options(config: dict) -> dict:
+    """Возвращает параметры пула соединений с БД из конфигурационного файла.
+
+    Args:
+        config: Конфигурация Flask приложения.
+    """
+    options = {
+        "pool_size": config['DB_POOL_SIZE'],
+        "max_overflow": config['DB_MAX_OVERFLOW'],
+        "pool_timeout": config['DB_POOL_TIMEOUT'],
+        "pool_recycle": config['DB_POOL_RECYCLE'],
+        "pool_pre_ping": config['DB_POOL_PRE_PING'],
+    }
+    statement_timeout = config.get('DB_STATEMENT_TIMEOUT')
+    if statement_timeout:
+        options['connect_args'] = {
+            "options": f"-c statement_timeout={statement_timeout}"
+        }
+    return options
+
+
+def init_db(app: 'Flask') -> None:
+    """Подключает БД к Flask приложению с параметрами пула соединений из
+    конфигурации приложения.
+
+    Args:
+        app: Flask приложение.
+    """
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
+    db.init_app(app)
+    with app.app_context():
+        _engines.update(db.engines.values())
+
+
+def _reset_engines_after_fork() -> None:
+    # соединения родительского процесса остаются ему, а дочерний процесс,
+    # например worker gunicorn с --preload, открывает свои соединения
+    for engine in list(_engines):
+        engine.dispose(close=False)
+
+
+os.register_at_fork(after_in_child=_reset_engines_after_fork)
@@ -1 +1,4 @@
-from src.models.tables.frame_service_information import FrameServiceInformation
\ No newline at end of file
+from src.models.tables.frame_service_information import FrameServiceInformation
+from src.models.tables.extraction_job import ExtractionJob
+from src.models.tables.video import Video
+from src.models.tables.video_catalog_state import VideoCatalogState
\ No newline at end of file
@@ -0,0 +1,72 @@
+from datetime import datetime
+from typing import List, Optional
+
+from src.models.database import db
+
+
+class ExtractionJob(db.Model):
+    """Задача на извлечение кадров из видеофайла.
+
+    Attributes:
+        id: Идентификатор задачи.
+        video_file_name: Имя исходного видеофайла.
+        time_in_video: Время от начала видеофайла в секундах.
+        frame_format: Формат файлов с кадрами или None для формата
+          из конфигурационного файла.
+        quality: Качество или степень сжатия кадров или None для значения
+          из конфигурационного файла.
+        status: Состояние задачи: pending, done или failed.
+        owner: Хост и идентификатор процесса, выполняющего задачу.
+        first_frame: Номер первого извлечённого кадра.
+        file_paths: Полные пути к файлам с извлечёнными кадрами.
+        message: Описание ошибки для завершившейся неудачно задачи.
+        created_at: Время создания задачи.
+        updated_at: Время последнего изменения задачи.
+    """
+    __tablename__ = "extraction_job"
+
+    PENDING = 'pending'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    id: str = db.Column(db.String(32), primary_key=True)
+    video_file_name: str = db.Column(db.String(), nullable=False)
+    time_in_video: int = db.Column(db.Integer, nullable=False)
+    frame_format: Optional[str] = db.Column(db.String(16))
+    quality: Optional[int] = db.Column(db.Integer)
+    status: str = db.Column(db.String(16), nullable=False, index=True)
+    owner: str = db.Column(db.String(), nullable=False)
+    first_frame: Optional[int] = db.Column(db.Integer)
+    file_paths: Optional[List[str]] = db.Column(db.JSON)
+    message: Optional[str] = db.Column(db.String())
+    created_at: datetime = db.Column(db.DateTime, nullable=False,
+                                     default=datetime.utcnow)
+    updated_at: datetime = db.Column(db.DateTime, nullable=False,
+                                     default=datetime.utcnow,
+                                     onupdate=datetime.utcnow)
+
+    def __init__(self,
+                 id: str,
+                 video_file_name: str,
+                 time_in_video: int,
+                 owner: str,
+                 frame_format: Optional[str] = None,
+                 quality: Optional[int] = None,
+                 ) -> None:
+        """Инициализирует экземпляр класса.
+
+        Args:
+            id: Идентификатор задачи.
+            video_file_name: Имя исходного видеофайла.
+            time_in_video: Время от начала видеофайла в секундах.
+            owner: Хост и идентификатор процесса, выполняющего задачу.
+            frame_format: Формат файлов с кадрами.
+            quality: Качество или степень сжатия кадров.
+        """
+        self.id = id
+        self.video_file_name = video_file_name
+        self.time_in_video = time_in_video
+        self.status = self.PENDING
+        self.owner = owner
+        self.frame_format = frame_format
+        self.quality = quality
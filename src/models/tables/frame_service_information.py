@@ -1,3 +1,5 @@
+from typing import Optional
+
 from src.models.database import db
 
 
@@ -8,17 +10,44 @@ class FrameServiceInformation(db.Model):
         video_file_name: Имя исходного видеофайла.
         frame_number: Порядковый номер вырезанного кадра от начала файла.
         frame_file_path: Полный путь к файлу с вырезанный кадром.
+        content_hash: Ключ хранилища кадров, SHA-256 содержимого файла.
+        perceptual_hash: Перцептивный хеш кадра для поиска похожих кадров.
+        timestamp: Время кадра от начала видеофайла в секундах.
+        width: Ширина кадра.
+        height: Высота кадра.
+        file_size: Размер файла с кадром в байтах.
+        format: Формат файла с кадром.
     """
     __tablename__ = "frame_service_information"
+    # поиск кадров видеофайла по времени, поиск по номерам кадров
+    # использует первичный ключ
+    __table_args__ = (
+        db.Index('ix_frame_service_information_video_timestamp',
+                 'video_file_name', 'timestamp'),
+    )
 
     video_file_name: str = db.Column(db.String(), primary_key=True)
     frame_number: int = db.Column(db.Integer, primary_key=True)
     frame_file_path: str = db.Column(db.String(), nullable=False)
+    content_hash: str = db.Column(db.String(64), nullable=True, index=True)
+    perceptual_hash: Optional[str] = db.Column(db.String(64), index=True)
+    timestamp: Optional[float] = db.Column(db.Float)
+    width: Optional[int] = db.Column(db.Integer)
+    height: Optional[int] = db.Column(db.Integer)
+    file_size: Optional[int] = db.Column(db.BigInteger)
+    format: Optional[str] = db.Column(db.String(8))
 
     def __init__(self,
                  video_file_name: str,
                  frame_number: int,
                  frame_file_path: str,
+                 content_hash: Optional[str] = None,
+                 perceptual_hash: Optional[str] = None,
+                 timestamp: Optional[float] = None,
+                 width: Optional[int] = None,
+                 height: Optional[int] = None,
+                 file_size: Optional[int] = None,
+                 format: Optional[str] = None,
                  ) -> None:
         """Инициализирует экземпляр класса.
 
@@ -26,7 +55,21 @@ class FrameServiceInformation(db.Model):
             video_file_name: Имя исходного видеофайла.
             frame_number: Порядковый номер вырезанного кадра от начала файла.
             frame_file_path: Полный путь к файлу с вырезанный кадром.
+            content_hash: Ключ хранилища кадров.
+            perceptual_hash: Перцептивный хеш кадра.
+            timestamp: Время кадра от начала видеофайла в секундах.
+            width: Ширина кадра.
+            height: Высота кадра.
+            file_size: Размер файла с кадром в байтах.
+            format: Формат файла с кадром.
         """
         self.video_file_name = video_file_name
         self.frame_number = frame_number
         self.frame_file_path = frame_file_path
+        self.content_hash = content_hash
+        self.perceptual_hash = perceptual_hash
+        self.timestamp = timestamp
+        self.width = width
+        self.height = height
+        self.file_size = file_size
+        self.format = format
@@ -0,0 +1,48 @@
+from typing import Optional
+
+from src.models.database import db
+
+
+class Video(db.Model):
+    """Видеофайл из указанного в конфигурационном файле каталога с видео.
+
+    Attributes:
+        file_name: Имя видеофайла.
+        file_path: Полный путь к видеофайлу.
+        size: Размер видеофайла в байтах.
+        mtime_ns: Время изменения видеофайла в наносекундах.
+        duration: Длительность видеофайла в секундах или None, если она ещё
+          не определена или видеофайл не удалось открыть.
+        probed: Длительность видеофайла определялась после его изменения.
+    """
+    __tablename__ = "video"
+
+    # побайтовое сравнение: индекс первичного ключа подходит и для
+    # сортировки, и для поиска по префиксу имени файла
+    file_name: str = db.Column(db.String(collation='C'), primary_key=True)
+    file_path: str = db.Column(db.String(), nullable=False)
+    size: int = db.Column(db.BigInteger, nullable=False)
+    mtime_ns: int = db.Column(db.BigInteger, nullable=False)
+    duration: Optional[float] = db.Column(db.Float)
+    probed: bool = db.Column(db.Boolean, nullable=False, default=False,
+                             index=True)
+
+    def __init__(self,
+                 file_name: str,
+                 file_path: str,
+                 size: int,
+                 mtime_ns: int,
+                 ) -> None:
+        """Инициализирует экземпляр класса.
+
+        Args:
+            file_name: Имя видеофайла.
+            file_path: Полный путь к видеофайлу.
+            size: Размер видеофайла в байтах.
+            mtime_ns: Время изменения видеофайла в наносекундах.
+        """
+        self.file_name = file_name
+        self.file_path = file_path
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.probed = False
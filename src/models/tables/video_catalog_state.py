@@ -0,0 +1,31 @@
+from datetime import datetime
+
+from src.models.database import db
+
+
+class VideoCatalogState(db.Model):
+    """Состояние каталога видеофайлов в БД.
+
+    Attributes:
+        id: Идентификатор единственной строки таблицы.
+        version: Номер версии каталога, увеличивается при каждом изменении.
+        scanned_at: Время последнего сканирования каталога с видео.
+    """
+    __tablename__ = "video_catalog_state"
+
+    ID = 1
+
+    id: int = db.Column(db.Integer, primary_key=True)
+    version: int = db.Column(db.Integer, nullable=False)
+    scanned_at: datetime = db.Column(db.DateTime, nullable=False)
+
+    def __init__(self, version: int, scanned_at: datetime) -> None:
+        """Инициализирует экземпляр класса.
+
+        Args:
+            version: Номер версии каталога.
+            scanned_at: Время последнего сканирования каталога с видео.
+        """
+        self.id = self.ID
+        self.version = version
+        self.scanned_at = scanned_at
@@ -1,3 +1,4 @@
 from src.routes.frames import frames_bp
+from src.routes.metrics import metrics_bp
 from src.routes.saved_frames import saved_frames_bp
 from src.routes.videos import videos_bp
@@ -1,15 +1,259 @@
 import os
 import json
+import uuid
+import mimetypes
+from typing import Any, Iterator, List, Optional, Tuple, TYPE_CHECKING
+from urllib.parse import quote
 
-import cv2
-from flask import Blueprint, Response, request
+from flask import (Blueprint, Response, current_app, request, send_file,
+                   url_for)
+from werkzeug.exceptions import RequestedRangeNotSatisfiable
 
+from src.models import db, ExtractionJob
 from src.utils.config import Config
-from src.utils.get_frames import extract_frame
+from src.utils.encode_frames import (encoding_variant, resolve_encoding,
+                                     validate_encoding_params)
+from src.utils.extraction_jobs import (current_owner, resume_orphaned_job,
+                                       submit_job)
+from src.utils.file_names import is_inside_dir, is_simple_file_name
+from src.utils.frame_cache import get_frame_cache
+from src.utils.frame_manifest import get_frame_manifest
+from src.utils.frame_size import FrameSize, validate_size_params
+from src.utils.get_frames import (FrameBuffers, iter_encoded_frames,
+                                  iter_frame_ranges, save_frames,
+                                  store_frames)
+from src.utils.metrics import timed
+from src.utils.stream_frames import (STREAM_FORMATS, multipart_stream,
+                                     new_boundary, zip_stream)
+
+if TYPE_CHECKING:
+    from werkzeug.datastructures import MultiDict
 
 frames_bp = Blueprint('frames', __name__)
 
 
+def _validate_frames_params(
+        file_name: Any,
+        time_in_video: Any
+    ) -> Tuple[Optional[dict], Optional[int]]:
+    """Проверяет параметры запроса на извлечение кадров.
+
+    Args:
+        file_name: Имя видеофайла.
+        time_in_video: Время от начала видеофайла в секундах.
+
+    Returns:
+        Описание ошибок валидации или None и время от начала видеофайла
+        в секундах.
+    """
+    # check required fields
+    required_fields = {}
+    if file_name is None:
+        required_fields['file_name'] = 'Required field.'
+    if time_in_video is None:
+        required_fields['time_in_video'] = 'Required field.'
+    if len(required_fields) > 0:
+        return required_fields, None
+
+    # check field types
+    type_validation_failed = {}
+    if not isinstance(file_name, str):
+        type_validation_failed['file_name'] = 'Required string type.'
+    # int() would accept JSON true and truncate 1.9
+    if isinstance(time_in_video, bool) or (isinstance(time_in_video, float)
+                                           and not time_in_video.is_integer()):
+        type_validation_failed['time_in_video'] = 'Required number type'
+    else:
+        try:
+            time_in_video = int(time_in_video)
+        except Exception:
+            type_validation_failed['time_in_video'] = 'Required number type'
+    if len(type_validation_failed) > 0:
+        return type_validation_failed, None
+
+    # field constraints
+    constraint_failed = {}
+    if len(file_name) == 0:
+        constraint_failed['file_name'] = 'Shorter than minimum length 1.'
+    # file access by relative or absolute paths ../../../something
+    elif not is_simple_file_name(file_name):
+        constraint_failed['file_name'] = 'Forbidden file name.'
+    if time_in_video < 0:
+        constraint_failed['time_in_video'] = 'Less than minimum value 0.'
+    if len(constraint_failed) > 0:
+        return constraint_failed, None
+
+    # check the existence of the file
+    video_path = os.path.join(Config().flask['VIDEOS_DIR_PATH'], file_name)
+    if not os.path.isfile(video_path):
+        return {"file_name": "File doesn't exist"}, None
+
+    return None, time_in_video
+
+
+def _validate_stride_params(
+        frames_count: Any,
+        step: Any
+    ) -> Tuple[Optional[dict], Optional[int], Optional[int]]:
+    """Проверяет параметры запроса, задающие количество извлекаемых кадров
+    и разницу номеров соседних извлекаемых кадров.
+
+    Args:
+        frames_count: Количество кадров.
+        step: Разница номеров соседних кадров.
+
+    Returns:
+        Описание ошибок валидации или None, количество кадров и разница
+        номеров соседних кадров.
+    """
+    config = Config()
+    values = {
+        "count": config.flask['SAVE_FRAMES_COUNT'],
+        "step": 1,
+    }
+    maximums = {"count": config.flask['MAX_FRAMES_COUNT'], "step": None}
+    validation_failed = {}
+    for (field, value) in (('count', frames_count), ('step', step)):
+        if value is None:
+            continue
+        # int() would accept JSON true and truncate 2.7
+        if isinstance(value, bool) or (isinstance(value, float)
+                                       and not value.is_integer()):
+            validation_failed[field] = 'Required number type'
+            continue
+        try:
+            values[field] = int(value)
+        except Exception:
+            validation_failed[field] = 'Required number type'
+            continue
+        if values[field] < 1:
+            validation_failed[field] = 'Less than minimum value 1.'
+        elif maximums[field] is not None and values[field] > maximums[field]:
+            validation_failed[field] = (
+                f'Greater than maximum value {maximums[field]}.')
+    if len(validation_failed) > 0:
+        return validation_failed, None, None
+    return None, values['count'], values['step']
+
+
+class FramesQuery:
+    """Проверенные параметры запроса на извлечение кадров.
+
+    Attributes:
+        file_name: Имя видеофайла.
+        time_in_video: Время от начала видеофайла в секундах.
+        frame_format: Формат кадров или None.
+        quality: Качество или степень сжатия или None.
+        size: Уменьшенный размер кадров или None для исходного размера.
+        frames_count: Количество кадров.
+        step: Разница номеров соседних кадров.
+        stream: Формат тела ответа с кадрами или None.
+        save_streamed: Сохранять кадры на диск при stream.
+    """
+
+    def __init__(self,
+                 file_name: str,
+                 time_in_video: int,
+                 frame_format: Optional[str],
+                 quality: Optional[int],
+                 size: Optional[FrameSize],
+                 frames_count: int,
+                 step: int,
+                 stream: Optional[str],
+                 save_streamed: bool,
+                 ) -> None:
+        """Инициализирует экземпляр класса.
+
+        Args:
+            file_name: Имя видеофайла.
+            time_in_video: Время от начала видеофайла в секундах.
+            frame_format: Формат кадров.
+            quality: Качество или степень сжатия.
+            size: Уменьшенный размер кадров.
+            frames_count: Количество кадров.
+            step: Разница номеров соседних кадров.
+            stream: Формат тела ответа с кадрами.
+            save_streamed: Сохранять кадры на диск при stream.
+        """
+        self.file_name = file_name
+        self.time_in_video = time_in_video
+        self.frame_format = frame_format
+        self.quality = quality
+        self.size = size
+        self.frames_count = frames_count
+        self.step = step
+        self.stream = stream
+        self.save_streamed = save_streamed
+
+    @property
+    def video_path(self) -> str:
+        return os.path.join(Config().flask['VIDEOS_DIR_PATH'], self.file_name)
+
+    @property
+    def frame_dir(self) -> str:
+        return os.path.join(Config().flask['FRAMES_DIR_PATH'], self.file_name)
+
+    def cached(self) -> Optional[Tuple[int, List[str]]]:
+        """Возвращает номер первого кадра и маршруты к файлам с кадрами,
+        извлечёнными ранее, или None.
+        """
+        variant = encoding_variant(
+            *resolve_encoding(self.frame_format, self.quality), self.size)
+        return get_frame_cache().get(self.video_path, self.time_in_video,
+                                     self.frames_count, variant, self.step)
+
+    def save(self) -> Tuple[Optional[int], List[str]]:
+        """Извлекает и сохраняет кадры, см. save_frames."""
+        return save_frames(self.video_path, self.time_in_video,
+                           self.frame_dir, self.frame_format, self.quality,
+                           self.size, self.frames_count, self.step)
+
+
+def parse_frames_query(
+        args: 'MultiDict'
+    ) -> Tuple[Optional[dict], Optional[FramesQuery]]:
+    """Проверяет параметры запроса GET /api/frames.
+
+    Args:
+        args: Параметры строки запроса.
+
+    Returns:
+        Описание ошибок валидации или None и проверенные параметры.
+    """
+    file_name = args.get('file_name')
+    validation_failed, time_in_video = _validate_frames_params(
+        file_name,
+        args.get('time_in_video')
+    )
+    if validation_failed is not None:
+        return validation_failed, None
+    validation_failed, frame_format, quality = validate_encoding_params(
+        args.get('format'),
+        args.get('quality')
+    )
+    if validation_failed is not None:
+        return validation_failed, None
+    validation_failed, size = validate_size_params(
+        args.get('width'),
+        args.get('height'),
+        args.get('scale')
+    )
+    if validation_failed is not None:
+        return validation_failed, None
+    validation_failed, frames_count, step = _validate_stride_params(
+        args.get('count'),
+        args.get('step')
+    )
+    if validation_failed is not None:
+        return validation_failed, None
+    stream = args.get('stream')
+    if stream is not None and stream not in STREAM_FORMATS:
+        return {"stream": "Unsupported stream format."}, None
+    save = args.get('save', 'false').lower() in ('1', 'true')
+    return None, FramesQuery(file_name, time_in_video, frame_format, quality,
+                             size, frames_count, step, stream, save)
+
+
 @frames_bp.route('', methods=['GET'])
 def get_frames():
     """Возвращает номер первого кадра и массив строк с маршрутами к файлам с
@@ -18,69 +262,445 @@ def get_frames():
     Params:
         file_name (str): Имя видеофайла.
         time_in_video (int): Время от начала видеофайла в секундах.
+        format (str): Формат файлов с кадрами: png, jpeg или webp.
+        quality (int): Степень сжатия PNG или качество JPEG и WebP.
+        width (int): Ширина уменьшенных кадров.
+        height (int): Высота уменьшенных кадров. Если задана только одна
+          сторона, другая вычисляется с сохранением пропорций.
+        scale (float): Коэффициент уменьшения кадров вместо width и height.
+        count (int): Количество кадров, по умолчанию из конфигурационного
+          файла.
+        step (int): Разница номеров соседних кадров, по умолчанию 1.
+        stream (str): Вернуть закодированные кадры в теле ответа вместо
+          маршрутов к файлам: multipart или zip.
+        save (bool): Сохранять кадры на диск при stream, по умолчанию false.
     """
-    file_name = request.args.get('file_name')
-    time_in_video = request.args.get('time_in_video')
+    validation_failed, query = parse_frames_query(request.args)
+    if validation_failed is not None:
+        return validation_failed, 400
+
+    # frames extracted earlier
+    with timed('cache_lookup'):
+        cached = query.cached()
+    if query.stream is not None:
+        return _stream_frames(query, cached)
+    if cached is not None:
+        first_frame, frame_paths = cached
+        response_data = {
+            "first_frame": first_frame,
+            "file_paths": frame_paths
+        }
+        return Response(json.dumps(response_data), 200,
+                        mimetype='application/json')
+
+    # extract and save frames
+    try:
+        first_frame, frame_paths = query.save()
+    except NotADirectoryError:
+        return 'Frame directory is file', 500
+    except Exception:
+        return 'Something went wrong', 500
+    if first_frame is None:
+        return {"message": "Failed to extract frames."}, 500  # split with 400
+
+    response_data = {
+        "first_frame": first_frame,
+        "file_paths": frame_paths
+    }
+    return Response(json.dumps(response_data), 200, mimetype='application/json')
+
+
+def _stream_frames(
+        query: 'FramesQuery',
+        cached: Optional[Tuple[int, List[str]]]
+    ) -> Response:
+    """Возвращает закодированные кадры в теле ответа, отправляя каждый кадр
+    сразу после его кодирования.
+
+    Args:
+        query: Проверенные параметры запроса.
+        cached: Номер первого кадра и маршруты к файлам с кадрами из кеша.
+    """
+    if cached is not None:
+        first_frame, frame_paths = cached
+
+        def read_frames() -> Iterator[Tuple[str, bytes]]:
+            for frame_path in frame_paths:
+                with open(frame_path, 'rb') as file:
+                    yield os.path.basename(frame_path), file.read()
+
+        frames = read_frames()
+    else:
+        frame_dir = query.frame_dir if query.save_streamed else None
+        try:
+            first_frame, frames = iter_encoded_frames(
+                query.video_path, query.time_in_video, frame_dir,
+                query.frame_format, query.quality, query.size,
+                query.frames_count, query.step
+            )
+        except NotADirectoryError:
+            return 'Frame directory is file', 500
+        except Exception:
+            return 'Something went wrong', 500
+        if first_frame is None:
+            return {"message": "Failed to extract frames."}, 500
+
+    headers = {'X-First-Frame': str(first_frame)}
+    if query.stream == 'zip':
+        body = zip_stream(frames)
+        mimetype = STREAM_FORMATS[query.stream]
+        headers['Content-Disposition'] = (
+            f'attachment; filename="{first_frame}.zip"')
+    else:
+        boundary = new_boundary()
+        body = multipart_stream(frames, boundary)
+        mimetype = f'{STREAM_FORMATS[query.stream]}; boundary={boundary}'
+    return Response(body, 200, mimetype=mimetype, headers=headers)
+
+
+@frames_bp.route('batch', methods=['POST'])
+def get_frames_batch():
+    """Возвращает номер первого кадра и маршруты к файлам с кадрами для
+    нескольких моментов времени. Кадры из одного видеофайла извлекаются
+    по возрастанию времени одним открытым видеофайлом и записываются
+    по мере декодирования.
+
+    Params:
+        items (list): Объекты с полями file_name (str) и time_in_video (int).
+        format (str): Формат файлов с кадрами: png, jpeg или webp.
+        quality (int): Степень сжатия PNG или качество JPEG и WebP.
+        width (int): Ширина уменьшенных кадров.
+        height (int): Высота уменьшенных кадров.
+        scale (float): Коэффициент уменьшения кадров вместо width и height.
+        count (int): Количество кадров для каждого момента времени.
+        step (int): Разница номеров соседних кадров.
+    """
+    request_json = request.get_json(silent=True)
+    if not isinstance(request_json, dict):
+        request_json = {}
+
+    # check items
+    items = request_json.get('items')
+    if items is None:
+        return {"items": "Required field."}, 400
+    if not isinstance(items, list):
+        return {"items": "Required list type."}, 400
+    max_items = Config().flask['BATCH_MAX_ITEMS']
+    if len(items) > max_items:
+        return {"items": f"Longer than maximum length {max_items}."}, 400
+    validation_failed, frame_format, quality = validate_encoding_params(
+        request_json.get('format'),
+        request_json.get('quality')
+    )
+    if validation_failed is not None:
+        return validation_failed, 400
+    validation_failed, size = validate_size_params(
+        request_json.get('width'),
+        request_json.get('height'),
+        request_json.get('scale')
+    )
+    if validation_failed is not None:
+        return validation_failed, 400
+    validation_failed, frames_count, step = _validate_stride_params(
+        request_json.get('count'),
+        request_json.get('step')
+    )
+    if validation_failed is not None:
+        return validation_failed, 400
+
+    config = Config()
+    frame_cache = get_frame_cache()
+    variant = encoding_variant(*resolve_encoding(frame_format, quality), size)
+
+    # group items by video file, frames extracted earlier are taken from cache
+    results = [None] * len(items)
+    groups = {}
+    for (i, item) in enumerate(items):
+        if not isinstance(item, dict):
+            results[i] = {"errors": {"item": "Required object type."}}
+            continue
+        file_name = item.get('file_name')
+        validation_failed, time_in_video = _validate_frames_params(
+            file_name,
+            item.get('time_in_video')
+        )
+        if validation_failed is not None:
+            results[i] = {"errors": validation_failed}
+            continue
+        video_path = os.path.join(config.flask['VIDEOS_DIR_PATH'], file_name)
+        with timed('cache_lookup'):
+            cached = frame_cache.get(video_path, time_in_video,
+                                     frames_count, variant, step)
+        if cached is not None:
+            results[i] = {"first_frame": cached[0], "file_paths": cached[1]}
+            continue
+        groups.setdefault(file_name, []).append((i, time_in_video))
+
+    # extract and save frames
+    for (file_name, group) in groups.items():
+        video_path = os.path.join(config.flask['VIDEOS_DIR_PATH'], file_name)
+        frame_dir = os.path.join(config.flask['FRAMES_DIR_PATH'], file_name)
+        group_results = {}
+        # frames are encoded as they are decoded, only a few frames are
+        # kept in memory regardless of the number of items
+        buffers = FrameBuffers(config.flask['ENCODE_THREADS'] + 2)
+        try:
+            frame_ranges = iter_frame_ranges(video_path,
+                                             [t for (_, t) in group],
+                                             frames_count=frames_count,
+                                             step=step, buffers=buffers)
+            for (time_in_video, first_frame, frames) in frame_ranges:
+                frame_paths = []
+                if first_frame is not None:
+                    frame_paths = store_frames(
+                        video_path, time_in_video, first_frame, frames,
+                        frame_dir, frame_format, quality, size, step,
+                        frames_count, buffers.release
+                    )
+                if not frame_paths:
+                    group_results[time_in_video] = {
+                        "message": "Failed to extract frames."
+                    }
+                    continue
+                group_results[time_in_video] = {
+                    "first_frame": first_frame,
+                    "file_paths": frame_paths
+                }
+        except NotADirectoryError:
+            message = 'Frame directory is file'
+        except Exception:
+            message = 'Something went wrong'
+        else:
+            message = None
+        for (i, time_in_video) in group:
+            results[i] = group_results.get(time_in_video,
+                                           {"message": message})
+
+    response_data = {"items": results}
+    return Response(json.dumps(response_data), 200, mimetype='application/json')
+
+
+def _validate_frame_file_params(
+        args: 'MultiDict'
+    ) -> Tuple[Optional[dict], Optional[str]]:
+    """Проверяет параметры запроса файла с кадром.
+
+    Args:
+        args: Параметры запроса file_name, frame_number, format, width,
+          height и scale.
+
+    Returns:
+        Описание ошибок валидации или None и путь к файлу с кадром или None,
+        если кадр не сохранён.
+    """
+    file_name = args.get('file_name')
+    frame_number = args.get('frame_number')
 
     # check required fields
     required_fields = {}
     if file_name is None:
         required_fields['file_name'] = 'Required field.'
-    if time_in_video is None:
-        required_fields['time_in_video'] = 'Required field.'
+    if frame_number is None:
+        required_fields['frame_number'] = 'Required field.'
     if len(required_fields) > 0:
-        return required_fields, 400
+        return required_fields, None
 
     # check field types
     try:
-        time_in_video = int(time_in_video)
+        frame_number = int(frame_number)
     except Exception:
-        return {"time_in_video": "Required number type"}, 400
-
-    # file access by relative paths ../../../something
-    simple_filename_check = lambda x: os.pathsep not in x and ".." not in x
+        return {"frame_number": "Required number type"}, None
 
     # field constraints
     constraint_failed = {}
     if len(file_name) == 0:
         constraint_failed['file_name'] = 'Shorter than minimum length 1.'
-    elif not simple_filename_check(file_name):
+    elif not is_simple_file_name(file_name):
         constraint_failed['file_name'] = 'Forbidden file name.'
-    if time_in_video < 0:
-        constraint_failed['time_in_video'] = 'Less than minimum value 0.'
+    if frame_number < 0:
+        constraint_failed['frame_number'] = 'Less than minimum value 0.'
     if len(constraint_failed) > 0:
-        return constraint_failed, 400
+        return constraint_failed, None
 
-    # check the existence of the file
-    config = Config()
-    video_path = os.path.join(config.flask['VIDEOS_DIR_PATH'], file_name)
-    if not os.path.isfile(video_path):
-        return {"file_name": "File doesn't exist"}, 400
+    validation_failed, frame_format, _ = validate_encoding_params(
+        args.get('format'), None)
+    if validation_failed is not None:
+        return validation_failed, None
+    validation_failed, size = validate_size_params(
+        args.get('width'), args.get('height'), args.get('scale'))
+    if validation_failed is not None:
+        return validation_failed, None
 
-    # extract frames
-    first_frame, frames = extract_frame(video_path, time_in_video)
-    if len(frames) != config.flask['SAVE_FRAMES_COUNT'] or first_frame is None:
-        return {"message": "Failed to extract frames."}, 500  # split with 400
+    frame_format, _ = resolve_encoding(frame_format)
+    frames_dir_path = Config().flask['FRAMES_DIR_PATH']
+    frame_dir = os.path.join(frames_dir_path, file_name)
+    if size is not None:
+        frame_dir = os.path.join(frame_dir, size.name)
+    if not is_inside_dir(frame_dir, frames_dir_path):
+        return {"file_name": "Forbidden file name."}, None
+    with timed('frame_check'):
+        frame_path = get_frame_manifest(frame_dir).find(
+            frame_number, frame_format.extension)
+    return None, frame_path
+
+
+@frames_bp.route('file', methods=['GET'])
+def get_frame_file():
+    """Возвращает сохранённый файл с кадром. Ответ кешируется браузерами и
+    CDN на FRAME_HTTP_MAX_AGE секунд, ETag - хеш содержимого кадра,
+    поддерживаются условные запросы и запросы части файла (Range). Если
+    задан FRAME_X_ACCEL_REDIRECT, файл отдаёт nginx из internal location
+    с этим префиксом, который соответствует FRAMES_DIR_PATH.
+
+    Params:
+        file_name (str): Имя видеофайла.
+        frame_number (int): Номер кадра.
+        format (str): Формат файла с кадром, по умолчанию из
+          конфигурационного файла.
+        width (int): Ширина уменьшенного кадра.
+        height (int): Высота уменьшенного кадра.
+        scale (float): Коэффициент уменьшения кадра.
+    """
+    validation_failed, frame_path = _validate_frame_file_params(request.args)
+    if validation_failed is not None:
+        return validation_failed, 400
+    if frame_path is None or not os.path.isfile(frame_path):
+        return {"message": "Frame doesn't exist."}, 404
 
-    # save images
     try:
-        frame_dir = os.path.join(config.flask['FRAMES_DIR_PATH'], file_name)
-        if not os.path.exists(frame_dir):
-            os.mkdir(frame_dir)
-        elif os.path.isfile(frame_dir):
-            return 'Frame directory is file', 500
+        config = Config()
+        with timed('frame_check'):
+            etag = get_frame_cache().content_hashes(frame_path)[frame_path]
+        max_age = config.flask['FRAME_HTTP_MAX_AGE']
+        x_accel_redirect = config.flask.get('FRAME_X_ACCEL_REDIRECT')
+        if not x_accel_redirect:
+            # без обратного прокси файл передаётся через wsgi.file_wrapper,
+            # gunicorn отправляет его в сокет через sendfile
+            return send_file(frame_path, conditional=True, etag=etag,
+                             max_age=max_age)
 
-        frame_paths = []
-        for (i, frame) in enumerate(frames):
-            frame_name = f'{first_frame + i}.png'
-            frame_path = os.path.join(frame_dir, frame_name)
-            frame_paths.append(frame_path)
-            cv2.imwrite(frame_path, frame)
+        relative_path = os.path.relpath(frame_path,
+                                        config.flask['FRAMES_DIR_PATH'])
+        response = Response(mimetype=mimetypes.guess_type(frame_path)[0])
+        response.headers['X-Accel-Redirect'] = (
+            x_accel_redirect.rstrip('/') + '/' + quote(relative_path))
+        response.set_etag(etag)
+        response.cache_control.public = True
+        response.cache_control.max_age = max_age
+        return response.make_conditional(request)
+    except FileNotFoundError:
+        return {"message": "Frame doesn't exist."}, 404
+    except RequestedRangeNotSatisfiable:
+        raise
     except Exception:
         return 'Something went wrong', 500
 
+
+@frames_bp.route('cache', methods=['GET'])
+def get_frame_cache_stats():
+    """Возвращает счётчики попаданий и промахов кеша кадров, а также
+    занимаемое кадрами место на диске.
+    """
+    try:
+        return get_frame_cache().stats(), 200
+    except Exception:
+        return 'Something went wrong', 500
+
+
+def _job_response(job: ExtractionJob) -> dict:
+    """Возвращает описание задачи на извлечение кадров для ответа сервера.
+
+    Args:
+        job: Задача на извлечение кадров.
+    """
     response_data = {
-        "first_frame": first_frame,
-        "file_paths": frame_paths
+        "job_id": job.id,
+        "status": job.status,
     }
-    return Response(json.dumps(response_data), 200, mimetype='application/json')
+    if job.status == ExtractionJob.DONE:
+        response_data['first_frame'] = job.first_frame
+        response_data['file_paths'] = job.file_paths
+    elif job.status == ExtractionJob.FAILED:
+        response_data['message'] = job.message
+    return response_data
+
+
+@frames_bp.route('jobs', methods=['POST'])
+def create_frames_job():
+    """Создаёт задачу на извлечение кадров, которая выполняется в пуле
+    процессов, и возвращает её идентификатор с кодом 202. Если кадры уже
+    есть в кеше, задача создаётся выполненной и возвращается с кодом 200.
+
+    Params:
+        file_name (str): Имя видеофайла.
+        time_in_video (int): Время от начала видеофайла в секундах.
+        format (str): Формат файлов с кадрами: png, jpeg или webp.
+        quality (int): Степень сжатия PNG или качество JPEG и WebP.
+    """
+    request_json = request.get_json(silent=True)
+    if not isinstance(request_json, dict):
+        request_json = {}
+    file_name = request_json.get('file_name')
+    validation_failed, time_in_video = _validate_frames_params(
+        file_name,
+        request_json.get('time_in_video')
+    )
+    if validation_failed is not None:
+        return validation_failed, 400
+    validation_failed, frame_format, quality = validate_encoding_params(
+        request_json.get('format'),
+        request_json.get('quality')
+    )
+    if validation_failed is not None:
+        return validation_failed, 400
+
+    try:
+        job = ExtractionJob(uuid.uuid4().hex, file_name, time_in_video,
+                            current_owner(), frame_format, quality)
+
+        # frames extracted earlier
+        config = Config()
+        video_path = os.path.join(config.flask['VIDEOS_DIR_PATH'], file_name)
+        variant = encoding_variant(*resolve_encoding(frame_format, quality))
+        with timed('cache_lookup'):
+            cached = get_frame_cache().get(video_path, time_in_video,
+                                           config.flask['SAVE_FRAMES_COUNT'],
+                                           variant)
+        if cached is not None:
+            job.status = ExtractionJob.DONE
+            job.first_frame, job.file_paths = cached
+
+        db.session.add(job)
+        db.session.commit()
+        if (job.status == ExtractionJob.PENDING
+                and not submit_job(current_app._get_current_object(), job)):
+            db.session.delete(job)
+            db.session.commit()
+            return {"message": "Too many extraction jobs."}, 503
+
+        location = url_for('frames.get_frames_job', job_id=job.id)
+        # frames from cache are ready, there is nothing to wait for
+        status = 200 if job.status == ExtractionJob.DONE else 202
+        return _job_response(job), status, {'Location': location}
+    except Exception:
+        db.session.rollback()
+        return 'Something went wrong', 500
+
+
+@frames_bp.route('jobs/<job_id>', methods=['GET'])
+def get_frames_job(job_id: str):
+    """Возвращает состояние задачи на извлечение кадров, а для выполненной
+    задачи номер первого кадра и маршруты к файлам с кадрами.
+
+    Params:
+        job_id (str): Идентификатор задачи.
+    """
+    try:
+        job = db.session.get(ExtractionJob, job_id)
+        if job is None:
+            return {"message": "Job doesn't exist."}, 404
+        resume_orphaned_job(current_app._get_current_object(), job)
+        return _job_response(job), 200
+    except Exception:
+        db.session.rollback()
+        return 'Something went wrong', 500
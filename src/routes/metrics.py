@@ -0,0 +1,16 @@
+from flask import Blueprint, Response
+
+from src.utils.metrics import render_metrics
+
+metrics_bp = Blueprint('metrics', __name__)
+
+
+@metrics_bp.route('', methods=['GET'])
+def get_metrics():
+    """Возвращает метрики всех процессов приложения в текстовом формате
+    Prometheus: время этапов извлечения и сохранения кадров, количество
+    декодированных и извлечённых кадров, записанных байт, время запросов
+    к БД и время обработки запросов к серверу.
+    """
+    data, content_type = render_metrics()
+    return Response(data, 200, content_type=content_type)
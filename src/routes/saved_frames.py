@@ -1,48 +1,245 @@
 import os
 import json
+from typing import Optional, Tuple
 
 from flask import Blueprint, Response, request
-from sqlalchemy import select
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
 
 from src.models import db, FrameServiceInformation
 from src.utils.config import Config
+from src.utils.encode_frames import FRAME_FORMATS, resolve_encoding
+from src.utils.file_names import is_simple_file_name
+from src.utils.frame_cache import get_frame_cache
+from src.utils.frame_manifest import get_frame_manifest
+from src.utils.frame_metadata import frame_metadata, video_index_for
+from src.utils.metrics import timed
+from src.utils.pagination import (decode_cursor, encode_cursor,
+                                   next_page_url, parse_limit)
 
 saved_frames_bp = Blueprint('saved_frames', __name__)
 
+# не больше 65535 параметров в одном запросе к PostgreSQL
+_INSERT_CHUNK_SIZE = 5000
+
 
 @saved_frames_bp.route('', methods=['GET'])
 def get_saved_frames():
-    """Возвращает список сохранённых кадров со служебной информацией
-       из базы данных.
+    """Возвращает страницу списка сохранённых кадров со служебной информацией
+       из базы данных, упорядоченного по имени видеофайла и номеру кадра.
+       Курсор следующей страницы передаётся в заголовке X-Next-Cursor.
+
+    Params:
+        limit (int): Размер страницы.
+        cursor (str): Курсор из предыдущего ответа.
+        video_file_name (str): Имя исходного видеофайла.
+        frame_number_from (int): Минимальный номер кадра.
+        frame_number_to (int): Максимальный номер кадра.
     """
+    # check field types
+    type_validation_failed = {}
+    limit_failed, limit = parse_limit(
+        request.args.get('limit'),
+        Config().flask['SAVED_FRAMES_PAGE_SIZE']
+    )
+    if limit_failed is not None:
+        type_validation_failed['limit'] = limit_failed
+    cursor = request.args.get('cursor')
+    if cursor is not None:
+        cursor = decode_cursor(cursor, str, int)
+        if cursor is None:
+            type_validation_failed['cursor'] = 'Invalid cursor.'
+    frame_number_range = {}
+    for field in ('frame_number_from', 'frame_number_to'):
+        value = request.args.get(field)
+        if value is None:
+            continue
+        try:
+            frame_number_range[field] = int(value)
+        except Exception:
+            type_validation_failed[field] = 'Required number type'
+    if len(type_validation_failed) > 0:
+        return type_validation_failed, 400
+
     try:
-        stmt = select(FrameServiceInformation)
-        frame_service_information = db.session.execute(stmt).scalars().all()
+        # only the columns in the response, without ORM objects
+        stmt = select(
+            FrameServiceInformation.video_file_name,
+            FrameServiceInformation.frame_number,
+            FrameServiceInformation.frame_file_path,
+        )
+        video_file_name = request.args.get('video_file_name')
+        if video_file_name is not None:
+            stmt = stmt.where(
+                FrameServiceInformation.video_file_name == video_file_name)
+        if 'frame_number_from' in frame_number_range:
+            stmt = stmt.where(FrameServiceInformation.frame_number
+                              >= frame_number_range['frame_number_from'])
+        if 'frame_number_to' in frame_number_range:
+            stmt = stmt.where(FrameServiceInformation.frame_number
+                              <= frame_number_range['frame_number_to'])
+        # keyset pagination by primary key
+        if cursor is not None:
+            stmt = stmt.where(
+                tuple_(FrameServiceInformation.video_file_name,
+                       FrameServiceInformation.frame_number) > tuple_(*cursor)
+            )
+        stmt = stmt.order_by(
+            FrameServiceInformation.video_file_name,
+            FrameServiceInformation.frame_number,
+        ).limit(limit + 1)
+        with timed('db_read'):
+            rows = db.session.execute(stmt).all()
+
+        headers = {}
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].video_file_name,
+                                        rows[-1].frame_number)
+            headers['X-Next-Cursor'] = next_cursor
+            headers['Link'] = f'<{next_page_url(next_cursor)}>; rel="next"'
         response_data = [
             {
                 "video_file_name": x.video_file_name,
                 "frame_number": x.frame_number,
                 "frame_file_path": x.frame_file_path,
             }
-            for x in frame_service_information
+            for x in rows
         ]
         response_data = json.dumps(response_data)
-        return Response(response_data, 200, mimetype='application/json')
+        return Response(response_data, 200, mimetype='application/json',
+                        headers=headers)
     except Exception:
         return 'Something went wrong', 500
 
 
-@saved_frames_bp.route('new_frame', methods=['POST'])
-def create_saved_frame():
-    """Сохраняет в БД служебную информацию о ранее сохранённом кадре.
+@saved_frames_bp.route('range', methods=['GET'])
+def get_saved_frames_range():
+    """Возвращает сохранённые кадры видеофайла в интервале времени или
+    номеров кадров со сведениями о них, а также количество кадров и их
+    суммарный размер во всём интервале. Ответ строится только по базе
+    данных. Курсор следующей страницы передаётся в заголовке X-Next-Cursor.
 
     Params:
-        file_path (str): Имя видеофайла
-        frame_number (int): Номер кадра
+        video_file_name (str): Имя исходного видеофайла.
+        time_from (float): Минимальное время кадра в секундах.
+        time_to (float): Максимальное время кадра в секундах.
+        frame_number_from (int): Минимальный номер кадра.
+        frame_number_to (int): Максимальный номер кадра.
+        limit (int): Размер страницы.
+        cursor (str): Курсор из предыдущего ответа.
     """
-    request_json = request.json
+    video_file_name = request.args.get('video_file_name')
+    if video_file_name is None:
+        return {"video_file_name": "Required field."}, 400
+
+    # check field types
+    type_validation_failed = {}
+    limit_failed, limit = parse_limit(
+        request.args.get('limit'),
+        Config().flask['SAVED_FRAMES_PAGE_SIZE']
+    )
+    if limit_failed is not None:
+        type_validation_failed['limit'] = limit_failed
+    cursor = request.args.get('cursor')
+    if cursor is not None:
+        cursor = decode_cursor(cursor, int)
+        if cursor is None:
+            type_validation_failed['cursor'] = 'Invalid cursor.'
+    bounds = {}
+    for (field, field_type) in (('time_from', float), ('time_to', float),
+                                ('frame_number_from', int),
+                                ('frame_number_to', int)):
+        value = request.args.get(field)
+        if value is None:
+            continue
+        try:
+            bounds[field] = field_type(value)
+        except Exception:
+            type_validation_failed[field] = 'Required number type'
+    if len(type_validation_failed) > 0:
+        return type_validation_failed, 400
+
+    try:
+        # video and timestamp bounds use the composite index,
+        # frame number bounds use the primary key
+        conditions = [
+            FrameServiceInformation.video_file_name == video_file_name
+        ]
+        columns = {
+            "time_from": FrameServiceInformation.timestamp,
+            "time_to": FrameServiceInformation.timestamp,
+            "frame_number_from": FrameServiceInformation.frame_number,
+            "frame_number_to": FrameServiceInformation.frame_number,
+        }
+        for (field, value) in bounds.items():
+            if field.endswith('_from'):
+                conditions.append(columns[field] >= value)
+            else:
+                conditions.append(columns[field] <= value)
+
+        stmt = select(
+            FrameServiceInformation.frame_number,
+            FrameServiceInformation.timestamp,
+            FrameServiceInformation.width,
+            FrameServiceInformation.height,
+            FrameServiceInformation.file_size,
+            FrameServiceInformation.format,
+            FrameServiceInformation.frame_file_path,
+        ).where(*conditions)
+        if cursor is not None:
+            stmt = stmt.where(FrameServiceInformation.frame_number > cursor[0])
+        stmt = stmt.order_by(FrameServiceInformation.frame_number)
+        totals_stmt = select(
+            func.count(),
+            func.coalesce(func.sum(FrameServiceInformation.file_size), 0),
+        ).where(*conditions)
+        with timed('db_read'):
+            rows = db.session.execute(stmt.limit(limit + 1)).all()
+            count, total_size = db.session.execute(totals_stmt).one()
+
+        headers = {}
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].frame_number)
+            headers['X-Next-Cursor'] = next_cursor
+            headers['Link'] = f'<{next_page_url(next_cursor)}>; rel="next"'
+        response_data = {
+            "video_file_name": video_file_name,
+            "count": count,
+            "total_size": int(total_size),
+            "frames": [
+                {
+                    "frame_number": x.frame_number,
+                    "timestamp": x.timestamp,
+                    "width": x.width,
+                    "height": x.height,
+                    "file_size": x.file_size,
+                    "format": x.format,
+                    "frame_file_path": x.frame_file_path,
+                }
+                for x in rows
+            ],
+        }
+        return Response(json.dumps(response_data), 200,
+                        mimetype='application/json', headers=headers)
+    except Exception:
+        return 'Something went wrong', 500
+
+
+def _validate_new_frame(
+        request_json: dict
+    ) -> Tuple[Optional[dict], Optional[str], Optional[int], Optional[str]]:
+    """Проверяет служебную информацию о сохранённом кадре из запроса.
 
+    Args:
+        request_json: Поля file_path, frame_number и format из запроса.
+
+    Returns:
+        Описание ошибок валидации или None, имя видеофайла, номер кадра и
+        расширение файла с кадром.
+    """
     # check required fields
     required_fields = ['file_path', 'frame_number']
     required_fields = {
@@ -51,7 +248,7 @@ def create_saved_frame():
         if f not in request_json
     }
     if len(required_fields) > 0:
-        return required_fields, 400
+        return required_fields, None, None, None
 
     # check field types
     video_file_name = request_json['file_path']
@@ -62,32 +259,77 @@ def create_saved_frame():
     if not isinstance(frame_number, int):
         type_validation_failed['frame_number'] = 'Required number type.'
     if len(type_validation_failed) > 0:
-        return type_validation_failed, 400
+        return type_validation_failed, None, None, None
+    frame_format = request_json.get('format')
+    if frame_format is not None and frame_format not in FRAME_FORMATS:
+        return {"format": "Unsupported format."}, None, None, None
 
     # field constraints
     constraint_failed = {}
     if len(video_file_name) == 0:
         constraint_failed['file_path'] = 'Shorter than minimum length 1.'
+    elif not is_simple_file_name(video_file_name):
+        constraint_failed['file_path'] = 'Forbidden file name.'
     if frame_number < 0:
         constraint_failed['frame_number'] = 'Less than minimum value 0.'
     if len(constraint_failed) > 0:
-        return constraint_failed, 400
+        return constraint_failed, None, None, None
+
+    frame_format, _ = resolve_encoding(frame_format)
+    return None, video_file_name, frame_number, frame_format.extension
+
+
+@saved_frames_bp.route('new_frame', methods=['POST'])
+def create_saved_frame():
+    """Сохраняет в БД служебную информацию о ранее сохранённом кадре.
+
+    Params:
+        file_path (str): Имя видеофайла
+        frame_number (int): Номер кадра
+        format (str): Формат файла с кадром, по умолчанию из
+          конфигурационного файла
+    """
+    request_json = request.get_json(silent=True)
+    if not isinstance(request_json, dict):
+        request_json = {}
+    validation_failed, video_file_name, frame_number, extension = (
+        _validate_new_frame(request_json))
+    if validation_failed is not None:
+        return validation_failed, 400
 
     try:
         # check frame
-        frame_dir_path = Config().flask['FRAMES_DIR_PATH']
-        frame_name = f'{frame_number}.png'
-        frame_path = os.path.join(frame_dir_path, video_file_name, frame_name)
-        if not os.path.isfile(frame_path):
+        frame_dir = os.path.join(Config().flask['FRAMES_DIR_PATH'],
+                                 video_file_name)
+        with timed('frame_check'):
+            frame_entry = get_frame_manifest(frame_dir).entry(frame_number,
+                                                              extension)
+        if frame_entry is None:
             return {"message": "Frame doesn't exist."}, 400
+        frame_path, file_size = frame_entry
 
+        frame_cache = get_frame_cache()
+        with timed('frame_check'):
+            content_hash = frame_cache.content_hashes(frame_path).get(
+                frame_path)
+            perceptual_hash = None
+            if Config().flask['FRAME_PERCEPTUAL_HASH']:
+                perceptual_hash = frame_cache.perceptual_hashes(
+                    frame_path).get(frame_path)
+            metadata = frame_metadata(frame_number, frame_path, file_size,
+                                      video_index_for(video_file_name))
         frame_service_information = FrameServiceInformation(
             video_file_name,
             frame_number,
-            frame_path
+            frame_path,
+            content_hash,
+            perceptual_hash,
+            **metadata
         )
-        db.session.add(frame_service_information)
-        db.session.commit()
+        with timed('db_write'):
+            db.session.add(frame_service_information)
+            db.session.commit()
+        frame_cache.pin(frame_path)
         response = {
             "file_path": frame_service_information.video_file_name,
             "frame_number": frame_service_information.frame_number,
@@ -100,3 +342,100 @@ def create_saved_frame():
     except Exception:
         db.session.rollback()
         return Response(status=500)
+
+
+@saved_frames_bp.route('new_frames', methods=['POST'])
+def create_saved_frames():
+    """Сохраняет в БД служебную информацию о нескольких ранее сохранённых
+    кадрах одним запросом к БД и возвращает результат для каждого кадра.
+
+    Params:
+        frames (list): Объекты с полями file_path (str), frame_number (int)
+          и format (str), как в /api/saved_frames/new_frame.
+    """
+    request_json = request.get_json(silent=True)
+    if not isinstance(request_json, dict):
+        request_json = {}
+
+    # check frames
+    frames = request_json.get('frames')
+    if frames is None:
+        return {"frames": "Required field."}, 400
+    if not isinstance(frames, list):
+        return {"frames": "Required list type."}, 400
+    max_frames = Config().flask['BULK_MAX_FRAMES']
+    if len(frames) > max_frames:
+        return {"frames": f"Longer than maximum length {max_frames}."}, 400
+
+    frame_dir_path = Config().flask['FRAMES_DIR_PATH']
+    results = [None] * len(frames)
+    rows = {}
+    frame_dir_entries = {}
+    video_indexes = {}
+    for (i, entry) in enumerate(frames):
+        validation_failed, video_file_name, frame_number, extension = (
+            _validate_new_frame(entry if isinstance(entry, dict) else {}))
+        if validation_failed is not None:
+            results[i] = {"errors": validation_failed}
+            continue
+
+        # one manifest read per video instead of a stat per frame
+        frame_dir = os.path.join(frame_dir_path, video_file_name)
+        if frame_dir not in frame_dir_entries:
+            with timed('frame_check'):
+                frame_dir_entries[frame_dir] = (
+                    get_frame_manifest(frame_dir).entries())
+                video_indexes[frame_dir] = video_index_for(video_file_name)
+        frame_entry = frame_dir_entries[frame_dir].get((frame_number,
+                                                        extension))
+        if frame_entry is None:
+            results[i] = {"message": "Frame doesn't exist."}
+            continue
+
+        results[i] = {
+            "file_path": video_file_name,
+            "frame_number": frame_number,
+            "frame_path": frame_entry[0],
+            "status": "exists",
+        }
+        rows.setdefault((video_file_name, frame_number), (i, {
+            "video_file_name": video_file_name,
+            "frame_number": frame_number,
+            "frame_file_path": frame_entry[0],
+            **frame_metadata(frame_number, *frame_entry,
+                             video_indexes[frame_dir]),
+        }))
+
+    frame_cache = get_frame_cache()
+    frame_paths = [row['frame_file_path'] for (_, row) in rows.values()]
+    with timed('frame_check'):
+        content_hashes = frame_cache.content_hashes(*frame_paths)
+        perceptual_hashes = {}
+        if Config().flask['FRAME_PERCEPTUAL_HASH']:
+            perceptual_hashes = frame_cache.perceptual_hashes(*frame_paths)
+    for (_, row) in rows.values():
+        row['content_hash'] = content_hashes.get(row['frame_file_path'])
+        row['perceptual_hash'] = perceptual_hashes.get(row['frame_file_path'])
+
+    try:
+        created = set()
+        values = [row for (_, row) in rows.values()]
+        with timed('db_write'):
+            for start in range(0, len(values), _INSERT_CHUNK_SIZE):
+                stmt = (
+                    insert(FrameServiceInformation)
+                    .values(values[start:start + _INSERT_CHUNK_SIZE])
+                    .on_conflict_do_nothing()
+                    .returning(FrameServiceInformation.video_file_name,
+                               FrameServiceInformation.frame_number)
+                )
+                created.update(tuple(x) for x in db.session.execute(stmt))
+            db.session.commit()
+    except Exception:
+        db.session.rollback()
+        return 'Something went wrong', 500
+
+    for key in created:
+        results[rows[key][0]]['status'] = 'created'
+    frame_cache.pin(*(rows[key][1]['frame_file_path'] for key in created))
+    return {"frames": results}, 200
@@ -1,9 +1,13 @@
-import os
 import json
 
-from flask import Blueprint, Response
+from flask import Blueprint, Response, request
+from sqlalchemy import select
 
+from src.models import db, Video
 from src.utils.config import Config
+from src.utils.pagination import (decode_cursor, encode_cursor,
+                                   next_page_url, parse_limit)
+from src.utils.video_catalog import get_catalog_state, scan_videos
 
 
 videos_bp = Blueprint('videos', __name__)
@@ -11,20 +15,74 @@ videos_bp = Blueprint('videos', __name__)
 
 @videos_bp.route('', methods=['GET'])
 def get_video_list():
-    """Возвращает список имён файлов и полный путь к ним из указанного
-    в конфигурационном файле каталога с видео.
+    """Возвращает страницу списка видеофайлов из указанного в
+       конфигурационном файле каталога с видео, упорядоченного по имени
+       файла. Список читается из БД, которую синхронизирует с каталогом
+       фоновое сканирование. Курсор следующей страницы передаётся в
+       заголовке X-Next-Cursor, ETag меняется при изменении каталога.
+
+    Params:
+        limit (int): Размер страницы.
+        cursor (str): Курсор из предыдущего ответа.
+        prefix (str): Начало имени видеофайла.
     """
-    video_dir_path = Config().flask['VIDEOS_DIR_PATH']
+    # check field types
+    type_validation_failed = {}
+    limit_failed, limit = parse_limit(request.args.get('limit'),
+                                      Config().flask['VIDEOS_PAGE_SIZE'])
+    if limit_failed is not None:
+        type_validation_failed['limit'] = limit_failed
+    cursor = request.args.get('cursor')
+    if cursor is not None:
+        cursor = decode_cursor(cursor, str)
+        if cursor is None:
+            type_validation_failed['cursor'] = 'Invalid cursor.'
+    if len(type_validation_failed) > 0:
+        return type_validation_failed, 400
+
     try:
+        state = get_catalog_state()
+        if state is None:
+            # первый запрос до завершения фонового сканирования
+            scan_videos()
+            state = get_catalog_state()
+        etag = f'videos-{state.version}' if state is not None else None
+        if etag is not None and etag in request.if_none_match:
+            return Response(status=304, headers={'ETag': f'"{etag}"'})
+
+        stmt = select(Video.file_name, Video.file_path, Video.size,
+                      Video.duration)
+        prefix = request.args.get('prefix')
+        if prefix:
+            stmt = stmt.where(Video.file_name.startswith(prefix,
+                                                         autoescape=True))
+        # keyset pagination by primary key
+        if cursor is not None:
+            stmt = stmt.where(Video.file_name > cursor[0])
+        stmt = stmt.order_by(Video.file_name).limit(limit + 1)
+        rows = db.session.execute(stmt).all()
+
+        headers = {}
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].file_name)
+            headers['X-Next-Cursor'] = next_cursor
+            headers['Link'] = f'<{next_page_url(next_cursor)}>; rel="next"'
         response_data = [
             {
-                "file_name": filename,
-                "file_path": os.path.join(video_dir_path, filename)
+                "file_name": x.file_name,
+                "file_path": x.file_path,
+                "size": x.size,
+                "duration": x.duration,
             }
-            for filename in os.listdir(video_dir_path)
-            if os.path.isfile(os.path.join(video_dir_path, filename))
+            for x in rows
         ]
         response_data = json.dumps(response_data)
-        return Response(response_data, 200, mimetype='application/json')
+        response = Response(response_data, 200, mimetype='application/json',
+                            headers=headers)
+        if etag is not None:
+            response.set_etag(etag)
+        return response
     except Exception:
+        db.session.rollback()
         return Response('Something went wrong', 500)
@@ -0,0 +1,206 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from src.utils.config import Config
+from src.utils.metrics import DECODER_REUSES, timed
+
+# если ключевой кадр перед нужным кадром неизвестен, декодер продолжает
+# с текущей позиции, только если до нужного кадра не больше стольких кадров
+MAX_DECODE_AHEAD = 250
+
+
+def can_continue(position: int,
+                 frame_number: int,
+                 keyframe: Optional[int]) -> bool:
+    """Проверяет, что до нужного кадра быстрее декодировать с текущей
+    позиции декодера, чем перейти к ключевому кадру.
+
+    Args:
+        position: Номер следующего декодируемого кадра.
+        frame_number: Номер нужного кадра.
+        keyframe: Номер ключевого кадра перед нужным кадром или None.
+    """
+    if position > frame_number:
+        return False
+    if keyframe is not None:
+        return position >= keyframe
+    return frame_number - position <= MAX_DECODE_AHEAD
+
+
+class DecoderHandle:
+    """Открытый видеофайл и позиция его декодера.
+
+    Attributes:
+        video_path: Полный путь к видеофайлу.
+        video_key: Идентификатор содержимого видеофайла.
+        cap: Открытый видеофайл.
+        position: Номер следующего декодируемого кадра.
+        last_used: Время возврата в пул по часам time.monotonic.
+    """
+
+    def __init__(self, video_path: str, video_key: str) -> None:
+        """Открывает видеофайл.
+
+        Args:
+            video_path: Полный путь к видеофайлу.
+            video_key: Идентификатор содержимого видеофайла.
+        """
+        import cv2
+
+        self.video_path = video_path
+        self.video_key = video_key
+        with timed('open'):
+            self.cap = cv2.VideoCapture(video_path)
+        self.position = 0
+        self.last_used = time.monotonic()
+
+    def release(self) -> None:
+        self.cap.release()
+
+
+class DecoderPool:
+    """Пул открытых видеофайлов процесса. Видеофайл, из которого недавно
+    извлекались кадры, остаётся открытым, и следующий запрос к более
+    поздним кадрам продолжает декодирование с места остановки.
+
+    Количество открытых видеофайлов ограничено: при нехватке закрываются
+    давно не использованные, а если все используются, запрос ждёт
+    освобождения. Неиспользуемые дольше idle_timeout видеофайлы
+    закрываются фоновым потоком.
+    """
+
+    def __init__(self, max_handles: int, idle_timeout: float) -> None:
+        """Инициализирует экземпляр класса.
+
+        Args:
+            max_handles: Максимальное количество открытых видеофайлов.
+            idle_timeout: Время в секундах, после которого неиспользуемый
+              видеофайл закрывается.
+        """
+        self.max_handles = max_handles
+        self.idle_timeout = idle_timeout
+        # свободные видеофайлы от давно до недавно использованных
+        self._idle: 'OrderedDict[int, DecoderHandle]' = OrderedDict()
+        self._open_count = 0
+        self._condition = threading.Condition()
+        self._reaper: Optional[threading.Thread] = None
+
+    def checkout(self,
+                 video_path: str,
+                 video_key: str,
+                 first_frame: int,
+                 keyframe: Optional[int]) -> DecoderHandle:
+        """Возвращает открытый видеофайл для монопольного использования.
+        Предпочтителен видеофайл, декодер которого остановился не позже
+        нужного кадра и не раньше ближайшего перед ним ключевого кадра,
+        а если ключевой кадр неизвестен - не дальше MAX_DECODE_AHEAD кадров
+        до нужного кадра.
+
+        Args:
+            video_path: Полный путь к видеофайлу.
+            video_key: Идентификатор содержимого видеофайла.
+            first_frame: Номер первого нужного кадра.
+            keyframe: Номер ключевого кадра перед first_frame или None.
+        """
+        with self._condition:
+            self._start_reaper()
+            best = None
+            for handle in self._idle.values():
+                if (handle.video_key != video_key
+                        or handle.position > first_frame):
+                    continue
+                if best is None or handle.position > best.position:
+                    best = handle
+            if best is not None and can_continue(best.position, first_frame,
+                                                 keyframe):
+                del self._idle[id(best)]
+                DECODER_REUSES.inc()
+                return best
+
+            while self._open_count >= self.max_handles:
+                if self._idle:
+                    _, handle = self._idle.popitem(last=False)
+                    handle.release()
+                    self._open_count -= 1
+                else:
+                    self._condition.wait()
+            self._open_count += 1
+        try:
+            return DecoderHandle(video_path, video_key)
+        except BaseException:
+            with self._condition:
+                self._open_count -= 1
+                self._condition.notify()
+            raise
+
+    def checkin(self, handle: DecoderHandle) -> None:
+        """Возвращает видеофайл в пул для следующих запросов.
+
+        Args:
+            handle: Видеофайл, полученный из checkout.
+        """
+        handle.last_used = time.monotonic()
+        with self._condition:
+            self._idle[id(handle)] = handle
+            self._condition.notify()
+
+    def discard(self, handle: DecoderHandle) -> None:
+        """Закрывает видеофайл, позиция декодера которого неизвестна.
+
+        Args:
+            handle: Видеофайл, полученный из checkout.
+        """
+        handle.release()
+        with self._condition:
+            self._open_count -= 1
+            self._condition.notify()
+
+    def close_idle(self, max_idle: float = 0) -> None:
+        """Закрывает видеофайлы, неиспользуемые дольше заданного времени.
+
+        Args:
+            max_idle: Время в секундах.
+        """
+        now = time.monotonic()
+        with self._condition:
+            while self._idle:
+                handle = next(iter(self._idle.values()))
+                if now - handle.last_used < max_idle:
+                    break
+                del self._idle[id(handle)]
+                handle.release()
+                self._open_count -= 1
+            self._condition.notify_all()
+
+    def _start_reaper(self) -> None:
+        if self._reaper is not None and self._reaper.is_alive():
+            return
+
+        def reap() -> None:
+            while True:
+                time.sleep(self.idle_timeout / 2)
+                self.close_idle(self.idle_timeout)
+
+        self._reaper = threading.Thread(target=reap, name='decoder_pool',
+                                        daemon=True)
+        self._reaper.start()
+
+
+_decoder_pool: Optional[DecoderPool] = None
+_decoder_pool_pid: Optional[int] = None
+_decoder_pool_lock = threading.Lock()
+
+
+def get_decoder_pool() -> DecoderPool:
+    """Возвращает пул открытых видеофайлов, созданный в текущем процессе."""
+    global _decoder_pool, _decoder_pool_pid
+    with _decoder_pool_lock:
+        if _decoder_pool is None or _decoder_pool_pid != os.getpid():
+            config = Config()
+            _decoder_pool = DecoderPool(config.flask['DECODER_POOL_SIZE'],
+                                        config.flask['DECODER_IDLE_TIMEOUT'])
+            _decoder_pool_pid = os.getpid()
+    return _decoder_pool
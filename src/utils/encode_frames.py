@@ -0,0 +1,288 @@
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import (Callable, Iterable, Iterator, List, Optional, Tuple,
+                    TYPE_CHECKING)
+
+from src.utils.config import Config
+from src.utils.frame_store import perceptual_hash, write_frame_file
+from src.utils.metrics import timed
+
+if TYPE_CHECKING:
+    from numpy import ndarray
+
+    from src.utils.frame_size import FrameSize
+
+
+class FrameFormat:
+    """Формат файлов с кадрами.
+
+    Attributes:
+        name: Название формата в запросах и конфигурационном файле.
+        extension: Расширение файлов с кадрами.
+        quality_flag_name: Название параметра cv2.imwrite, задающего
+          качество.
+        min_quality: Минимальное значение качества.
+        max_quality: Максимальное значение качества.
+    """
+
+    def __init__(self,
+                 name: str,
+                 extension: str,
+                 quality_flag_name: str,
+                 min_quality: int,
+                 max_quality: int,
+                 ) -> None:
+        """Инициализирует экземпляр класса.
+
+        Args:
+            name: Название формата.
+            extension: Расширение файлов с кадрами.
+            quality_flag_name: Название параметра cv2.imwrite, задающего
+              качество.
+            min_quality: Минимальное значение качества.
+            max_quality: Максимальное значение качества.
+        """
+        self.name = name
+        self.extension = extension
+        self.quality_flag_name = quality_flag_name
+        self.min_quality = min_quality
+        self.max_quality = max_quality
+
+    @property
+    def quality_flag(self) -> int:
+        """Параметр cv2.imwrite, задающий качество."""
+        import cv2
+
+        return getattr(cv2, self.quality_flag_name)
+
+
+FRAME_FORMATS = {
+    # для PNG качество - степень сжатия
+    'png': FrameFormat('png', 'png', 'IMWRITE_PNG_COMPRESSION', 0, 9),
+    'jpeg': FrameFormat('jpeg', 'jpg', 'IMWRITE_JPEG_QUALITY', 0, 100),
+    'webp': FrameFormat('webp', 'webp', 'IMWRITE_WEBP_QUALITY', 1, 100),
+}
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_pid: Optional[int] = None
+_executor_lock = threading.Lock()
+
+
+def resolve_encoding(
+        frame_format: Optional[str] = None,
+        quality: Optional[int] = None
+    ) -> Tuple[FrameFormat, int]:
+    """Возвращает формат и качество кадров, подставляя значения из
+    конфигурационного файла для незаданных параметров.
+
+    Args:
+        frame_format: Название формата.
+        quality: Качество или степень сжатия.
+    """
+    config = Config()
+    if frame_format is None:
+        frame_format = config.flask['FRAME_FORMAT']
+    if quality is None:
+        quality = config.flask['FRAME_QUALITY'][frame_format]
+    return FRAME_FORMATS[frame_format], quality
+
+
+def encoding_variant(frame_format: FrameFormat,
+                     quality: int,
+                     size: Optional['FrameSize'] = None) -> str:
+    """Возвращает строку, однозначно описывающую формат, качество и размер
+    кадров.
+
+    Args:
+        frame_format: Формат файлов с кадрами.
+        quality: Качество или степень сжатия.
+        size: Уменьшенный размер кадров или None для исходного размера.
+    """
+    if size is None:
+        return f'{frame_format.name}:{quality}'
+    return f'{frame_format.name}:{quality}:{size.name}'
+
+
+def validate_encoding_params(
+        frame_format: Optional[str],
+        quality: Optional[str]
+    ) -> Tuple[Optional[dict], Optional[str], Optional[int]]:
+    """Проверяет параметры запроса, задающие формат и качество кадров.
+
+    Args:
+        frame_format: Название формата.
+        quality: Качество или степень сжатия.
+
+    Returns:
+        Описание ошибок валидации или None, название формата и качество.
+    """
+    if frame_format is not None and frame_format not in FRAME_FORMATS:
+        return {"format": "Unsupported format."}, None, None
+    if quality is None:
+        return None, frame_format, None
+
+    # true и 55.9 из JSON - не качество, хотя int() их принимает
+    if isinstance(quality, bool) or (isinstance(quality, float)
+                                     and not quality.is_integer()):
+        return {"quality": "Required number type"}, None, None
+    try:
+        quality = int(quality)
+    except Exception:
+        return {"quality": "Required number type"}, None, None
+    resolved_format, _ = resolve_encoding(frame_format, quality)
+    if not (resolved_format.min_quality <= quality
+            <= resolved_format.max_quality):
+        message = (f'Not in range {resolved_format.min_quality}-'
+                   f'{resolved_format.max_quality}.')
+        return {"quality": message}, None, None
+    return None, frame_format, quality
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Возвращает пул потоков для кодирования кадров, созданный в текущем
+    процессе.
+    """
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(
+                max_workers=Config().flask['ENCODE_THREADS'],
+                thread_name_prefix='encode_frames'
+            )
+            _executor_pid = os.getpid()
+    return _executor
+
+
+def _encode_image(image: 'ndarray', extension: str,
+                  params: List[int]) -> bytes:
+    import cv2
+
+    with timed('encode'):
+        success, buffer = cv2.imencode(f'.{extension}', image, params)
+    if not success:
+        raise ValueError(f"Failed to encode frame as {extension}")
+    return buffer.tobytes()
+
+
+def _encode_frame(frame: 'ndarray',
+                  extension: str,
+                  params: List[int],
+                  size: Optional['FrameSize'] = None,
+                  release: Optional[Callable[['ndarray'], None]] = None
+                  ) -> bytes:
+    try:
+        image = frame if size is None else size.resize(frame)
+        return _encode_image(image, extension, params)
+    finally:
+        if release is not None:
+            release(frame)
+
+
+def _write_frame(frame_path: str,
+                 frame: 'ndarray',
+                 extension: str,
+                 params: List[int],
+                 size: Optional['FrameSize'],
+                 release: Optional[Callable[['ndarray'], None]]
+                 ) -> Tuple[str, Optional[str]]:
+    # кодирование отдельно от записи, чтобы замерять их по отдельности
+    try:
+        image = frame if size is None else size.resize(frame)
+        image_hash = None
+        if Config().flask['FRAME_PERCEPTUAL_HASH']:
+            image_hash = perceptual_hash(image)
+        data = _encode_image(image, extension, params)
+    finally:
+        if release is not None:
+            release(frame)
+    return write_frame_file(frame_path, data), image_hash
+
+
+def write_frames(
+        frames: Iterable['ndarray'],
+        frame_paths: Iterable[str],
+        frame_format: FrameFormat,
+        quality: int,
+        size: Optional['FrameSize'] = None,
+        release: Optional[Callable[['ndarray'], None]] = None
+    ) -> List[Tuple[str, str, Optional[str]]]:
+    """Кодирует и записывает кадры в файлы по мере их поступления
+    параллельно в пуле потоков. OpenCV отпускает GIL на время кодирования,
+    поэтому кадры кодируются одновременно. Следующий кадр запрашивается,
+    только когда кодируется не больше ENCODE_THREADS кадров, поэтому
+    в памяти одновременно находится несколько кадров.
+
+    Args:
+        frames: Кадры.
+        frame_paths: Пути к файлам с кадрами, не короче кадров.
+        frame_format: Формат файлов с кадрами.
+        quality: Качество или степень сжатия.
+        size: Уменьшенный размер кадров или None для исходного размера.
+        release: Вызывается с кадром, когда кадр больше не нужен, например
+          чтобы вернуть буфер кадра декодеру.
+
+    Returns:
+        Пути к записанным файлам, ключи хранилища, см. write_frame_file,
+        и перцептивные хеши кадров, если FRAME_PERCEPTUAL_HASH включён.
+    """
+    params = [frame_format.quality_flag, quality]
+    executor = _get_executor()
+    max_pending = Config().flask['ENCODE_THREADS']
+    written = []
+    results = []
+    pending = deque()
+    try:
+        for (frame, frame_path) in zip(frames, frame_paths):
+            pending.append(executor.submit(_write_frame, frame_path, frame,
+                                           frame_format.extension, params,
+                                           size, release))
+            written.append(frame_path)
+            while len(pending) > max_pending:
+                results.append(pending.popleft().result())
+        while pending:
+            results.append(pending.popleft().result())
+    except BaseException:
+        # файлы не должны записываться после выхода из функции
+        for future in pending:
+            future.cancel()
+        wait(pending)
+        raise
+    return [(frame_path, *hashes)
+            for (frame_path, hashes) in zip(written, results)]
+
+
+def encode_frames(
+        frames: Iterable['ndarray'],
+        frame_format: FrameFormat,
+        quality: int,
+        size: Optional['FrameSize'] = None,
+        release: Optional[Callable[['ndarray'], None]] = None
+    ) -> Iterator[bytes]:
+    """Кодирует кадры по мере их поступления в пуле потоков и возвращает
+    закодированные кадры в исходном порядке. Пока кодируются уже
+    полученные кадры, декодируется следующий.
+
+    Args:
+        frames: Кадры.
+        frame_format: Формат кадров.
+        quality: Качество или степень сжатия.
+        size: Уменьшенный размер кадров или None для исходного размера.
+        release: Вызывается с кадром после его кодирования.
+
+    Yields:
+        Закодированные кадры.
+    """
+    params = [frame_format.quality_flag, quality]
+    executor = _get_executor()
+    max_pending = Config().flask['ENCODE_THREADS']
+    pending = deque()
+    for frame in frames:
+        pending.append(executor.submit(_encode_frame, frame,
+                                       frame_format.extension, params, size,
+                                       release))
+        while len(pending) > max_pending or (pending and pending[0].done()):
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
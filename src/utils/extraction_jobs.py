@@ -0,0 +1,164 @@
+import os
+import socket
+import threading
+import multiprocessing
+from functools import partial
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import List, Optional, Tuple, TYPE_CHECKING
+
+from sqlalchemy import update
+
+from src.models import db, ExtractionJob
+from src.utils.config import Config
+from src.utils.get_frames import save_frames
+
+if TYPE_CHECKING:
+    from flask import Flask
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_pid: Optional[int] = None
+_executor_lock = threading.Lock()
+_in_flight = 0
+
+
+def current_owner() -> str:
+    """Возвращает хост и идентификатор текущего процесса."""
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def owner_is_alive(owner: str) -> bool:
+    """Проверяет, что процесс, выполняющий задачу, ещё работает. Процессы
+    на других хостах считаются работающими.
+
+    Args:
+        owner: Хост и идентификатор процесса.
+    """
+    host, pid = owner.rsplit(':', 1)
+    if host != socket.gethostname():
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """Возвращает пул процессов для извлечения кадров, созданный в текущем
+    процессе.
+    """
+    global _executor, _executor_pid, _in_flight
+    if _executor is None or _executor_pid != os.getpid():
+        # процессы создаются через spawn, так как в родительском процессе
+        # работают потоки пула и веб-сервера
+        _executor = ProcessPoolExecutor(
+            max_workers=Config().flask['EXTRACTION_WORKERS'],
+            mp_context=multiprocessing.get_context('spawn')
+        )
+        _executor_pid = os.getpid()
+        _in_flight = 0
+    return _executor
+
+
+def _run_job(
+        video_path: str,
+        time_in_video: int,
+        frame_dir: str,
+        frame_format: Optional[str],
+        quality: Optional[int]
+    ) -> Tuple[Optional[int], List[str]]:
+    """Выполняет задачу в процессе пула."""
+    return save_frames(video_path, time_in_video, frame_dir, frame_format,
+                       quality)
+
+
+def submit_job(app: 'Flask', job: ExtractionJob) -> bool:
+    """Отправляет задачу на извлечение кадров в пул процессов.
+
+    Args:
+        app: Flask приложение.
+        job: Задача на извлечение кадров.
+
+    Returns:
+        False, если очередь задач текущего процесса заполнена.
+    """
+    global _in_flight
+    config = Config()
+    video_path = os.path.join(config.flask['VIDEOS_DIR_PATH'],
+                              job.video_file_name)
+    frame_dir = os.path.join(config.flask['FRAMES_DIR_PATH'],
+                             job.video_file_name)
+    with _executor_lock:
+        executor = _get_executor()
+        if _in_flight >= config.flask['EXTRACTION_QUEUE_SIZE']:
+            return False
+        _in_flight += 1
+        future = executor.submit(_run_job, video_path, job.time_in_video,
+                                 frame_dir, job.frame_format, job.quality)
+    future.add_done_callback(partial(_finish_job, app, job.id))
+    return True
+
+
+def _finish_job(app: 'Flask', job_id: str, future: Future) -> None:
+    """Сохраняет в БД результат выполнения задачи.
+
+    Args:
+        app: Flask приложение.
+        job_id: Идентификатор задачи.
+        future: Результат выполнения задачи в пуле процессов.
+    """
+    global _in_flight
+    with _executor_lock:
+        _in_flight -= 1
+
+    with app.app_context():
+        job = db.session.get(ExtractionJob, job_id)
+        if job is None:
+            return
+        try:
+            first_frame, frame_paths = future.result()
+        except NotADirectoryError:
+            job.status = ExtractionJob.FAILED
+            job.message = 'Frame directory is file'
+        except Exception:
+            job.status = ExtractionJob.FAILED
+            job.message = 'Something went wrong'
+        else:
+            if first_frame is None:
+                job.status = ExtractionJob.FAILED
+                job.message = 'Failed to extract frames.'
+            else:
+                job.status = ExtractionJob.DONE
+                job.first_frame = first_frame
+                job.file_paths = frame_paths
+        db.session.commit()
+
+
+def resume_orphaned_job(app: 'Flask', job: ExtractionJob) -> None:
+    """Перезапускает незавершённую задачу, процесс которой был остановлен,
+    например при перезапуске воркера.
+
+    Args:
+        app: Flask приложение.
+        job: Задача на извлечение кадров.
+    """
+    if job.status != ExtractionJob.PENDING or owner_is_alive(job.owner):
+        return
+    orphaned_owner = job.owner
+    stmt = (
+        update(ExtractionJob)
+        .where(ExtractionJob.id == job.id,
+               ExtractionJob.owner == orphaned_owner)
+        .values(owner=current_owner())
+    )
+    # задачу забирает только один из процессов, запросивших её состояние
+    if db.session.execute(stmt).rowcount != 1:
+        db.session.rollback()
+        return
+    db.session.commit()
+    db.session.refresh(job)
+    if not submit_job(app, job):
+        job.owner = orphaned_owner
+        db.session.commit()
@@ -0,0 +1,29 @@
+import os
+
+
+def is_simple_file_name(file_name: str) -> bool:
+    """Проверяет, что имя файла из запроса - имя файла внутри каталога без
+    подкаталогов, а не путь, ведущий за пределы каталога, например
+    ../../something или /etc/something.
+
+    Args:
+        file_name: Имя файла.
+    """
+    separators = [x for x in (os.sep, os.altsep) if x]
+    return not (os.path.isabs(file_name)
+                or '..' in file_name
+                or '\0' in file_name
+                or any(x in file_name for x in separators))
+
+
+def is_inside_dir(path: str, dir_path: str) -> bool:
+    """Проверяет, что путь после разрешения символических ссылок находится
+    внутри каталога.
+
+    Args:
+        path: Проверяемый путь.
+        dir_path: Каталог.
+    """
+    real_dir_path = os.path.realpath(dir_path)
+    real_path = os.path.realpath(path)
+    return os.path.commonpath([real_dir_path, real_path]) == real_dir_path
@@ -0,0 +1,380 @@
+import os
+import time
+import hashlib
+import sqlite3
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.utils.config import Config
+from src.utils.frame_manifest import forget_frame_files
+from src.utils.frame_store import (file_content_hash, file_perceptual_hash,
+                                   remove_frame_file)
+
+_SCHEMA_VERSION = 4
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS frames (
+    file_path TEXT PRIMARY KEY,
+    video_key TEXT NOT NULL,
+    frame_number INTEGER NOT NULL,
+    variant TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL,
+    pinned INTEGER NOT NULL DEFAULT 0,
+    content_hash TEXT,
+    perceptual_hash TEXT
+);
+CREATE INDEX IF NOT EXISTS frames_video_key_frame_number
+    ON frames (video_key, frame_number);
+CREATE INDEX IF NOT EXISTS frames_pinned_last_access
+    ON frames (pinned, last_access);
+CREATE TABLE IF NOT EXISTS timestamps (
+    video_key TEXT NOT NULL,
+    time_in_video INTEGER NOT NULL,
+    first_frame INTEGER NOT NULL,
+    PRIMARY KEY (video_key, time_in_video)
+);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+_COUNTERS = ('hits', 'misses', 'evictions', 'size')
+
+_EVICTION_BATCH = 256
+
+# не больше 999 параметров в одном запросе в старых версиях SQLite
+_QUERY_CHUNK_SIZE = 500
+
+
+def video_key(video_path: str) -> Optional[str]:
+    """Возвращает идентификатор содержимого видеофайла, построенный по пути,
+    размеру и времени изменения файла.
+
+    Args:
+        video_path: Полный путь к видеофайлу.
+
+    Returns:
+        Шестнадцатеричный хеш или None, если файл недоступен.
+    """
+    try:
+        stat = os.stat(video_path)
+    except OSError:
+        return None
+    identity = (f'{os.path.abspath(video_path)}\0'
+                f'{stat.st_size}\0{stat.st_mtime_ns}')
+    return hashlib.sha1(identity.encode()).hexdigest()
+
+
+class FrameCache:
+    """Кеш сохранённых на диск кадров с ограничением занимаемого места.
+
+    Индекс кеша хранится в SQLite и общий для всех процессов приложения.
+    Кадры адресуются идентификатором содержимого видеофайла и номером кадра,
+    при превышении бюджета удаляются давно не запрашиваемые кадры.
+    """
+
+    def __init__(self, index_path: str, max_size: int) -> None:
+        """Инициализирует экземпляр класса.
+
+        Args:
+            index_path: Путь к файлу с индексом кеша.
+            max_size: Максимальный суммарный размер кадров в байтах.
+        """
+        self.index_path = index_path
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Возвращает соединение с индексом, открытое в текущем процессе."""
+        if self._connection is None or self._pid != os.getpid():
+            connection = sqlite3.connect(self.index_path, timeout=30,
+                                         check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            # индекс кеша можно пересоздать, файлы с кадрами перезапишутся
+            version = connection.execute('PRAGMA user_version').fetchone()[0]
+            if version != _SCHEMA_VERSION:
+                connection.executescript(
+                    'DROP TABLE IF EXISTS frames;'
+                    'DROP TABLE IF EXISTS timestamps;'
+                    'DROP TABLE IF EXISTS counters;'
+                    f'PRAGMA user_version = {_SCHEMA_VERSION};'
+                )
+            connection.executescript(_SCHEMA)
+            connection.executemany(
+                'INSERT OR IGNORE INTO counters (name, value) VALUES (?, 0)',
+                [(name,) for name in _COUNTERS]
+            )
+            connection.commit()
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    @staticmethod
+    def _increment(connection: sqlite3.Connection,
+                   name: str,
+                   value: int = 1) -> None:
+        connection.execute(
+            'UPDATE counters SET value = value + ? WHERE name = ?',
+            (value, name)
+        )
+
+    def get(self,
+            video_path: str,
+            time_in_video: int,
+            frames_count: int,
+            variant: str = '',
+            step: int = 1
+            ) -> Optional[Tuple[int, List[str]]]:
+        """Ищет в кеше кадры, ранее извлечённые из видеофайла.
+
+        Args:
+            video_path: Полный путь к видеофайлу.
+            time_in_video: Время от начала видеофайла в секундах.
+            frames_count: Количество кадров.
+            variant: Формат и качество файлов с кадрами.
+            step: Разница номеров соседних кадров.
+
+        Returns:
+            Номер первого кадра и список путей к файлам с кадрами или None,
+            если кадров нет в кеше.
+        """
+        key = video_key(video_path)
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                row = connection.execute(
+                    'SELECT first_frame FROM timestamps '
+                    'WHERE video_key = ? AND time_in_video = ?',
+                    (key, time_in_video)
+                ).fetchone()
+                rows = []
+                if row is not None:
+                    first_frame = row[0]
+                    rows = connection.execute(
+                        'SELECT file_path, size FROM frames '
+                        'WHERE video_key = ? AND frame_number BETWEEN ? AND ? '
+                        'AND (frame_number - ?) % ? = 0 '
+                        'AND variant = ? ORDER BY frame_number',
+                        (key, first_frame,
+                         first_frame + (frames_count - 1) * step,
+                         first_frame, step, variant)
+                    ).fetchall()
+
+                # файлы могли быть удалены в обход кеша
+                missing = [(p, s) for (p, s) in rows if not os.path.isfile(p)]
+                if missing:
+                    connection.executemany(
+                        'DELETE FROM frames WHERE file_path = ?',
+                        [(p,) for (p, _) in missing]
+                    )
+                    self._increment(connection, 'size',
+                                    -sum(s for (_, s) in missing))
+
+                if len(rows) != frames_count or missing:
+                    self._increment(connection, 'misses')
+                    return None
+
+                frame_paths = [p for (p, _) in rows]
+                connection.executemany(
+                    'UPDATE frames SET last_access = ? WHERE file_path = ?',
+                    [(time.time(), p) for p in frame_paths]
+                )
+                self._increment(connection, 'hits')
+        return first_frame, frame_paths
+
+    def put(self,
+            video_path: str,
+            time_in_video: int,
+            first_frame: int,
+            frame_paths: List[str],
+            variant: str = '',
+            step: int = 1,
+            content_hashes: Optional[List[str]] = None,
+            perceptual_hashes: Optional[List[Optional[str]]] = None
+            ) -> None:
+        """Добавляет в кеш записанные на диск кадры и удаляет давно не
+        запрашиваемые кадры при превышении бюджета.
+
+        Args:
+            video_path: Полный путь к видеофайлу.
+            time_in_video: Время от начала видеофайла в секундах.
+            first_frame: Номер первого кадра.
+            frame_paths: Пути к файлам с кадрами по порядку.
+            variant: Формат и качество файлов с кадрами.
+            step: Разница номеров соседних кадров.
+            content_hashes: Ключи хранилища, с которыми записаны кадры,
+              см. src.utils.frame_store.write_frame_file.
+            perceptual_hashes: Перцептивные хеши кадров,
+              см. src.utils.frame_store.perceptual_hash.
+        """
+        key = video_key(video_path)
+        if key is None:
+            return
+        if content_hashes is None:
+            content_hashes = [None] * len(frame_paths)
+        if perceptual_hashes is None:
+            perceptual_hashes = [None] * len(frame_paths)
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    'INSERT OR REPLACE INTO timestamps '
+                    '(video_key, time_in_video, first_frame) VALUES (?, ?, ?)',
+                    (key, time_in_video, first_frame)
+                )
+                for (i, (frame_path, content_hash, image_hash)) in enumerate(
+                        zip(frame_paths, content_hashes, perceptual_hashes)):
+                    size = os.path.getsize(frame_path)
+                    row = connection.execute(
+                        'SELECT size, pinned FROM frames WHERE file_path = ?',
+                        (frame_path,)
+                    ).fetchone()
+                    old_size, pinned = row if row is not None else (0, 0)
+                    connection.execute(
+                        'INSERT OR REPLACE INTO frames (file_path, video_key, '
+                        'frame_number, variant, size, last_access, pinned, '
+                        'content_hash, perceptual_hash) '
+                        'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                        (frame_path, key, first_frame + i * step, variant,
+                         size, now, pinned, content_hash, image_hash)
+                    )
+                    self._increment(connection, 'size', size - old_size)
+                self._evict(connection)
+
+    def pin(self, *frame_paths: str) -> None:
+        """Исключает кадры из вытеснения, например после сохранения
+        служебной информации о них в БД.
+
+        Args:
+            frame_paths: Полные пути к файлам с кадрами.
+        """
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.executemany(
+                    'UPDATE frames SET pinned = 1 WHERE file_path = ?',
+                    [(frame_path,) for frame_path in frame_paths]
+                )
+
+    def content_hashes(self, *frame_paths: str) -> Dict[str, str]:
+        """Возвращает ключи хранилища, с которыми записаны кадры. Для кадров,
+        которых нет в кеше, ключ - SHA-256 содержимого файла.
+
+        Args:
+            frame_paths: Полные пути к файлам с кадрами.
+
+        Returns:
+            Ключи хранилища по путям к существующим файлам с кадрами.
+        """
+        return self._hashes('content_hash', frame_paths, file_content_hash)
+
+    def perceptual_hashes(self, *frame_paths: str) -> Dict[str, str]:
+        """Возвращает перцептивные хеши кадров. Для кадров, которых нет
+        в кеше или которые записаны без хеша, хеш вычисляется по файлу.
+
+        Args:
+            frame_paths: Полные пути к файлам с кадрами.
+
+        Returns:
+            Перцептивные хеши по путям к читаемым файлам с кадрами.
+        """
+        return self._hashes('perceptual_hash', frame_paths,
+                            file_perceptual_hash)
+
+    def _hashes(self,
+                column: str,
+                frame_paths: Tuple[str, ...],
+                file_hash: Callable[[str], Optional[str]]
+                ) -> Dict[str, str]:
+        """Возвращает хеши кадров из столбца индекса, недостающие хеши
+        вычисляет по файлам.
+
+        Args:
+            column: Столбец таблицы frames с хешами.
+            frame_paths: Полные пути к файлам с кадрами.
+            file_hash: Вычисляет хеш по пути к файлу.
+        """
+        hashes = {}
+        with self._lock:
+            connection = self._connect()
+            for start in range(0, len(frame_paths), _QUERY_CHUNK_SIZE):
+                chunk = frame_paths[start:start + _QUERY_CHUNK_SIZE]
+                rows = connection.execute(
+                    f'SELECT file_path, {column} FROM frames '
+                    f'WHERE {column} IS NOT NULL AND file_path IN '
+                    f'({", ".join("?" * len(chunk))})',
+                    chunk
+                )
+                hashes.update(rows.fetchall())
+        for frame_path in frame_paths:
+            if frame_path not in hashes:
+                try:
+                    value = file_hash(frame_path)
+                except FileNotFoundError:
+                    continue
+                if value is not None:
+                    hashes[frame_path] = value
+        return hashes
+
+    def stats(self) -> Dict[str, int]:
+        """Возвращает счётчики попаданий, промахов и вытеснений, а также
+        суммарный размер кадров в кеше.
+        """
+        with self._lock:
+            connection = self._connect()
+            rows = connection.execute('SELECT name, value FROM counters')
+            stats = dict(rows.fetchall())
+        stats['max_size'] = self.max_size
+        return stats
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        """Удаляет давно не запрашиваемые кадры, пока их суммарный размер
+        превышает бюджет.
+
+        Args:
+            connection: Соединение с индексом внутри открытой транзакции.
+        """
+        total_size = connection.execute(
+            "SELECT value FROM counters WHERE name = 'size'"
+        ).fetchone()[0]
+        while total_size > self.max_size:
+            rows = connection.execute(
+                'SELECT file_path, size, content_hash FROM frames '
+                'WHERE pinned = 0 ORDER BY last_access LIMIT ?',
+                (_EVICTION_BATCH,)
+            ).fetchall()
+            if not rows:
+                break
+            evicted = []
+            for (frame_path, size, content_hash) in rows:
+                if total_size <= self.max_size:
+                    break
+                remove_frame_file(frame_path, content_hash)
+                evicted.append((frame_path,))
+                total_size -= size
+            forget_frame_files(frame_path for (frame_path,) in evicted)
+            connection.executemany('DELETE FROM frames WHERE file_path = ?',
+                                   evicted)
+            self._increment(connection, 'evictions', len(evicted))
+        connection.execute(
+            "UPDATE counters SET value = ? WHERE name = 'size'",
+            (total_size,)
+        )
+
+
+_frame_cache: Optional[FrameCache] = None
+
+
+def get_frame_cache() -> FrameCache:
+    """Возвращает кеш кадров, настроенный по конфигурационному файлу."""
+    global _frame_cache
+    if _frame_cache is None:
+        config = Config()
+        _frame_cache = FrameCache(config.flask['FRAME_CACHE_INDEX_PATH'],
+                                  config.flask['FRAME_CACHE_MAX_SIZE'])
+    return _frame_cache
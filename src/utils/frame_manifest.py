@@ -0,0 +1,335 @@
+import os
+import json
+import fcntl
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.utils.config import Config
+from src.utils.metrics import timed
+
+# файлы манифеста и его блокировки в каталоге с кадрами
+MANIFEST_NAME = '.manifest.jsonl'
+_LOCK_NAME = '.manifest.lock'
+
+# строк манифеста сверх удвоенного количества кадров, после которых
+# манифест переписывается без удалённых и заменённых записей
+_COMPACT_SLACK = 1000
+
+# ключ записи манифеста: номер кадра и расширение файла
+FrameKey = Tuple[int, str]
+
+
+def frame_file_path(frame_dir: str, frame_number: int, extension: str) -> str:
+    """Возвращает путь к файлу с кадром. Кадры распределяются по
+    подкаталогам по FRAME_BUCKET_SIZE соседних кадров, чтобы в одном
+    каталоге не было десятков тысяч файлов.
+
+    Args:
+        frame_dir: Каталог с кадрами видеофайла.
+        frame_number: Номер кадра.
+        extension: Расширение файла с кадром.
+    """
+    bucket = frame_number // Config().flask['FRAME_BUCKET_SIZE']
+    return os.path.join(frame_dir, str(bucket), f'{frame_number}.{extension}')
+
+
+def _parse_frame_name(name: str) -> Optional[FrameKey]:
+    """Возвращает номер кадра и расширение по имени файла с кадром или None
+    для других файлов.
+    """
+    number, _, extension = name.partition('.')
+    if not number.isdigit() or not extension or '.' in extension:
+        return None
+    return int(number), extension
+
+
+class FrameManifest:
+    """Манифест каталога с кадрами видеофайла: номер кадра, формат,
+    размер и путь к файлу относительно каталога. Проверка наличия кадров
+    и их перечисление читают манифест вместо обращения к файлам.
+
+    Манифест - файл, в конец которого дописываются строки
+    [номер кадра, расширение, размер, относительный путь], размер null
+    означает удаление кадра. Процесс читает только строки, дописанные после
+    предыдущего чтения.
+    """
+
+    def __init__(self, frame_dir: str) -> None:
+        """Инициализирует экземпляр класса.
+
+        Args:
+            frame_dir: Каталог с кадрами.
+        """
+        self.frame_dir = frame_dir
+        self.path = os.path.join(frame_dir, MANIFEST_NAME)
+        self._lock = threading.Lock()
+        self._entries: Dict[FrameKey, Tuple[str, int]] = {}
+        self._inode: Optional[int] = None
+        self._offset = 0
+        self._lines = 0
+        # каталоги, перечисленные при чтении каталога без манифеста, и время
+        # их изменения, пока оно не меняется, перечисление не повторяется
+        self._scanned: Optional[List[Tuple[str, int]]] = None
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Захватывает блокировку изменения манифеста, общую для процессов
+        на одном хосте.
+        """
+        fd = os.open(os.path.join(self.frame_dir, _LOCK_NAME),
+                     os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            with timed('lock_wait'):
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            # закрытие файла снимает блокировку
+            os.close(fd)
+
+    def _apply(self, entry: list) -> None:
+        frame_number, extension, size, relative_path = entry
+        key = (frame_number, extension)
+        if size is not None:
+            self._entries[key] = (relative_path, size)
+        elif self._entries.get(key, (None,))[0] == relative_path:
+            del self._entries[key]
+        self._lines += 1
+
+    def _refresh(self, locked: bool = False) -> None:
+        """Дочитывает строки, дописанные в манифест другими процессами.
+        Если манифеста нет, при изменении манифеста создаёт его по файлам
+        в каталоге, а при чтении только перечисляет эти файлы, не создавая
+        файлов в каталоге, и повторяет перечисление только после изменения
+        каталога.
+
+        Args:
+            locked: Блокировка изменения манифеста захвачена, манифест
+              изменяется.
+        """
+        try:
+            file = open(self.path, 'rb')
+        except (FileNotFoundError, NotADirectoryError):
+            if not locked or not os.path.isdir(self.frame_dir):
+                if self._inode is None and self._is_scan_current():
+                    return
+                self._entries, self._inode = {}, None
+                self._offset, self._lines = 0, 0
+                for line in self._scan():
+                    self._apply(line)
+                return
+            self._migrate()
+            file = open(self.path, 'rb')
+        with file:
+            inode = os.fstat(file.fileno()).st_ino
+            if inode != self._inode:
+                # манифест переписан при сжатии
+                self._entries, self._inode = {}, inode
+                self._offset, self._lines = 0, 0
+                self._scanned = None
+            file.seek(self._offset)
+            data = file.read()
+        # последняя строка может быть ещё не дописана
+        end = data.rfind(b'\n') + 1
+        for line in data[:end].splitlines():
+            try:
+                self._apply(json.loads(line))
+            except ValueError:
+                continue
+        self._offset += end
+
+    def _migrate(self) -> None:
+        """Создаёт манифест по файлам каталога, записанным до появления
+        манифестов. Файлы остаются на месте, поэтому сохранённые ранее пути
+        к ним продолжают работать. Вызывается с захваченной блокировкой
+        изменения манифеста.
+        """
+        if not os.path.exists(self.path):
+            self._write(self._scan())
+
+    def _is_scan_current(self) -> bool:
+        """Проверяет, что каталоги не изменялись после перечисления."""
+        if self._scanned is None:
+            return False
+        try:
+            return all(os.stat(path).st_mtime_ns == mtime_ns
+                       for (path, mtime_ns) in self._scanned)
+        except OSError:
+            return False
+
+    def _scan(self) -> List[list]:
+        """Возвращает строки манифеста для файлов с кадрами в каталоге и
+        его подкаталогах или пустой список, если каталога нет.
+        """
+        lines = []
+        self._scanned = None
+        try:
+            scanned = [(self.frame_dir,
+                        os.stat(self.frame_dir).st_mtime_ns)]
+        except OSError:
+            return lines
+        if not os.path.isdir(self.frame_dir):
+            return lines
+        with timed('manifest_migrate'), os.scandir(self.frame_dir) as dirs:
+            for entry in dirs:
+                if entry.is_file():
+                    candidates = [(entry.name, entry)]
+                elif entry.name.isdigit() and entry.is_dir():
+                    # время изменения до перечисления, чтобы файлы,
+                    # добавленные во время перечисления, не потерялись
+                    scanned.append((entry.path,
+                                    entry.stat().st_mtime_ns))
+                    with os.scandir(entry.path) as files:
+                        candidates = [(os.path.join(entry.name, x.name), x)
+                                      for x in files if x.is_file()]
+                else:
+                    continue
+                for (relative_path, file_entry) in candidates:
+                    key = _parse_frame_name(file_entry.name)
+                    if key is not None:
+                        lines.append([*key, file_entry.stat().st_size,
+                                      relative_path])
+        self._scanned = scanned
+        return lines
+
+    def _write(self, lines: List[list]) -> None:
+        """Атомарно заменяет манифест строками."""
+        tmp_path = f'{self.path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w') as file:
+            file.writelines(json.dumps(x, separators=(',', ':')) + '\n'
+                            for x in lines)
+        os.replace(tmp_path, self.path)
+
+    def _append(self, lines: List[list]) -> None:
+        """Дописывает строки в манифест и переписывает его, если в нём
+        накопилось много удалённых и заменённых записей.
+        """
+        if not lines:
+            return
+        with self._lock, self._file_lock():
+            self._refresh(locked=True)
+            with open(self.path, 'a') as file:
+                # строка, не дописанная при аварийном завершении, завершается
+                if file.tell() > self._offset:
+                    file.write('\n')
+                file.write(''.join(json.dumps(x, separators=(',', ':')) + '\n'
+                                   for x in lines))
+            self._refresh(locked=True)
+            if self._lines > 2 * len(self._entries) + _COMPACT_SLACK:
+                with timed('manifest_compact'):
+                    self._write([[*key, size, relative_path]
+                                 for (key, (relative_path, size))
+                                 in sorted(self._entries.items())])
+
+    def add(self, frame_paths: Iterable[str]) -> None:
+        """Добавляет в манифест записанные файлы с кадрами.
+
+        Args:
+            frame_paths: Пути к файлам с кадрами внутри каталога.
+        """
+        lines = []
+        for frame_path in frame_paths:
+            key = _parse_frame_name(os.path.basename(frame_path))
+            lines.append([*key, os.path.getsize(frame_path),
+                          os.path.relpath(frame_path, self.frame_dir)])
+        self._append(lines)
+
+    def remove(self, frame_paths: Iterable[str]) -> None:
+        """Удаляет из манифеста удалённые файлы с кадрами.
+
+        Args:
+            frame_paths: Пути к файлам с кадрами внутри каталога.
+        """
+        lines = []
+        for frame_path in frame_paths:
+            key = _parse_frame_name(os.path.basename(frame_path))
+            lines.append([*key, None,
+                          os.path.relpath(frame_path, self.frame_dir)])
+        self._append(lines)
+
+    def entries(self) -> Dict[FrameKey, Tuple[str, int]]:
+        """Возвращает кадры каталога.
+
+        Returns:
+            Полные пути к файлам с кадрами и их размеры по номеру кадра и
+            расширению.
+        """
+        with self._lock:
+            self._refresh()
+            return {
+                key: (os.path.join(self.frame_dir, relative_path), size)
+                for (key, (relative_path, size)) in self._entries.items()
+            }
+
+    def entry(self,
+              frame_number: int,
+              extension: str) -> Optional[Tuple[str, int]]:
+        """Возвращает путь к файлу с кадром и его размер или None, если
+        кадра нет.
+
+        Args:
+            frame_number: Номер кадра.
+            extension: Расширение файла с кадром.
+        """
+        with self._lock:
+            self._refresh()
+            entry = self._entries.get((frame_number, extension))
+        if entry is None:
+            return None
+        return os.path.join(self.frame_dir, entry[0]), entry[1]
+
+    def find(self, frame_number: int, extension: str) -> Optional[str]:
+        """Возвращает путь к файлу с кадром или None, если кадра нет.
+
+        Args:
+            frame_number: Номер кадра.
+            extension: Расширение файла с кадром.
+        """
+        entry = self.entry(frame_number, extension)
+        return entry[0] if entry is not None else None
+
+
+_manifests: Dict[str, FrameManifest] = {}
+_manifests_lock = threading.Lock()
+
+
+def get_frame_manifest(frame_dir: str) -> FrameManifest:
+    """Возвращает манифест каталога с кадрами. Экземпляр общий для потоков
+    процесса, чтобы прочитанные строки не читались повторно.
+
+    Args:
+        frame_dir: Каталог с кадрами.
+    """
+    frame_dir = os.path.normpath(frame_dir)
+    with _manifests_lock:
+        manifest = _manifests.get(frame_dir)
+        if manifest is None:
+            manifest = _manifests[frame_dir] = FrameManifest(frame_dir)
+    return manifest
+
+
+def _manifest_dir(frame_path: str) -> Optional[str]:
+    """Возвращает каталог манифеста, в который входит файл с кадром."""
+    frame_dir = os.path.dirname(frame_path)
+    if os.path.isfile(os.path.join(frame_dir, MANIFEST_NAME)):
+        return frame_dir
+    if os.path.basename(frame_dir).isdigit():
+        parent = os.path.dirname(frame_dir)
+        if os.path.isfile(os.path.join(parent, MANIFEST_NAME)):
+            return parent
+    return None
+
+
+def forget_frame_files(frame_paths: Iterable[str]) -> None:
+    """Удаляет удалённые файлы с кадрами из манифестов их каталогов.
+
+    Args:
+        frame_paths: Пути к удалённым файлам с кадрами.
+    """
+    by_dir: Dict[str, List[str]] = {}
+    for frame_path in frame_paths:
+        frame_dir = _manifest_dir(frame_path)
+        if frame_dir is not None:
+            by_dir.setdefault(frame_dir, []).append(frame_path)
+    for (frame_dir, paths) in by_dir.items():
+        get_frame_manifest(frame_dir).remove(paths)
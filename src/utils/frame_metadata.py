@@ -0,0 +1,61 @@
+import os
+from typing import Dict, Optional
+
+from src.utils.config import Config
+from src.utils.encode_frames import FRAME_FORMATS
+from src.utils.video_index import VideoIndex, get_video_index
+
+# название формата по расширению файла с кадром
+_FORMAT_BY_EXTENSION = {x.extension: x.name for x in FRAME_FORMATS.values()}
+
+
+def video_index_for(video_file_name: str) -> Optional[VideoIndex]:
+    """Возвращает индекс видеофайла из каталога с видео или None, если
+    видеофайла нет или его не удалось открыть.
+
+    Args:
+        video_file_name: Имя видеофайла.
+    """
+    video_path = os.path.join(Config().flask['VIDEOS_DIR_PATH'],
+                              video_file_name)
+    try:
+        return get_video_index(video_path)
+    except OSError:
+        return None
+
+
+def frame_metadata(frame_number: int,
+                   frame_path: str,
+                   file_size: Optional[int] = None,
+                   index: Optional[VideoIndex] = None
+                   ) -> Dict[str, object]:
+    """Возвращает сведения о сохранённом кадре полноразмерного видео для
+    столбцов FrameServiceInformation. Время и размер кадра берутся из индекса
+    видеофайла, поэтому файл с кадром не читается.
+
+    Args:
+        frame_number: Номер кадра.
+        frame_path: Путь к файлу с кадром.
+        file_size: Размер файла с кадром в байтах, например из манифеста.
+          По умолчанию определяется по файлу.
+        index: Индекс видеофайла или None, если он неизвестен.
+
+    Returns:
+        Значения столбцов timestamp, width, height, file_size и format.
+    """
+    if file_size is None:
+        file_size = os.path.getsize(frame_path)
+    extension = os.path.splitext(frame_path)[1].lstrip('.')
+    metadata = {
+        "timestamp": None,
+        "width": None,
+        "height": None,
+        "file_size": file_size,
+        "format": _FORMAT_BY_EXTENSION.get(extension),
+    }
+    if index is not None:
+        metadata['timestamp'] = index.timestamp(frame_number)
+        # 0, если размер кадров в видеофайле не указан
+        metadata['width'] = index.width or None
+        metadata['height'] = index.height or None
+    return metadata
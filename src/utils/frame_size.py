@@ -0,0 +1,147 @@
+from typing import Optional, Tuple, TYPE_CHECKING
+
+from src.utils.metrics import timed
+
+if TYPE_CHECKING:
+    from numpy import ndarray
+
+# ширина и высота кадра 8K
+MAX_FRAME_SIDE = 7680
+
+# знаков после запятой в коэффициенте уменьшения, чтобы разные
+# коэффициенты не получали одно название размера
+SCALE_DIGITS = 4
+
+
+class FrameSize:
+    """Уменьшенный размер кадров, например для превью. Кадры уменьшаются
+    после декодирования перед кодированием и не увеличиваются.
+
+    Attributes:
+        width: Ширина кадра или None.
+        height: Высота кадра или None. Если задана только одна сторона,
+          другая вычисляется с сохранением пропорций.
+        scale: Коэффициент уменьшения или None.
+    """
+
+    def __init__(self,
+                 width: Optional[int] = None,
+                 height: Optional[int] = None,
+                 scale: Optional[float] = None,
+                 ) -> None:
+        """Инициализирует экземпляр класса.
+
+        Args:
+            width: Ширина кадра.
+            height: Высота кадра.
+            scale: Коэффициент уменьшения, вместо ширины и высоты.
+        """
+        self.width = width
+        self.height = height
+        self.scale = scale
+
+    @property
+    def name(self) -> str:
+        """Название размера для каталога с кадрами и ключа кеша."""
+        if self.scale is not None:
+            return f's{self.scale:g}'
+        name = ''
+        if self.width is not None:
+            name += f'w{self.width}'
+        if self.height is not None:
+            name += f'h{self.height}'
+        return name
+
+    def target(self, source_width: int, source_height: int) -> Tuple[int, int]:
+        """Возвращает ширину и высоту уменьшенного кадра.
+
+        Args:
+            source_width: Ширина исходного кадра.
+            source_height: Высота исходного кадра.
+        """
+        if self.scale is not None:
+            width = source_width * self.scale
+            height = source_height * self.scale
+        elif self.width is not None and self.height is not None:
+            width, height = self.width, self.height
+        elif self.width is not None:
+            width = self.width
+            height = source_height * self.width / source_width
+        else:
+            height = self.height
+            width = source_width * self.height / source_height
+        return (max(1, min(source_width, round(width))),
+                max(1, min(source_height, round(height))))
+
+    def resize(self, frame: 'ndarray') -> 'ndarray':
+        """Уменьшает кадр.
+
+        Args:
+            frame: Исходный кадр.
+        """
+        source_height, source_width = frame.shape[:2]
+        size = self.target(source_width, source_height)
+        if size == (source_width, source_height):
+            return frame
+        import cv2
+
+        with timed('resize'):
+            return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+
+def validate_size_params(
+        width: Optional[str],
+        height: Optional[str],
+        scale: Optional[str]
+    ) -> Tuple[Optional[dict], Optional[FrameSize]]:
+    """Проверяет параметры запроса, задающие размер кадров.
+
+    Args:
+        width: Ширина кадра.
+        height: Высота кадра.
+        scale: Коэффициент уменьшения, округляется до SCALE_DIGITS знаков.
+
+    Returns:
+        Описание ошибок валидации или None и размер кадров или None для
+        исходного размера.
+    """
+    if width is None and height is None and scale is None:
+        return None, None
+    if scale is not None and (width is not None or height is not None):
+        return {"scale": "Not allowed with width or height."}, None
+
+    if scale is not None:
+        # true из JSON - не коэффициент, хотя float() его принимает
+        if isinstance(scale, bool):
+            return {"scale": "Required number type"}, None
+        try:
+            scale = round(float(scale), SCALE_DIGITS)
+        except Exception:
+            return {"scale": "Required number type"}, None
+        if not 0 < scale <= 1:
+            return {"scale": "Not in range 0-1."}, None
+        return None, FrameSize(scale=scale)
+
+    sides = {}
+    type_validation_failed = {}
+    for (field, value) in (('width', width), ('height', height)):
+        if value is None:
+            continue
+        # true и 10.5 из JSON - не размер, хотя int() их принимает
+        if isinstance(value, bool) or (isinstance(value, float)
+                                       and not value.is_integer()):
+            type_validation_failed[field] = 'Required number type'
+            continue
+        try:
+            sides[field] = int(value)
+        except Exception:
+            type_validation_failed[field] = 'Required number type'
+            continue
+        if sides[field] < 1:
+            type_validation_failed[field] = 'Less than minimum value 1.'
+        elif sides[field] > MAX_FRAME_SIDE:
+            type_validation_failed[field] = (
+                f'Greater than maximum value {MAX_FRAME_SIDE}.')
+    if len(type_validation_failed) > 0:
+        return type_validation_failed, None
+    return None, FrameSize(**sides)
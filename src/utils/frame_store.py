@@ -0,0 +1,219 @@
+import os
+import errno
+import hashlib
+import threading
+from typing import Optional, TYPE_CHECKING
+
+from src.utils.config import Config
+from src.utils.metrics import BYTES_WRITTEN, FRAMES_DEDUPLICATED, timed
+
+if TYPE_CHECKING:
+    from numpy import ndarray
+
+# каталог с содержимым кадров внутри FRAMES_DIR_PATH, файлы с кадрами -
+# жёсткие ссылки на файлы в нём
+OBJECTS_DIR_NAME = '.objects'
+
+# сторона сетки, по которой вычисляется перцептивный хеш, хеш занимает
+# _PERCEPTUAL_HASH_SIZE ** 2 бит
+_PERCEPTUAL_HASH_SIZE = 16
+
+_READ_CHUNK_SIZE = 1 << 20
+
+
+def content_hash(data: bytes) -> str:
+    """Возвращает SHA-256 закодированного кадра.
+
+    Args:
+        data: Закодированный кадр.
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_content_hash(frame_path: str) -> str:
+    """Возвращает SHA-256 содержимого файла с кадром.
+
+    Args:
+        frame_path: Путь к файлу с кадром.
+    """
+    digest = hashlib.sha256()
+    with open(frame_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(_READ_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def perceptual_hash(image: 'ndarray') -> str:
+    """Возвращает перцептивный хеш кадра: знаки разностей яркости соседних
+    ячеек уменьшенного изображения. У визуально неотличимых кадров хеши
+    совпадают, поэтому хеш годится для поиска похожих кадров, но не для
+    хранения: совпадает он и у разных кадров, например у однотонных кадров
+    разного цвета.
+
+    Args:
+        image: Кадр перед кодированием.
+    """
+    import cv2
+    import numpy as np
+
+    gray = image if image.ndim == 2 else cv2.cvtColor(image,
+                                                       cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(gray, (_PERCEPTUAL_HASH_SIZE + 1,
+                              _PERCEPTUAL_HASH_SIZE),
+                       interpolation=cv2.INTER_AREA)
+    return np.packbits(small[:, 1:] > small[:, :-1]).tobytes().hex()
+
+
+def file_perceptual_hash(frame_path: str) -> Optional[str]:
+    """Возвращает перцептивный хеш кадра из файла или None, если файл не
+    удалось прочитать.
+
+    Args:
+        frame_path: Путь к файлу с кадром.
+    """
+    import cv2
+
+    image = cv2.imread(frame_path, cv2.IMREAD_GRAYSCALE)
+    return perceptual_hash(image) if image is not None else None
+
+
+def object_path(frame_path: str, key: str) -> str:
+    """Возвращает путь к файлу с содержимым кадра в хранилище.
+
+    Args:
+        frame_path: Путь к файлу с кадром, задаёт расширение.
+        key: Хеш содержимого кадра.
+    """
+    extension = os.path.splitext(frame_path)[1]
+    return os.path.join(Config().flask['FRAMES_DIR_PATH'], OBJECTS_DIR_NAME,
+                        key[:2], f'{key}{extension}')
+
+
+def _tmp_path(path: str) -> str:
+    return f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+
+
+def _write_file(path: str, data: bytes) -> None:
+    """Записывает данные во временный файл и переименовывает его, чтобы
+    другие процессы не прочитали частично записанный файл.
+    """
+    tmp_path = _tmp_path(path)
+    try:
+        with open(tmp_path, 'wb') as file:
+            file.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    BYTES_WRITTEN.inc(len(data))
+
+
+def _link_object(frame_path: str, data: bytes, key: str) -> bool:
+    """Создаёт файл с кадром как жёсткую ссылку на содержимое в хранилище,
+    записывая содержимое, если его там ещё нет.
+
+    Returns:
+        False, если файловая система не поддерживает ссылку.
+    """
+    path = object_path(frame_path, key)
+    for _ in range(2):
+        if os.path.exists(path):
+            FRAMES_DEDUPLICATED.inc()
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            _write_file(path, data)
+        tmp_path = _tmp_path(frame_path)
+        try:
+            os.link(path, tmp_path)
+        except FileNotFoundError:
+            # содержимое удалено при вытеснении из кеша, записываем заново
+            continue
+        except OSError as e:
+            # другая файловая система или слишком много ссылок на файл
+            if e.errno in (errno.EXDEV, errno.EMLINK, errno.EPERM,
+                           errno.EOPNOTSUPP):
+                return False
+            raise
+        try:
+            os.replace(tmp_path, frame_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        return True
+    return False
+
+
+def _linked_object_key(frame_path: str) -> Optional[str]:
+    """Возвращает ключ содержимого в хранилище, на которое ссылается
+    существующий файл с кадром, или None, если файла нет или он записан
+    отдельно.
+
+    Args:
+        frame_path: Путь к файлу с кадром.
+    """
+    try:
+        stat = os.stat(frame_path)
+        if stat.st_nlink < 2:
+            return None
+        key = file_content_hash(frame_path)
+        if os.stat(object_path(frame_path, key)).st_ino != stat.st_ino:
+            return None
+    except FileNotFoundError:
+        return None
+    return key
+
+
+def _remove_unused_object(frame_path: str, key: str) -> None:
+    """Удаляет содержимое кадра из хранилища, если на него больше не
+    ссылаются файлы с кадрами.
+    """
+    path = object_path(frame_path, key)
+    try:
+        if os.stat(path).st_nlink == 1:
+            os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def write_frame_file(frame_path: str, data: bytes) -> str:
+    """Записывает закодированный кадр в файл. Если включено хранение по
+    содержимому, одинаковые кадры хранятся на диске один раз, а файлы
+    с кадрами - жёсткие ссылки на них. Файл с кадром заменяется атомарно,
+    поэтому другие процессы не прочитают частично записанный файл.
+    Содержимое заменённого кадра удаляется из хранилища, если на него
+    больше не ссылаются другие файлы.
+
+    Args:
+        frame_path: Путь к файлу с кадром.
+        data: Закодированный кадр.
+
+    Returns:
+        Ключ хранилища, SHA-256 закодированного кадра.
+    """
+    key = content_hash(data)
+    with timed('write'):
+        os.makedirs(os.path.dirname(frame_path), exist_ok=True)
+        old_key = _linked_object_key(frame_path)
+        if (Config().flask['FRAME_DEDUPLICATION'] == 'none'
+                or not _link_object(frame_path, data, key)):
+            _write_file(frame_path, data)
+        if old_key is not None and old_key != key:
+            _remove_unused_object(frame_path, old_key)
+    return key
+
+
+def remove_frame_file(frame_path: str, key: Optional[str] = None) -> None:
+    """Удаляет файл с кадром и содержимое кадра из хранилища, если на него
+    больше не ссылаются другие файлы.
+
+    Args:
+        frame_path: Путь к файлу с кадром.
+        key: Ключ хранилища, с которым был записан кадр.
+    """
+    try:
+        os.remove(frame_path)
+    except FileNotFoundError:
+        pass
+    if key is not None:
+        _remove_unused_object(frame_path, key)
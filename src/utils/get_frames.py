@@ -1,48 +1,672 @@
-from typing import List, Tuple, Optional, TYPE_CHECKING
-
-import cv2
+import os
+import itertools
+import threading
+from typing import (Callable, Iterable, Iterator, List, Optional, Sequence,
+                    Tuple, TYPE_CHECKING)
 
 from src.utils.config import Config
+from src.utils.decoder_pool import can_continue, get_decoder_pool
+from src.utils.encode_frames import (encode_frames, encoding_variant,
+                                     resolve_encoding, write_frames)
+from src.utils.frame_cache import get_frame_cache, video_key
+from src.utils.frame_manifest import frame_file_path, get_frame_manifest
+from src.utils.frame_size import FrameSize
+from src.utils.frame_store import remove_frame_file, write_frame_file
+from src.utils.metrics import (FRAMES_DECODED, FRAMES_RETURNED, timed,
+                               timed_iter)
+from src.utils.single_flight import flight_section, single_flight
+from src.utils.video_index import get_video_index
 
 if TYPE_CHECKING:
+    import cv2
     from numpy import ndarray
 
+# OpenCV импортируется в функциях, которые его используют, чтобы импорт
+# модуля, например маршрутами без обработки кадров, не загружал OpenCV
+
+
+def frame_numbers(first_frame: int,
+                  frames_count: int,
+                  step: int = 1) -> range:
+    """Возвращает номера извлекаемых кадров.
+
+    Args:
+        first_frame: Номер первого извлекаемого кадра.
+        frames_count: Количество извлекаемых кадров.
+        step: Разница номеров соседних извлекаемых кадров.
+    """
+    return range(first_frame, first_frame + frames_count * step, step)
+
+
+class FrameBuffers:
+    """Буферы для декодированных кадров, которые переиспользуются после
+    кодирования кадров. Количество буферов ограничено, поэтому декодер
+    ждёт, пока не освободится буфер, и в памяти одновременно находится
+    не больше capacity кадров.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """Инициализирует экземпляр класса.
+
+        Args:
+            capacity: Количество буферов или 0, чтобы не переиспользовать
+              буферы и не ограничивать количество кадров.
+        """
+        self.capacity = capacity
+        self._free: List['ndarray'] = []
+        self._allocated = 0
+        self._condition = threading.Condition()
+
+    def acquire(self) -> Optional['ndarray']:
+        """Возвращает свободный буфер или None, если декодер должен
+        выделить новый буфер.
+        """
+        if self.capacity == 0:
+            return None
+        with self._condition:
+            while not self._free and self._allocated >= self.capacity:
+                self._condition.wait()
+            if self._free:
+                return self._free.pop()
+            self._allocated += 1
+            return None
+
+    def release(self, frame: Optional['ndarray']) -> None:
+        """Возвращает буфер после кодирования кадра.
+
+        Args:
+            frame: Кадр, декодированный в буфер из acquire, или None, если
+              декодирование не удалось.
+        """
+        if self.capacity == 0:
+            return
+        with self._condition:
+            if frame is None:
+                self._allocated -= 1
+            else:
+                self._free.append(frame)
+            self._condition.notify()
+
+
+def _iter_frames_linear(
+        cap: 'cv2.VideoCapture',
+        numbers: Sequence[int],
+        total_frames: int,
+        buffers: FrameBuffers
+    ) -> Iterator['ndarray']:
+    """Последовательно декодирует видео с начала файла до нужных кадров.
+    Ненужные кадры только декодируются без преобразования в изображение.
+
+    Args:
+        cap: Открытый видеофайл, позиция чтения в начале файла.
+        numbers: Номера извлекаемых кадров по возрастанию.
+        total_frames: Количество кадров в видеофайле.
+        buffers: Буферы для декодированных кадров.
+
+    Yields:
+        Извлечённые кадры.
+    """
+    wanted = iter(numbers)
+    next_wanted = next(wanted, None)
+    frame_counter = 0
+    while next_wanted is not None and frame_counter < total_frames:
+        success = cap.grab()
+        frame_counter += 1
+        if not success:
+            continue
+        FRAMES_DECODED.inc()
+        if frame_counter - 1 < next_wanted:
+            continue
+        if frame_counter - 1 > next_wanted:
+            # нужный кадр не удалось декодировать
+            return
+
+        buffer = buffers.acquire()
+        success, image = cap.retrieve(buffer)
+        if not success:
+            buffers.release(buffer)
+            return
+        yield image
+        next_wanted = next(wanted, None)
+
+
+def _iter_frames_seek(
+        cap: 'cv2.VideoCapture',
+        numbers: Sequence[int],
+        keyframe_before: Callable[[int], Optional[int]],
+        buffers: FrameBuffers,
+        position: int = 0
+    ) -> Iterator['ndarray']:
+    """Переходит к ближайшему ключевому кадру перед каждым нужным кадром и
+    декодирует видео только от него. Если декодер уже остановился между
+    этим ключевым кадром и нужным кадром, а без ключевого кадра - не
+    дальше MAX_DECODE_AHEAD кадров до нужного кадра, декодирование
+    продолжается без перехода. Ненужные кадры только декодируются без
+    преобразования в изображение.
+
+    Args:
+        cap: Открытый видеофайл.
+        numbers: Номера извлекаемых кадров по возрастанию.
+        keyframe_before: Возвращает номер ближайшего ключевого кадра из
+          индекса видеофайла или None. Если ключевой кадр неизвестен,
+          его выбирает бэкенд FFmpeg.
+        buffers: Буферы для декодированных кадров.
+        position: Номер следующего декодируемого кадра.
+
+    Yields:
+        Извлечённые кадры. Если позиционирование в файле ненадёжно, кадров
+        меньше запрошенного и остальные нужно извлекать последовательным
+        чтением.
+    """
+    import cv2
+
+    for frame_number in numbers:
+        # без индекса бэкенд FFmpeg сам переходит к ключевому кадру перед
+        # нужным кадром и декодирует кадры до него
+        keyframe = keyframe_before(frame_number)
+        seek_frame = frame_number if keyframe is None else keyframe
+        if (keyframe is not None or position > 0) and can_continue(
+                position, frame_number, keyframe):
+            seek_frame = position
+        if seek_frame != position:
+            with timed('seek'):
+                if not cap.set(cv2.CAP_PROP_POS_FRAMES, seek_frame):
+                    return
+                if int(cap.get(cv2.CAP_PROP_POS_FRAMES)) != seek_frame:
+                    return
+            position = seek_frame
+
+        while position < frame_number:
+            if not cap.grab():
+                return
+            position += 1
+            FRAMES_DECODED.inc()
+
+        buffer = buffers.acquire()
+        success, image = cap.read(buffer)
+        if not success:
+            buffers.release(buffer)
+            return
+        position += 1
+        FRAMES_DECODED.inc()
+        yield image
+
+
+def _iter_frames(
+        video_path: str,
+        key: str,
+        numbers: Sequence[int],
+        total_frames: int,
+        keyframe_before: Callable[[int], Optional[int]],
+        seek: bool,
+        buffers: FrameBuffers
+    ) -> Iterator['ndarray']:
+    """Извлекает кадры с переходом к ключевому кадру, используя открытый
+    видеофайл из пула процесса, и продолжает последовательным чтением с
+    начала файла, если переход не удался.
+    """
+    import cv2
+
+    extracted = 0
+    if seek:
+        pool = get_decoder_pool()
+        handle = pool.checkout(video_path, key, numbers[0],
+                               keyframe_before(numbers[0]))
+        try:
+            if handle.cap.isOpened():
+                for image in _iter_frames_seek(handle.cap, numbers,
+                                               keyframe_before, buffers,
+                                               handle.position):
+                    extracted += 1
+                    FRAMES_RETURNED.inc()
+                    yield image
+        finally:
+            if extracted == len(numbers):
+                handle.position = numbers[-1] + 1
+                pool.checkin(handle)
+            else:
+                pool.discard(handle)
+        if extracted == len(numbers):
+            return
+
+    with timed('open'):
+        cap = cv2.VideoCapture(video_path)
+    try:
+        for image in _iter_frames_linear(cap, numbers[extracted:],
+                                         total_frames, buffers):
+            FRAMES_RETURNED.inc()
+            yield image
+    finally:
+        cap.release()
+
+
+def iter_frames(
+        video_path: str,
+        time_in_video: int,
+        seek: bool = True,
+        frames_count: Optional[int] = None,
+        step: int = 1,
+        buffers: Optional[FrameBuffers] = None
+    ) -> Tuple[Optional[int], Iterator['ndarray']]:
+    """Функция для извлечения кадров из видеофайла по одному по мере
+    декодирования.
+
+    Args:
+        video_path: Полный путь к видеофайлу.
+        time_in_video: Время от начала видеофайла в секундах.
+        seek: Переходить к нужному кадру без декодирования всего файла.
+          При ненадёжном позиционировании используется последовательное
+          чтение с начала файла.
+        frames_count: Количество кадров, по умолчанию из конфигурационного
+          файла.
+        step: Разница номеров соседних извлекаемых кадров. Кадры между
+          ними не преобразуются в изображения, а при большом шаге декодер
+          переходит к ключевым кадрам.
+        buffers: Буферы, в которые декодируются кадры. Каждый полученный
+          кадр нужно вернуть в buffers.release после использования. По
+          умолчанию для каждого кадра выделяется новый массив.
+
+    Returns:
+        Номер первого извлекаемого кадра и итератор по извлекаемым кадрам
+        или None и пустой итератор, если кадры извлечь нельзя. Если видеофайл
+        повреждён, итератор может вернуть меньше кадров, чем запрошено.
+    """
+    with timed('index'):
+        index = get_video_index(video_path)
+    if index is None:
+        return None, iter(())
+    if frames_count is None:
+        frames_count = Config().flask['SAVE_FRAMES_COUNT']
+
+    # зная количество кадров в секунду (fps), здесь можно определить кадр,
+    # соответствующий заданному времени на видео
+    first_frame = index.frame_number(time_in_video)
+    numbers = frame_numbers(first_frame, frames_count, step)
+    if numbers[-1] >= index.frame_count:
+        return None, iter(())
+    key = video_key(video_path)
+    if key is None:
+        return None, iter(())
+
+    # видеофайл открывается при получении первого кадра, чтобы
+    # неиспользованный итератор не занимал место в пуле
+    if buffers is None:
+        buffers = FrameBuffers(0)
+    frames = _iter_frames(video_path, key, numbers, index.frame_count,
+                          index.keyframe_before, seek, buffers)
+    return first_frame, timed_iter(frames, 'decode')
+
 
 def extract_frame(
         video_path: str,
-        time_in_video: int
+        time_in_video: int,
+        seek: bool = True,
+        frames_count: Optional[int] = None,
+        step: int = 1
     ) -> Tuple[Optional[int], List['ndarray']]:
     """Функция для извлечения кадров из видеофайла.
 
     Args:
         video_path: Полный путь к видеофайлу.
         time_in_video: Время от начала видеофайла в секундах.
+        seek: Переходить к нужному кадру без декодирования всего файла.
+          При ненадёжном позиционировании используется последовательное
+          чтение с начала файла.
+        frames_count: Количество кадров, по умолчанию из конфигурационного
+          файла.
+        step: Разница номеров соседних извлекаемых кадров.
 
     Returns:
         Номер первого извлечённого кадра и список извлечённых кадров.
+        Все кадры находятся в памяти одновременно, для сохранения кадров
+        используется iter_frames с FrameBuffers.
     """
-    cap = cv2.VideoCapture(video_path)
-    fps = cap.get(cv2.CAP_PROP_FPS)
-    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-    if not cap.isOpened():
-        return
-    frame_counter = 0
-    images = []
-    save_frames_count = Config().flask['SAVE_FRAMES_COUNT']
-    while frame_counter < total_frames:
-        success, image = cap.read()
-        frame_counter += 1
-        if not success:
-            continue
-        # зная количество кадров в секунду (fps), здесь можно определить кадр,
-        # соответствующий заданному времени на видео
-        if time_in_video * fps + save_frames_count < frame_counter:
-            break
+    if frames_count is None:
+        frames_count = Config().flask['SAVE_FRAMES_COUNT']
+    first_frame, frames = iter_frames(video_path, time_in_video, seek,
+                                      frames_count, step)
+    images = list(frames)
 
-        if time_in_video * fps < frame_counter:
-            images.append(image)
-
-    if len(images) == save_frames_count:
-        return int(time_in_video * fps), images
+    if len(images) == frames_count:
+        return first_frame, images
     else:
         return None, []
+
+
+def iter_frame_ranges(
+        video_path: str,
+        times_in_video: Iterable[int],
+        seek: bool = True,
+        frames_count: Optional[int] = None,
+        step: int = 1,
+        buffers: Optional[FrameBuffers] = None
+    ) -> Iterator[Tuple[int, Optional[int], Iterator['ndarray']]]:
+    """Функция для извлечения кадров для нескольких моментов времени из
+    одного видеофайла по одному кадру по мере декодирования.
+
+    Моменты времени обрабатываются по возрастанию. С переходом к ключевым
+    кадрам видеофайл берётся из пула открытых видеофайлов процесса, поэтому
+    декодер следующего момента времени продолжает с позиции, на которой
+    остановился предыдущий, если до нужного кадра нет ключевого кадра.
+    Кадры не накапливаются в памяти: кадры, общие для нескольких моментов
+    времени, декодируются для каждого из них.
+
+    Args:
+        video_path: Полный путь к видеофайлу.
+        times_in_video: Время от начала видеофайла в секундах.
+        seek: Переходить к ключевым кадрам. При ненадёжном позиционировании
+          оставшиеся кадры извлекаются последовательным чтением.
+        frames_count: Количество кадров для каждого момента времени, по
+          умолчанию из конфигурационного файла.
+        step: Разница номеров соседних извлекаемых кадров.
+        buffers: Буферы, в которые декодируются кадры, см. iter_frames.
+
+    Yields:
+        Время от начала видеофайла по возрастанию, номер первого
+        извлекаемого кадра и итератор по извлекаемым кадрам или None и
+        пустой итератор, если кадры извлечь нельзя. Итератор нужно исчерпать
+        до перехода к следующему моменту времени. Если видеофайл повреждён,
+        итератор может вернуть меньше кадров, чем запрошено.
+    """
+    for time_in_video in sorted(set(times_in_video)):
+        first_frame, frames = iter_frames(video_path, time_in_video, seek,
+                                          frames_count, step, buffers)
+        yield time_in_video, first_frame, frames
+
+
+def save_frames(
+        video_path: str,
+        time_in_video: int,
+        frame_dir: str,
+        frame_format: Optional[str] = None,
+        quality: Optional[int] = None,
+        size: Optional[FrameSize] = None,
+        frames_count: Optional[int] = None,
+        step: int = 1
+    ) -> Tuple[Optional[int], List[str]]:
+    """Функция для извлечения кадров из видеофайла и сохранения их в файлы.
+    Одновременные запросы одних и тех же кадров во всех процессах хоста
+    объединяются: кадры извлекает один запрос, остальные получают его
+    результат или кадры из кеша.
+
+    Args:
+        video_path: Полный путь к видеофайлу.
+        time_in_video: Время от начала видеофайла в секундах.
+        frame_dir: Каталог для файлов с кадрами.
+        frame_format: Формат файлов с кадрами, по умолчанию из
+          конфигурационного файла.
+        quality: Качество или степень сжатия, по умолчанию из
+          конфигурационного файла.
+        size: Уменьшенный размер кадров, по умолчанию исходный. Уменьшенные
+          кадры сохраняются в подкаталог с названием размера.
+        frames_count: Количество кадров, по умолчанию из конфигурационного
+          файла.
+        step: Разница номеров соседних извлекаемых кадров.
+
+    Returns:
+        Номер первого извлечённого кадра и список путей к файлам с кадрами.
+
+    Raises:
+        NotADirectoryError: Путь к каталогу для кадров занят файлом.
+    """
+    frame_format, quality = resolve_encoding(frame_format, quality)
+    variant = encoding_variant(frame_format, quality, size)
+    if frames_count is None:
+        frames_count = Config().flask['SAVE_FRAMES_COUNT']
+
+    def lookup() -> Optional[Tuple[int, List[str]]]:
+        return get_frame_cache().get(video_path, time_in_video, frames_count,
+                                     variant, step)
+
+    def extract() -> Tuple[Optional[int], List[str]]:
+        # декодирование, кодирование и запись кадров идут одновременно,
+        # и в памяти находится несколько кадров независимо от их количества
+        buffers = FrameBuffers(Config().flask['ENCODE_THREADS'] + 2)
+        first_frame, frames = iter_frames(video_path, time_in_video,
+                                          frames_count=frames_count,
+                                          step=step, buffers=buffers)
+        if first_frame is None:
+            return None, []
+        frame_paths = _store_frames(video_path, time_in_video, first_frame,
+                                    frames, frame_dir, frame_format.name,
+                                    quality, size, step, frames_count,
+                                    buffers.release)
+        if not frame_paths:
+            return None, []
+        return first_frame, frame_paths
+
+    key = _flight_key(video_path, time_in_video, frames_count, step, variant)
+    if key is None:
+        return extract()
+    return single_flight(key, lookup, extract)
+
+
+def _flight_key(video_path: str,
+                time_in_video: int,
+                frames_count: int,
+                step: int,
+                variant: str) -> Optional[str]:
+    """Возвращает ключ, по которому объединяются одновременные запросы
+    одних и тех же кадров, или None, если видеофайл недоступен.
+    """
+    key = video_key(video_path)
+    if key is None:
+        return None
+    return f'{key}:{time_in_video}:{frames_count}:{step}:{variant}'
+
+
+def _make_frame_dir(frame_dir: str, size: Optional[FrameSize] = None) -> str:
+    """Создаёт каталог для файлов с кадрами, для уменьшенных кадров -
+    подкаталог с названием размера.
+
+    Returns:
+        Каталог для файлов с кадрами.
+
+    Raises:
+        NotADirectoryError: Путь к каталогу для кадров занят файлом.
+    """
+    if size is not None:
+        frame_dir = os.path.join(frame_dir, size.name)
+    if not os.path.exists(frame_dir):
+        os.makedirs(frame_dir, exist_ok=True)
+    elif os.path.isfile(frame_dir):
+        raise NotADirectoryError(frame_dir)
+    return frame_dir
+
+
+def store_frames(
+        video_path: str,
+        time_in_video: int,
+        first_frame: int,
+        frames: Iterable['ndarray'],
+        frame_dir: str,
+        frame_format: Optional[str] = None,
+        quality: Optional[int] = None,
+        size: Optional[FrameSize] = None,
+        step: int = 1,
+        frames_count: Optional[int] = None,
+        release: Optional[Callable[['ndarray'], None]] = None
+    ) -> List[str]:
+    """Функция для сохранения извлечённых кадров в файлы и добавления их
+    в кеш кадров. Одновременные сохранения одних и тех же кадров во всех
+    процессах хоста объединяются, как в save_frames: если кадры уже есть
+    в кеше, они не извлекаются, а frames не используется.
+
+    Args:
+        video_path: Полный путь к видеофайлу.
+        time_in_video: Время от начала видеофайла в секундах.
+        first_frame: Номер первого извлечённого кадра.
+        frames: Извлечённые кадры, например итератор из iter_frames.
+        frame_dir: Каталог для файлов с кадрами.
+        frame_format: Формат файлов с кадрами, по умолчанию из
+          конфигурационного файла.
+        quality: Качество или степень сжатия, по умолчанию из
+          конфигурационного файла.
+        size: Уменьшенный размер кадров, по умолчанию исходный. Уменьшенные
+          кадры сохраняются в подкаталог с названием размера.
+        step: Разница номеров соседних извлечённых кадров.
+        frames_count: Ожидаемое количество кадров. Если кадров меньше,
+          записанные файлы удаляются и кадры не добавляются в кеш. Без
+          количества сохранения не объединяются.
+        release: Вызывается с кадром после его кодирования.
+
+    Returns:
+        Список путей к файлам с кадрами.
+
+    Raises:
+        NotADirectoryError: Путь к каталогу для кадров занят файлом.
+    """
+    variant = encoding_variant(*resolve_encoding(frame_format, quality), size)
+    key = None
+    if frames_count is not None:
+        key = _flight_key(video_path, time_in_video, frames_count, step,
+                          variant)
+
+    def lookup() -> Optional[List[str]]:
+        cached = get_frame_cache().get(video_path, time_in_video,
+                                       frames_count, variant, step)
+        if cached is None or cached[0] != first_frame:
+            return None
+        return cached[1]
+
+    def store() -> List[str]:
+        return _store_frames(video_path, time_in_video, first_frame, frames,
+                             frame_dir, frame_format, quality, size, step,
+                             frames_count, release)
+
+    if key is None:
+        return store()
+    return single_flight(key, lookup, store)
+
+
+def _store_frames(
+        video_path: str,
+        time_in_video: int,
+        first_frame: int,
+        frames: Iterable['ndarray'],
+        frame_dir: str,
+        frame_format: Optional[str] = None,
+        quality: Optional[int] = None,
+        size: Optional[FrameSize] = None,
+        step: int = 1,
+        frames_count: Optional[int] = None,
+        release: Optional[Callable[['ndarray'], None]] = None
+    ) -> List[str]:
+    """Сохраняет кадры в файлы и добавляет их в кеш, см. store_frames."""
+    frame_dir = _make_frame_dir(frame_dir, size)
+    frame_format, quality = resolve_encoding(frame_format, quality)
+    frame_paths = (
+        frame_file_path(frame_dir, frame_number, frame_format.extension)
+        for frame_number in itertools.count(first_frame, step)
+    )
+    written = write_frames(frames, frame_paths, frame_format, quality, size,
+                           release)
+    if frames_count is not None and len(written) < frames_count:
+        for (frame_path, key, _) in written:
+            remove_frame_file(frame_path, key)
+        return []
+    frame_paths = [frame_path for (frame_path, _, _) in written]
+    get_frame_manifest(frame_dir).add(frame_paths)
+    with timed('cache_store'):
+        get_frame_cache().put(video_path, time_in_video, first_frame,
+                              frame_paths,
+                              encoding_variant(frame_format, quality, size),
+                              step, [key for (_, key, _) in written],
+                              [x for (_, _, x) in written])
+    return frame_paths
+
+
+def iter_encoded_frames(
+        video_path: str,
+        time_in_video: int,
+        frame_dir: Optional[str] = None,
+        frame_format: Optional[str] = None,
+        quality: Optional[int] = None,
+        size: Optional[FrameSize] = None,
+        frames_count: Optional[int] = None,
+        step: int = 1
+    ) -> Tuple[Optional[int], Iterator[Tuple[str, bytes]]]:
+    """Функция для извлечения и кодирования кадров по одному, чтобы
+    отправлять их клиенту по мере готовности. Если кадры сохраняются на
+    диск, одновременные запросы одних и тех же кадров во всех процессах
+    хоста объединяются, как в save_frames: пока кадры отправляет и
+    сохраняет один запрос, остальные ждут и читают сохранённые файлы.
+
+    Args:
+        video_path: Полный путь к видеофайлу.
+        time_in_video: Время от начала видеофайла в секундах.
+        frame_dir: Каталог для файлов с кадрами. Если не задан, кадры
+          не сохраняются на диск.
+        frame_format: Формат кадров, по умолчанию из конфигурационного файла.
+        quality: Качество или степень сжатия, по умолчанию из
+          конфигурационного файла.
+        size: Уменьшенный размер кадров, по умолчанию исходный. Уменьшенные
+          кадры сохраняются в подкаталог с названием размера.
+        frames_count: Количество кадров, по умолчанию из конфигурационного
+          файла.
+        step: Разница номеров соседних извлекаемых кадров.
+
+    Returns:
+        Номер первого извлекаемого кадра и итератор по именам файлов и
+        закодированным кадрам или None и пустой итератор, если кадры
+        извлечь нельзя.
+
+    Raises:
+        NotADirectoryError: Путь к каталогу для кадров занят файлом.
+    """
+    if frames_count is None:
+        frames_count = Config().flask['SAVE_FRAMES_COUNT']
+    buffers = FrameBuffers(Config().flask['ENCODE_THREADS'] + 2)
+    first_frame, frames = iter_frames(video_path, time_in_video,
+                                      frames_count=frames_count, step=step,
+                                      buffers=buffers)
+    if first_frame is None:
+        return None, iter(())
+    if frame_dir is not None:
+        frame_dir = _make_frame_dir(frame_dir, size)
+
+    frame_format, quality = resolve_encoding(frame_format, quality)
+    variant = encoding_variant(frame_format, quality, size)
+
+    def extracted_frames() -> Iterator[Tuple[str, bytes]]:
+        frame_paths = []
+        keys = []
+        encoded = encode_frames(frames, frame_format, quality, size,
+                                buffers.release)
+        numbers = frame_numbers(first_frame, frames_count, step)
+        for (frame_number, data) in zip(numbers, encoded):
+            frame_name = f'{frame_number}.{frame_format.extension}'
+            if frame_dir is not None:
+                frame_path = frame_file_path(frame_dir, frame_number,
+                                             frame_format.extension)
+                keys.append(write_frame_file(frame_path, data))
+                frame_paths.append(frame_path)
+            yield frame_name, data
+
+        if frame_dir is not None and len(frame_paths) == frames_count:
+            get_frame_manifest(frame_dir).add(frame_paths)
+            with timed('cache_store'):
+                get_frame_cache().put(video_path, time_in_video, first_frame,
+                                      frame_paths, variant, step, keys)
+
+    key = None
+    if frame_dir is not None:
+        key = _flight_key(video_path, time_in_video, frames_count, step,
+                          variant)
+    if key is None:
+        return first_frame, extracted_frames()
+
+    def encoded_frames() -> Iterator[Tuple[str, bytes]]:
+        with flight_section(key):
+            cached = get_frame_cache().get(video_path, time_in_video,
+                                           frames_count, variant, step)
+            if cached is None or cached[0] != first_frame:
+                yield from extracted_frames()
+                return
+        # кадры сохранил другой запрос
+        frames.close()
+        for frame_path in cached[1]:
+            with open(frame_path, 'rb') as file:
+                yield os.path.basename(frame_path), file.read()
+
+    return first_frame, encoded_frames()
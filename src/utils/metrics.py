@@ -0,0 +1,206 @@
+import os
+import time
+import logging
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Optional, Tuple, TypeVar, TYPE_CHECKING
+
+from flask import g, has_request_context, request
+from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY,
+                               CollectorRegistry, Counter, Gauge, Histogram,
+                               generate_latest, multiprocess)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+
+if TYPE_CHECKING:
+    from flask import Flask, Response
+
+T = TypeVar('T')
+
+_slow_query_logger = logging.getLogger('src.slow_queries')
+# время в секундах, дольше которого запросы к БД записываются в журнал
+_slow_query_seconds: Optional[float] = None
+
+_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+            1, 2.5, 5, 10, 30)
+
+STAGE_SECONDS = Histogram(
+    'frame_service_stage_seconds',
+    'Time spent in a stage of frame extraction and storage.',
+    ['stage'], buckets=_BUCKETS
+)
+FRAMES_DECODED = Counter(
+    'frame_service_frames_decoded',
+    'Frames read or skipped by the decoder.'
+)
+FRAMES_RETURNED = Counter(
+    'frame_service_frames_returned',
+    'Extracted frames passed on for encoding.'
+)
+DECODER_REUSES = Counter(
+    'frame_service_decoder_reuses',
+    'Requests that continued decoding with an already open video file.'
+)
+BYTES_WRITTEN = Counter(
+    'frame_service_bytes_written',
+    'Bytes of encoded frames written to files.'
+)
+FRAMES_DEDUPLICATED = Counter(
+    'frame_service_frames_deduplicated',
+    'Frame files linked to already stored frame content instead of written.'
+)
+DB_QUERY_SECONDS = Histogram(
+    'frame_service_db_query_seconds',
+    'Time spent executing database statements.',
+    ['operation', 'endpoint'], buckets=_BUCKETS
+)
+DB_CONNECTIONS = Gauge(
+    'frame_service_db_connections',
+    'Open database connections in the connection pools of all processes.',
+    multiprocess_mode='livesum'
+)
+REQUEST_SECONDS = Histogram(
+    'frame_service_request_seconds',
+    'Time spent handling a request until the response body is returned.',
+    ['endpoint', 'method', 'status'], buckets=_BUCKETS
+)
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """Замеряет время выполнения блока кода как этап обработки.
+
+    Args:
+        stage: Название этапа.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.labels(stage).observe(time.perf_counter() - start)
+
+
+def timed_iter(iterable: Iterable[T], stage: str) -> Iterator[T]:
+    """Замеряет суммарное время получения элементов итератора как этап
+    обработки, не учитывая время обработки элементов вызывающим кодом.
+
+    Args:
+        iterable: Итерируемый объект.
+        stage: Название этапа.
+    """
+    iterator = iter(iterable)
+    elapsed = 0.0
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                elapsed += time.perf_counter() - start
+            yield item
+    finally:
+        STAGE_SECONDS.labels(stage).observe(elapsed)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context,
+                           executemany) -> None:
+    conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context,
+                          executemany) -> None:
+    elapsed = time.perf_counter() - conn.info['query_start'].pop()
+    operation = statement.lstrip().split(None, 1)[0].upper()
+    endpoint = 'none'
+    if has_request_context():
+        endpoint = request.endpoint or 'unknown'
+    DB_QUERY_SECONDS.labels(operation, endpoint).observe(elapsed)
+    if _slow_query_seconds is not None and elapsed >= _slow_query_seconds:
+        _slow_query_logger.warning('Slow query %.3f s in %s: %s', elapsed,
+                                   endpoint, ' '.join(statement.split()))
+
+
+def _handle_error(context) -> None:
+    # statement failed, after_cursor_execute will not be called
+    if context.connection is not None:
+        starts = context.connection.info.get('query_start')
+        if starts:
+            starts.pop()
+
+
+def _pool_connect(dbapi_connection, connection_record) -> None:
+    DB_CONNECTIONS.inc()
+
+
+def _pool_close(dbapi_connection, connection_record) -> None:
+    DB_CONNECTIONS.dec()
+
+
+def _before_request() -> None:
+    g.metrics_request_start = time.perf_counter()
+
+
+def _after_request(response: 'Response') -> 'Response':
+    start = g.pop('metrics_request_start', None)
+    if start is not None:
+        REQUEST_SECONDS.labels(
+            request.endpoint or 'unknown', request.method,
+            response.status_code
+        ).observe(time.perf_counter() - start)
+    return response
+
+
+def init_metrics(app: 'Flask') -> None:
+    """Включает замеры времени обработки запросов и запросов к БД, подсчёт
+    открытых соединений с БД и журнал медленных запросов к БД.
+
+    Args:
+        app: Flask приложение.
+    """
+    global _slow_query_seconds
+    _slow_query_seconds = app.config.get('DB_SLOW_QUERY_SECONDS')
+    if not event.contains(Engine, 'before_cursor_execute',
+                          _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        event.listen(Engine, 'handle_error', _handle_error)
+        event.listen(Pool, 'connect', _pool_connect)
+        event.listen(Pool, 'close', _pool_close)
+        event.listen(Pool, 'close_detached', _pool_close)
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Возвращает метрики всех процессов приложения в текстовом формате
+    Prometheus и его MIME-тип.
+    """
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def clear_metrics_dir() -> None:
+    """Удаляет файлы метрик процессов предыдущего запуска приложения."""
+    metrics_dir_path = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if not metrics_dir_path or not os.path.isdir(metrics_dir_path):
+        return
+    for file_name in os.listdir(metrics_dir_path):
+        if file_name.endswith('.db'):
+            os.remove(os.path.join(metrics_dir_path, file_name))
+
+
+def mark_process_dead(pid: int) -> None:
+    """Удаляет файлы метрик завершённого процесса, значения которых не
+    суммируются между процессами.
+
+    Args:
+        pid: Идентификатор процесса.
+    """
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,79 @@
+import json
+import base64
+import binascii
+from typing import Any, Optional, Tuple
+
+from flask import request, url_for
+
+
+def encode_cursor(*values: Any) -> str:
+    """Кодирует значения ключа последней строки страницы в курсор.
+
+    Args:
+        values: Значения столбцов ключа сортировки.
+
+    Returns:
+        Курсор для запроса следующей страницы.
+    """
+    data = json.dumps(values, ensure_ascii=False, separators=(',', ':'))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, *types: type) -> Optional[Tuple[Any, ...]]:
+    """Декодирует курсор и проверяет типы значений ключа.
+
+    Args:
+        cursor: Курсор из предыдущего ответа.
+        types: Ожидаемые типы значений ключа.
+
+    Returns:
+        Значения ключа или None, если курсор повреждён.
+    """
+    try:
+        padding = '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(cursor + padding))
+    except (binascii.Error, ValueError):
+        return None
+    if not isinstance(values, list) or len(values) != len(types):
+        return None
+    if not all(type(v) is t for (v, t) in zip(values, types)):
+        return None
+    return tuple(values)
+
+
+def parse_limit(
+        limit: Optional[str],
+        max_limit: int
+    ) -> Tuple[Optional[str], int]:
+    """Проверяет размер страницы из параметров запроса.
+
+    Args:
+        limit: Размер страницы из запроса.
+        max_limit: Максимальный и используемый по умолчанию размер страницы.
+
+    Returns:
+        Описание ошибки или None и размер страницы.
+    """
+    if limit is None:
+        return None, max_limit
+    try:
+        limit = int(limit)
+    except Exception:
+        return 'Required number type', max_limit
+    if limit < 1:
+        return 'Less than minimum value 1.', max_limit
+    if limit > max_limit:
+        return f'Greater than maximum value {max_limit}.', max_limit
+    return None, limit
+
+
+def next_page_url(cursor: str) -> str:
+    """Возвращает адрес следующей страницы с теми же параметрами текущего
+    запроса и заданным курсором.
+
+    Args:
+        cursor: Курсор следующей страницы.
+    """
+    args = request.args.to_dict()
+    args['cursor'] = cursor
+    return url_for(request.endpoint, **args)
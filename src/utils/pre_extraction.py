@@ -0,0 +1,419 @@
+import os
+import sys
+import json
+import math
+import time
+import multiprocessing
+from typing import (Dict, Iterable, Iterator, List, Optional, Set, TextIO,
+                    Tuple)
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from src.models import db, FrameServiceInformation
+from src.utils.config import Config
+from src.utils.encode_frames import encoding_variant, resolve_encoding
+from src.utils.frame_cache import get_frame_cache
+from src.utils.frame_metadata import frame_metadata, video_index_for
+from src.utils.get_frames import (FrameBuffers, iter_frame_ranges,
+                                  store_frames)
+from src.utils.video_index import get_video_index
+
+# не больше 65535 параметров в одном запросе к PostgreSQL
+_INSERT_CHUNK_SIZE = 5000
+
+# минимальный интервал между сообщениями о ходе выполнения в секундах
+_PROGRESS_INTERVAL = 5
+
+
+class Schedule:
+    """Моменты времени, в которые извлекаются кадры каждого видеофайла,
+    и параметры извлечения.
+
+    Attributes:
+        interval: Интервал между моментами времени в секундах.
+        start: Время первого момента от начала видеофайла в секундах.
+        end: Время, до которого извлекаются кадры, или None до конца
+          видеофайла.
+        frame_format: Формат файлов с кадрами или None.
+        quality: Качество или степень сжатия или None.
+        frames_count: Количество кадров для каждого момента времени.
+        step: Разница номеров соседних кадров.
+    """
+
+    def __init__(self,
+                 interval: int,
+                 start: int = 0,
+                 end: Optional[int] = None,
+                 frame_format: Optional[str] = None,
+                 quality: Optional[int] = None,
+                 frames_count: Optional[int] = None,
+                 step: int = 1,
+                 ) -> None:
+        """Инициализирует экземпляр класса.
+
+        Args:
+            interval: Интервал между моментами времени в секундах.
+            start: Время первого момента в секундах.
+            end: Время, до которого извлекаются кадры, в секундах.
+            frame_format: Формат файлов с кадрами.
+            quality: Качество или степень сжатия.
+            frames_count: Количество кадров, по умолчанию из
+              конфигурационного файла.
+            step: Разница номеров соседних кадров.
+        """
+        self.interval = interval
+        self.start = start
+        self.end = end
+        self.frame_format = frame_format
+        self.quality = quality
+        if frames_count is None:
+            frames_count = Config().flask['SAVE_FRAMES_COUNT']
+        self.frames_count = frames_count
+        self.step = step
+
+    @property
+    def variant(self) -> str:
+        """Строка, однозначно описывающая извлекаемые кадры, для журнала."""
+        variant = encoding_variant(*resolve_encoding(self.frame_format,
+                                                     self.quality))
+        return f'{variant}:{self.frames_count}:{self.step}'
+
+    def times(self, duration: float) -> range:
+        """Возвращает моменты времени для видеофайла.
+
+        Args:
+            duration: Длительность видеофайла в секундах.
+        """
+        end = duration if self.end is None else min(duration, self.end)
+        # момент времени, равный длительности, уже за последним кадром
+        return range(self.start, math.ceil(end), self.interval)
+
+
+def _init_worker(flask_config: dict) -> None:
+    """Передаёт процессу пула конфигурацию родительского процесса."""
+    Config().flask.update(flask_config)
+
+
+def _probe_video(video_path: str) -> Tuple[str, Optional[float]]:
+    """Возвращает путь к видеофайлу и его длительность или None, если
+    видеофайл не удалось открыть.
+    """
+    try:
+        index = get_video_index(video_path)
+    except Exception:
+        return video_path, None
+    if index is None:
+        return video_path, None
+    return video_path, index.duration
+
+
+def _extract_times(
+        video_path: str,
+        times: List[int],
+        schedule: Schedule
+    ) -> Tuple[str, List[Tuple[int, Optional[int], List[str]]]]:
+    """Извлекает и сохраняет кадры видеофайла для нескольких моментов
+    времени по возрастанию времени, записывая кадры по мере декодирования.
+    Кадры, сохранённые ранее, берутся из кеша.
+
+    Returns:
+        Путь к видеофайлу и для каждого момента времени номер первого кадра
+        или None и пути к файлам с кадрами.
+    """
+    frame_dir = os.path.join(Config().flask['FRAMES_DIR_PATH'],
+                             os.path.basename(video_path))
+    frame_cache = get_frame_cache()
+    variant = encoding_variant(*resolve_encoding(schedule.frame_format,
+                                                 schedule.quality))
+    results = []
+    missing = []
+    for time_in_video in times:
+        cached = frame_cache.get(video_path, time_in_video,
+                                 schedule.frames_count, variant, schedule.step)
+        if cached is None:
+            missing.append(time_in_video)
+        else:
+            results.append((time_in_video, *cached))
+
+    buffers = FrameBuffers(Config().flask['ENCODE_THREADS'] + 2)
+    try:
+        frame_ranges = iter_frame_ranges(video_path, missing,
+                                         frames_count=schedule.frames_count,
+                                         step=schedule.step, buffers=buffers)
+        for (time_in_video, first_frame, frames) in frame_ranges:
+            frame_paths = []
+            if first_frame is not None:
+                frame_paths = store_frames(
+                    video_path, time_in_video, first_frame, frames,
+                    frame_dir, schedule.frame_format, schedule.quality,
+                    step=schedule.step, frames_count=schedule.frames_count,
+                    release=buffers.release
+                )
+            if not frame_paths:
+                first_frame = None
+            results.append((time_in_video, first_frame, frame_paths))
+    except Exception:
+        done = {t for (t, _, _) in results}
+        results.extend((t, None, []) for t in missing if t not in done)
+    return video_path, results
+
+
+def _extract_task(
+        task: Tuple[str, List[int], Schedule]
+    ) -> Tuple[str, List[Tuple[int, Optional[int], List[str]]]]:
+    return _extract_times(*task)
+
+
+def read_journal(journal_path: str, variant: str) -> Set[Tuple[str, int]]:
+    """Возвращает имена видеофайлов и моменты времени, обработанные
+    предыдущими запусками с теми же параметрами извлечения.
+
+    Args:
+        journal_path: Путь к журналу.
+        variant: Параметры извлечения, см. Schedule.variant.
+    """
+    done = set()
+    try:
+        with open(journal_path, 'r') as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # строка, не дописанная при аварийном завершении
+                    continue
+                if entry.get('variant') == variant:
+                    done.add((entry['file_name'], entry['time_in_video']))
+    except FileNotFoundError:
+        pass
+    return done
+
+
+def _open_journal(journal_path: str) -> TextIO:
+    """Открывает журнал для дописывания, завершая строку, не дописанную
+    при аварийном завершении.
+    """
+    journal = open(journal_path, 'a')
+    if journal.tell() > 0:
+        with open(journal_path, 'rb') as file:
+            file.seek(-1, os.SEEK_END)
+            if file.read(1) != b'\n':
+                journal.write('\n')
+    return journal
+
+
+def register_frames(frames: Dict[Tuple[str, int], str]) -> int:
+    """Сохраняет в БД служебную информацию о сохранённых кадрах,
+    пропуская уже сохранённые.
+
+    Args:
+        frames: Пути к файлам с кадрами по имени видеофайла и номеру кадра.
+
+    Returns:
+        Количество добавленных строк.
+    """
+    frame_cache = get_frame_cache()
+    content_hashes = frame_cache.content_hashes(*frames.values())
+    perceptual_hashes = {}
+    if Config().flask['FRAME_PERCEPTUAL_HASH']:
+        perceptual_hashes = frame_cache.perceptual_hashes(*frames.values())
+    video_indexes = {
+        video_file_name: video_index_for(video_file_name)
+        for (video_file_name, _) in frames
+    }
+    values = [
+        {
+            "video_file_name": video_file_name,
+            "frame_number": frame_number,
+            "frame_file_path": frame_file_path,
+            "content_hash": content_hashes.get(frame_file_path),
+            "perceptual_hash": perceptual_hashes.get(frame_file_path),
+            **frame_metadata(frame_number, frame_file_path,
+                             index=video_indexes[video_file_name]),
+        }
+        for ((video_file_name, frame_number), frame_file_path)
+        in frames.items()
+    ]
+    created = []
+    for start in range(0, len(values), _INSERT_CHUNK_SIZE):
+        stmt = (
+            insert(FrameServiceInformation)
+            .values(values[start:start + _INSERT_CHUNK_SIZE])
+            .on_conflict_do_nothing()
+            .returning(FrameServiceInformation.frame_file_path)
+        )
+        created.extend(db.session.execute(stmt).scalars())
+    db.session.commit()
+    frame_cache.pin(*created)
+    return len(created)
+
+
+def backfill_frame_metadata() -> int:
+    """Заполняет время, размер кадра, размер файла и формат у сохранённых
+    кадров, для которых они ещё не заполнены, например после миграции БД.
+    Файлы с кадрами не читаются, размер файла остаётся пустым, если файла
+    уже нет.
+
+    Returns:
+        Количество обновлённых строк.
+    """
+    video_file_names = db.session.execute(
+        select(FrameServiceInformation.video_file_name)
+        .where(FrameServiceInformation.file_size.is_(None))
+        .distinct()
+    ).scalars().all()
+    updated = 0
+    for video_file_name in video_file_names:
+        index = video_index_for(video_file_name)
+        rows = db.session.execute(
+            select(FrameServiceInformation.frame_number,
+                   FrameServiceInformation.frame_file_path)
+            .where(FrameServiceInformation.video_file_name == video_file_name,
+                   FrameServiceInformation.file_size.is_(None))
+        ).all()
+        values = []
+        for (frame_number, frame_file_path) in rows:
+            try:
+                file_size = os.path.getsize(frame_file_path)
+            except OSError:
+                file_size = None
+            metadata = frame_metadata(frame_number, frame_file_path,
+                                      file_size or 0, index)
+            metadata['file_size'] = file_size
+            values.append({**metadata,
+                           "video_file_name": video_file_name,
+                           "frame_number": frame_number})
+        for start in range(0, len(values), _INSERT_CHUNK_SIZE):
+            db.session.execute(update(FrameServiceInformation),
+                               values[start:start + _INSERT_CHUNK_SIZE])
+        db.session.commit()
+        updated += len(values)
+    return updated
+
+
+def _iter_chunks(tasks: List[Tuple[str, int]],
+                 chunk_size: int) -> Iterator[Tuple[str, List[int]]]:
+    """Делит моменты времени видеофайлов на задачи для процессов пула."""
+    times_by_video: Dict[str, List[int]] = {}
+    for (video_path, time_in_video) in tasks:
+        times_by_video.setdefault(video_path, []).append(time_in_video)
+    for (video_path, times) in times_by_video.items():
+        for start in range(0, len(times), chunk_size):
+            yield video_path, times[start:start + chunk_size]
+
+
+def _list_videos(video_dir_path: str,
+                 file_names: Optional[Iterable[str]]) -> List[str]:
+    if file_names is not None:
+        return [os.path.join(video_dir_path, x) for x in file_names]
+    with os.scandir(video_dir_path) as entries:
+        return sorted(entry.path for entry in entries if entry.is_file())
+
+
+def pre_extract(schedule: Schedule,
+                journal_path: str,
+                file_names: Optional[Iterable[str]] = None,
+                processes: Optional[int] = None,
+                chunk_size: int = 20,
+                register: bool = False,
+                progress: Optional[TextIO] = sys.stderr) -> Dict[str, int]:
+    """Извлекает и сохраняет кадры видеофайлов из каталога с видео
+    в пуле процессов. Обработанные моменты времени дописываются в журнал,
+    и повторный запуск с теми же параметрами продолжает работу с места
+    остановки.
+
+    Args:
+        schedule: Моменты времени и параметры извлечения.
+        journal_path: Путь к журналу.
+        file_names: Имена видеофайлов, по умолчанию все файлы каталога.
+        processes: Количество процессов, по умолчанию по числу ядер.
+        chunk_size: Количество моментов времени одного видеофайла в задаче
+          процесса пула.
+        register: Сохранять в БД служебную информацию о кадрах, требует
+          контекста Flask приложения.
+        progress: Поток для сообщений о ходе выполнения или None.
+
+    Returns:
+        Количество обработанных и неоткрывшихся видеофайлов, обработанных,
+        пропущенных по журналу и неудавшихся моментов времени, сохранённых
+        кадров и добавленных строк в БД.
+    """
+    config = Config()
+    variant = schedule.variant
+    done = read_journal(journal_path, variant)
+    video_paths = _list_videos(config.flask['VIDEOS_DIR_PATH'], file_names)
+    summary = {
+        "videos": 0,
+        "unreadable": 0,
+        "times": 0,
+        "skipped": 0,
+        "failed": 0,
+        "frames": 0,
+        "registered": 0,
+    }
+
+    # процессы создаются через spawn, как и пул задач на извлечение кадров
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(processes or os.cpu_count(), _init_worker,
+                      (config.flask,)) as pool, \
+            _open_journal(journal_path) as journal:
+        tasks = []
+        for (video_path, duration) in pool.imap_unordered(_probe_video,
+                                                          video_paths):
+            if duration is None:
+                summary['unreadable'] += 1
+                continue
+            summary['videos'] += 1
+            file_name = os.path.basename(video_path)
+            for time_in_video in schedule.times(duration):
+                if (file_name, time_in_video) in done:
+                    summary['skipped'] += 1
+                else:
+                    tasks.append((video_path, time_in_video))
+
+        started = last_report = time.monotonic()
+        results = pool.imap_unordered(
+            _extract_task,
+            ((video_path, times, schedule)
+             for (video_path, times) in _iter_chunks(tasks, chunk_size))
+        )
+        for (video_path, frame_ranges) in results:
+            file_name = os.path.basename(video_path)
+            frames = {}
+            for (time_in_video, first_frame, frame_paths) in frame_ranges:
+                if first_frame is None:
+                    summary['failed'] += 1
+                    continue
+                for (i, frame_path) in enumerate(frame_paths):
+                    frames[(file_name,
+                            first_frame + i * schedule.step)] = frame_path
+            if register and frames:
+                summary['registered'] += register_frames(frames)
+            summary['frames'] += len(frames)
+
+            # журнал дописывается после сохранения в БД, чтобы при аварийном
+            # завершении необработанные моменты времени повторились, моменты
+            # времени с ошибками повторяются при следующем запуске
+            for (time_in_video, first_frame, _) in frame_ranges:
+                if first_frame is None:
+                    continue
+                journal.write(json.dumps({
+                    "file_name": file_name,
+                    "time_in_video": time_in_video,
+                    "variant": variant,
+                    "first_frame": first_frame,
+                }) + '\n')
+            journal.flush()
+            summary['times'] += len(frame_ranges)
+
+            now = time.monotonic()
+            if progress is not None and (
+                    now - last_report >= _PROGRESS_INTERVAL
+                    or summary['times'] == len(tasks)):
+                last_report = now
+                print(f'{summary["times"]}/{len(tasks)} moments, '
+                      f'{summary["frames"]} frames, '
+                      f'{summary["times"] / max(now - started, 1e-9):.1f} '
+                      f'moments/s', file=progress)
+    return summary
+
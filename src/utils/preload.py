@@ -0,0 +1,8 @@
+def import_frame_modules() -> None:
+    """Импортирует OpenCV и NumPy, которые модули приложения импортируют
+    при первом извлечении или кодировании кадров. Вызывается в главном
+    процессе gunicorn с preload_app, чтобы worker'ы получали загруженные
+    модули через fork, а не импортировали их при первом запросе.
+    """
+    import cv2  # noqa: F401
+    import numpy  # noqa: F401
@@ -0,0 +1,141 @@
+import os
+import fcntl
+import hashlib
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional, Tuple, TypeVar
+
+from src.utils.config import Config
+from src.utils.metrics import timed
+
+T = TypeVar('T')
+
+# количество файлов блокировок, ключи распределяются между ними по хешу
+_LOCK_STRIPES = 1024
+
+
+class _Flight:
+    """Выполняемое в текущем процессе вычисление, результата которого ждут
+    другие потоки.
+    """
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+_flights: Dict[str, _Flight] = {}
+_flights_lock = threading.Lock()
+
+
+@contextmanager
+def _file_lock(key: str) -> Iterator[None]:
+    """Захватывает блокировку файла, общую для процессов на одном хосте.
+
+    Args:
+        key: Ключ вычисления.
+    """
+    lock_dir_path = Config().flask['LOCKS_DIR_PATH']
+    os.makedirs(lock_dir_path, exist_ok=True)
+    stripe = int(hashlib.sha1(key.encode()).hexdigest(), 16) % _LOCK_STRIPES
+    fd = os.open(os.path.join(lock_dir_path, f'{stripe}.lock'),
+                 os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        with timed('lock_wait'):
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        # закрытие файла снимает блокировку
+        os.close(fd)
+
+
+def _join(key: str) -> Tuple[_Flight, bool]:
+    """Возвращает выполняемое в процессе вычисление с ключом key или
+    регистрирует новое.
+
+    Returns:
+        Вычисление и True, если его выполняет вызывающий поток.
+    """
+    with _flights_lock:
+        flight = _flights.get(key)
+        if flight is not None:
+            return flight, False
+        flight = _flights[key] = _Flight()
+        return flight, True
+
+
+def _land(key: str, flight: _Flight) -> None:
+    """Завершает вычисление и будит ждущие его потоки."""
+    with _flights_lock:
+        del _flights[key]
+    flight.done.set()
+
+
+def single_flight(key: str,
+                  lookup: Callable[[], Optional[T]],
+                  compute: Callable[[], T]) -> T:
+    """Объединяет одновременные одинаковые вычисления в одно. Первый поток
+    выполняет вычисление, остальные потоки процесса ждут его результат.
+    Между процессами вычисление защищено блокировкой файла: процесс,
+    дождавшийся блокировки, сначала ищет готовый результат.
+
+    Args:
+        key: Ключ вычисления.
+        lookup: Поиск готового результата, например в кеше. Возвращает
+          None, если результата нет.
+        compute: Вычисление результата.
+
+    Returns:
+        Готовый или вычисленный результат.
+    """
+    while True:
+        flight, leader = _join(key)
+        if leader:
+            break
+        with timed('lock_wait'):
+            flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        # после flight_section результата нет, он ищется через lookup
+        if flight.result is not None:
+            return flight.result
+
+    try:
+        with _file_lock(key):
+            result = lookup()
+            if result is None:
+                result = compute()
+        flight.result = result
+        return result
+    except BaseException as error:
+        flight.error = error
+        raise
+    finally:
+        _land(key, flight)
+
+
+@contextmanager
+def flight_section(key: str) -> Iterator[None]:
+    """Выполняет блок кода как вычисление с ключом key, например запись
+    кадров, которые одновременно отправляются клиенту по частям.
+    Одновременные вызовы single_flight и flight_section с тем же ключом во
+    всех процессах хоста ждут завершения блока, после чего single_flight
+    ищет готовый результат через lookup. Блок кода тоже должен сначала
+    искать готовый результат.
+
+    Args:
+        key: Ключ вычисления.
+    """
+    while True:
+        flight, leader = _join(key)
+        if leader:
+            break
+        with timed('lock_wait'):
+            flight.done.wait()
+
+    try:
+        with _file_lock(key):
+            yield
+    finally:
+        _land(key, flight)
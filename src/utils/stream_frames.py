@@ -0,0 +1,90 @@
+import uuid
+import zipfile
+from typing import Iterable, Iterator, Tuple
+
+STREAM_FORMATS = {
+    'multipart': 'multipart/mixed',
+    'zip': 'application/zip',
+}
+
+_CONTENT_TYPES = {
+    'png': 'image/png',
+    'jpg': 'image/jpeg',
+    'webp': 'image/webp',
+}
+
+
+class _ChunkBuffer:
+    """Файлоподобный объект без позиционирования, который накапливает
+    записанные данные до их отправки клиенту.
+    """
+
+    def __init__(self) -> None:
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def pop(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def multipart_stream(
+        frames: Iterable[Tuple[str, bytes]],
+        boundary: str
+    ) -> Iterator[bytes]:
+    """Формирует тело ответа multipart/mixed, отправляя каждый кадр сразу
+    после его кодирования.
+
+    Args:
+        frames: Имена файлов и закодированные кадры.
+        boundary: Разделитель частей ответа.
+
+    Yields:
+        Части тела ответа.
+    """
+    for (file_name, data) in frames:
+        extension = file_name.rsplit('.', 1)[-1]
+        headers = (
+            f'--{boundary}\r\n'
+            f'Content-Type: {_CONTENT_TYPES[extension]}\r\n'
+            f'Content-Disposition: attachment; filename="{file_name}"\r\n'
+            f'Content-Length: {len(data)}\r\n'
+            '\r\n'
+        )
+        yield headers.encode() + data + b'\r\n'
+    yield f'--{boundary}--\r\n'.encode()
+
+
+def zip_stream(frames: Iterable[Tuple[str, bytes]]) -> Iterator[bytes]:
+    """Формирует ZIP-архив с кадрами, отправляя каждый кадр сразу после его
+    кодирования. Кадры уже сжаты, поэтому сохраняются в архив без сжатия.
+
+    Args:
+        frames: Имена файлов и закодированные кадры.
+
+    Yields:
+        Части архива.
+    """
+    buffer = _ChunkBuffer()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as archive:
+        for (file_name, data) in frames:
+            archive.writestr(file_name, data)
+            yield buffer.pop()
+    yield buffer.pop()
+
+
+def new_boundary() -> str:
+    """Возвращает случайный разделитель частей ответа multipart/mixed."""
+    return uuid.uuid4().hex
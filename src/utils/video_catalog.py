@@ -0,0 +1,249 @@
+import os
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Iterator, List, Optional, TYPE_CHECKING
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from src.models import db, Video, VideoCatalogState
+from src.utils.config import Config
+from src.utils.video_index import get_video_index
+
+if TYPE_CHECKING:
+    from flask import Flask
+
+# ключ рекомендательной блокировки PostgreSQL, чтобы каталог сканировал
+# и определял длительность видеофайлов только один процесс
+_SCAN_LOCK_ID = 0x766964656f73
+
+_CHUNK_SIZE = 1000
+
+_PROBE_BATCH = 100
+
+# приложения, сканирование для которых запускается после fork
+_deferred_apps: List['Flask'] = []
+_deferred = False
+
+
+def get_catalog_state() -> Optional[VideoCatalogState]:
+    """Возвращает состояние каталога видеофайлов или None, если каталог ещё
+    не сканировался.
+    """
+    return db.session.get(VideoCatalogState, VideoCatalogState.ID)
+
+
+@contextmanager
+def _scan_lock() -> Iterator[bool]:
+    """Захватывает рекомендательную блокировку сканирования на время блока
+    кода. Блокировка уровня сеанса берётся в отдельном соединении, поэтому
+    не снимается при фиксации транзакций сканирования.
+
+    Yields:
+        False, если блокировку держит другой процесс.
+    """
+    with db.engine.connect() as connection:
+        connection.execution_options(isolation_level='AUTOCOMMIT')
+        locked = connection.execute(
+            select(func.pg_try_advisory_lock(_SCAN_LOCK_ID))
+        ).scalar()
+        try:
+            yield locked
+        finally:
+            if locked:
+                connection.execute(
+                    select(func.pg_advisory_unlock(_SCAN_LOCK_ID)))
+
+
+def scan_videos() -> bool:
+    """Синхронизирует таблицу видеофайлов с каталогом с видео. Изменённые
+    файлы определяются по размеру и времени изменения без открытия файлов.
+
+    Returns:
+        False, если каталог в это время сканирует другой процесс.
+    """
+    with _scan_lock() as locked:
+        if not locked:
+            return False
+        _scan()
+    return True
+
+
+def sync_videos(interval: float) -> bool:
+    """Сканирует каталог с видео и определяет длительность новых
+    видеофайлов, если каталог не сканировался дольше интервала. Другие
+    процессы в это время не сканируют каталог.
+
+    Args:
+        interval: Интервал между сканированиями в секундах.
+
+    Returns:
+        False, если каталог сканирует другой процесс или уже просканирован
+        за интервал.
+    """
+    with _scan_lock() as locked:
+        if not locked:
+            return False
+        state = get_catalog_state()
+        scanned_after = datetime.utcnow() - timedelta(seconds=interval)
+        if state is not None and state.scanned_at > scanned_after:
+            db.session.rollback()
+            return False
+        _scan()
+        probe_videos()
+    return True
+
+
+def _scan() -> None:
+    """Синхронизирует таблицу видеофайлов с каталогом с видео, вызывается
+    под блокировкой сканирования.
+    """
+    video_dir_path = Config().flask['VIDEOS_DIR_PATH']
+    known = {
+        x.file_name: (x.size, x.mtime_ns)
+        for x in db.session.execute(
+            select(Video.file_name, Video.size, Video.mtime_ns))
+    }
+
+    changed = []
+    with os.scandir(video_dir_path) as entries:
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            stat = entry.stat()
+            if known.pop(entry.name, None) != (stat.st_size, stat.st_mtime_ns):
+                changed.append({
+                    "file_name": entry.name,
+                    "file_path": os.path.join(video_dir_path, entry.name),
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "duration": None,
+                    "probed": False,
+                })
+    removed = list(known)
+
+    for start in range(0, len(changed), _CHUNK_SIZE):
+        stmt = insert(Video).values(changed[start:start + _CHUNK_SIZE])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Video.file_name],
+            set_={
+                "file_path": stmt.excluded.file_path,
+                "size": stmt.excluded.size,
+                "mtime_ns": stmt.excluded.mtime_ns,
+                "duration": None,
+                "probed": False,
+            }
+        )
+        db.session.execute(stmt)
+    for start in range(0, len(removed), _CHUNK_SIZE):
+        db.session.execute(
+            delete(Video)
+            .where(Video.file_name.in_(removed[start:start + _CHUNK_SIZE]))
+        )
+
+    state = get_catalog_state()
+    if state is None:
+        db.session.add(VideoCatalogState(1, datetime.utcnow()))
+    else:
+        if changed or removed:
+            state.version += 1
+        state.scanned_at = datetime.utcnow()
+    db.session.commit()
+
+
+def probe_videos() -> int:
+    """Определяет длительность видеофайлов, добавленных или изменённых после
+    последнего определения. Вызывается под блокировкой сканирования, см.
+    sync_videos.
+
+    Returns:
+        Количество обработанных видеофайлов.
+    """
+    probed = 0
+    while True:
+        videos = db.session.execute(
+            select(Video.file_name, Video.file_path)
+            .where(Video.probed.is_(False))
+            .limit(_PROBE_BATCH)
+        ).all()
+        if not videos:
+            return probed
+        for video in videos:
+            duration = None
+            try:
+                index = get_video_index(video.file_path)
+                if index is not None:
+                    duration = index.duration
+            except Exception:
+                pass
+            db.session.execute(
+                update(Video)
+                .where(Video.file_name == video.file_name)
+                .values(duration=duration, probed=True)
+            )
+        state = get_catalog_state()
+        if state is not None:
+            state.version += 1
+        db.session.commit()
+        probed += len(videos)
+
+
+def _scan_forever(app: 'Flask', interval: float) -> None:
+    """Периодически сканирует каталог с видео в фоновом потоке.
+
+    Args:
+        app: Flask приложение.
+        interval: Интервал между сканированиями в секундах.
+    """
+    while True:
+        with app.app_context():
+            try:
+                sync_videos(interval)
+            except Exception:
+                db.session.rollback()
+                app.logger.exception('Failed to scan videos')
+        time.sleep(interval)
+
+
+def start_video_scanner(app: 'Flask') -> Optional[threading.Thread]:
+    """Запускает фоновое сканирование каталога с видео, если интервал
+    сканирования задан в конфигурационном файле.
+
+    Args:
+        app: Flask приложение.
+
+    Returns:
+        Поток сканирования или None, если сканирование отключено.
+    """
+    interval = app.config.get('VIDEO_SCAN_INTERVAL')
+    if not interval or app.config.get('TESTING'):
+        return None
+    if _deferred:
+        _deferred_apps.append(app)
+        return None
+    thread = threading.Thread(target=_scan_forever, args=(app, interval),
+                              name='video_scanner', daemon=True)
+    thread.start()
+    return thread
+
+
+def defer_video_scanner() -> None:
+    """Откладывает запуск фонового сканирования для приложений, создаваемых
+    в главном процессе gunicorn с preload_app, до запуска worker'ов, чтобы
+    главный процесс не создавал worker'ы через fork при работающем потоке
+    сканирования.
+    """
+    global _deferred
+    _deferred = True
+
+
+def start_deferred_video_scanners() -> None:
+    """Запускает в текущем процессе фоновое сканирование для приложений,
+    созданных после вызова defer_video_scanner.
+    """
+    global _deferred
+    _deferred = False
+    for app in _deferred_apps:
+        start_video_scanner(app)
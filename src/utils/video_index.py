@@ -0,0 +1,223 @@
+import os
+import json
+import bisect
+import hashlib
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from src.utils.config import Config
+
+_INDEX_VERSION = 2
+
+_loaded_indexes: Dict[str, 'VideoIndex'] = {}
+_loaded_indexes_lock = threading.Lock()
+
+
+class VideoIndex:
+    """Индекс видеофайла с его параметрами и положением ключевых кадров.
+
+    Attributes:
+        size: Размер видеофайла в байтах на момент построения индекса.
+        mtime_ns: Время изменения видеофайла на момент построения индекса.
+        fps: Количество кадров в секунду.
+        frame_count: Количество кадров в видеофайле.
+        duration: Длительность видеофайла в секундах.
+        keyframes: Номера ключевых кадров и их время от начала видеофайла
+          в секундах, по возрастанию.
+        width: Ширина кадров.
+        height: Высота кадров.
+    """
+
+    def __init__(self,
+                 size: int,
+                 mtime_ns: int,
+                 fps: float,
+                 frame_count: int,
+                 keyframes: List[Tuple[int, float]],
+                 width: int = 0,
+                 height: int = 0,
+                 ) -> None:
+        """Инициализирует экземпляр класса.
+
+        Args:
+            size: Размер видеофайла в байтах.
+            mtime_ns: Время изменения видеофайла в наносекундах.
+            fps: Количество кадров в секунду.
+            frame_count: Количество кадров в видеофайле.
+            keyframes: Номера ключевых кадров и их время от начала
+              видеофайла в секундах.
+            width: Ширина кадров.
+            height: Высота кадров.
+        """
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.fps = fps
+        self.frame_count = frame_count
+        self.duration = frame_count / fps if fps > 0 else 0.0
+        self.keyframes = sorted(keyframes)
+        self._keyframe_numbers = [n for (n, _) in self.keyframes]
+        self.width = width
+        self.height = height
+
+    def frame_number(self, time_in_video: float) -> int:
+        """Возвращает номер кадра, соответствующего времени на видео.
+
+        Args:
+            time_in_video: Время от начала видеофайла в секундах.
+        """
+        return int(time_in_video * self.fps)
+
+    def keyframe_before(self, frame_number: int) -> Optional[int]:
+        """Возвращает номер ближайшего ключевого кадра не позже заданного
+        или None, если положение ключевых кадров неизвестно.
+
+        Args:
+            frame_number: Номер кадра.
+        """
+        i = bisect.bisect_right(self._keyframe_numbers, frame_number)
+        if i == 0:
+            return None
+        return self._keyframe_numbers[i - 1]
+
+    def timestamp(self, frame_number: int) -> Optional[float]:
+        """Возвращает время кадра от начала видеофайла в секундах или None,
+        если частота кадров неизвестна.
+
+        Args:
+            frame_number: Номер кадра.
+        """
+        if self.fps <= 0:
+            return None
+        return frame_number / self.fps
+
+    def is_valid_for(self, stat: os.stat_result) -> bool:
+        """Проверяет, что индекс построен для текущей версии видеофайла.
+
+        Args:
+            stat: Результат os.stat для видеофайла.
+        """
+        return self.size == stat.st_size and self.mtime_ns == stat.st_mtime_ns
+
+    def to_dict(self) -> dict:
+        return {
+            "version": _INDEX_VERSION,
+            "size": self.size,
+            "mtime_ns": self.mtime_ns,
+            "fps": self.fps,
+            "frame_count": self.frame_count,
+            "duration": self.duration,
+            "keyframes": self.keyframes,
+            "width": self.width,
+            "height": self.height,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Optional['VideoIndex']:
+        if data.get('version') != _INDEX_VERSION:
+            return None
+        return cls(
+            data['size'],
+            data['mtime_ns'],
+            data['fps'],
+            data['frame_count'],
+            [(n, t) for (n, t) in data['keyframes']],
+            data['width'],
+            data['height'],
+        )
+
+
+def build_video_index(video_path: str) -> Optional[VideoIndex]:
+    """Строит индекс видеофайла, читая пакеты без их декодирования.
+
+    Args:
+        video_path: Полный путь к видеофайлу.
+
+    Returns:
+        Индекс видеофайла или None, если видеофайл не удалось открыть или
+        количество кадров и частота кадров неизвестны.
+    """
+    import cv2
+
+    stat = os.stat(video_path)
+    cap = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG,
+                           [cv2.CAP_PROP_FORMAT, -1])
+    if not cap.isOpened():
+        return None
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    # у повреждённых файлов количество кадров бывает отрицательным
+    if frame_count <= 0 or fps <= 0:
+        cap.release()
+        return None
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
+    keyframes = []
+    has_key_frame = getattr(cv2, 'CAP_PROP_LRF_HAS_KEY_FRAME', None)
+    if has_key_frame is not None:
+        while cap.grab():
+            if cap.get(has_key_frame):
+                timestamp = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000
+                keyframes.append((round(timestamp * fps), timestamp))
+    cap.release()
+    return VideoIndex(stat.st_size, stat.st_mtime_ns, fps, frame_count,
+                      keyframes, width, height)
+
+
+def _index_file_path(index_dir_path: str, video_path: str) -> str:
+    name = hashlib.sha1(os.path.abspath(video_path).encode()).hexdigest()
+    return os.path.join(index_dir_path, f'{name}.json')
+
+
+def get_video_index(
+        video_path: str,
+        index_dir_path: Optional[str] = None
+    ) -> Optional[VideoIndex]:
+    """Возвращает индекс видеофайла, при необходимости строя его заново.
+
+    Индекс хранится в отдельном файле и перестраивается при изменении
+    размера или времени изменения видеофайла.
+
+    Args:
+        video_path: Полный путь к видеофайлу.
+        index_dir_path: Каталог с файлами индексов, по умолчанию из
+          конфигурационного файла.
+
+    Returns:
+        Индекс видеофайла или None, если видеофайл не удалось открыть или
+        количество кадров и частота кадров неизвестны.
+    """
+    if index_dir_path is None:
+        index_dir_path = Config().flask['VIDEO_INDEX_DIR_PATH']
+    stat = os.stat(video_path)
+    index_path = _index_file_path(index_dir_path, video_path)
+
+    with _loaded_indexes_lock:
+        index = _loaded_indexes.get(index_path)
+    if index is not None and index.is_valid_for(stat):
+        return index
+
+    index = None
+    try:
+        with open(index_path, 'r') as file:
+            index = VideoIndex.from_dict(json.load(file))
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    # индекс мог быть сохранён предыдущей версией для повреждённого файла
+    if index is not None and (index.frame_count <= 0 or index.fps <= 0):
+        index = None
+
+    if index is None or not index.is_valid_for(stat):
+        index = build_video_index(video_path)
+        if index is None:
+            return None
+        os.makedirs(index_dir_path, exist_ok=True)
+        tmp_path = (f'{index_path}.{os.getpid()}.'
+                    f'{threading.get_ident()}.tmp')
+        with open(tmp_path, 'w') as file:
+            json.dump(index.to_dict(), file)
+        os.replace(tmp_path, index_path)
+
+    with _loaded_indexes_lock:
+        _loaded_indexes[index_path] = index
+    return index
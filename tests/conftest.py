@@ -1,13 +1,18 @@
 import os
 import shutil
+import tempfile
 from typing import TYPE_CHECKING
 
-import pytest
+# метрики процессов суммируются, как под gunicorn, каталог задаётся до
+# импорта prometheus_client
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', tempfile.mkdtemp())
 
-from src import create_flask_app
-from src.utils.config import Config
-from src.models import db as test_db
-from src.models import FrameServiceInformation
+import pytest  # noqa: E402
+
+from src import create_flask_app  # noqa: E402
+from src.utils.config import Config  # noqa: E402
+from src.models import db as test_db  # noqa: E402
+from src.models import FrameServiceInformation  # noqa: E402
 
 if TYPE_CHECKING:
     from flask import Flask
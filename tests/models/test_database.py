@@ -0,0 +1,65 @@
+import os
+from typing import TYPE_CHECKING
+
+from sqlalchemy import text
+
+from src.utils.config import Config
+
+if TYPE_CHECKING:
+    from flask import Flask
+    from flask_sqlalchemy import SQLAlchemy
+
+
+def test_engine_options(app: 'Flask', db: 'SQLAlchemy') -> None:
+    """Функция проверяет применение параметров пула соединений и
+    ограничения времени выполнения запросов из конфигурационного файла.
+
+    Args:
+        app: Flask приложение.
+        db: Вызов фикстуры для очистки базы данных.
+    """
+    config = Config()
+    with app.app_context():
+        pool = db.engine.pool
+        assert pool.size() == config.flask['DB_POOL_SIZE']
+        assert pool._max_overflow == config.flask['DB_MAX_OVERFLOW']
+        assert pool._pre_ping == config.flask['DB_POOL_PRE_PING']
+        assert pool._recycle == config.flask['DB_POOL_RECYCLE']
+        statement_timeout = db.session.execute(
+            text("SELECT setting FROM pg_settings "
+                 "WHERE name = 'statement_timeout'")
+        ).scalar()
+        db.session.rollback()
+    assert int(statement_timeout) == config.flask['DB_STATEMENT_TIMEOUT']
+
+
+def test_engine_after_fork(app: 'Flask', db: 'SQLAlchemy') -> None:
+    """Функция проверяет, что процесс, созданный через fork, открывает свои
+    соединения с БД и не закрывает соединения родительского процесса.
+
+    Args:
+        app: Flask приложение.
+        db: Вызов фикстуры для очистки базы данных.
+    """
+    with app.app_context():
+        query = text('SELECT pg_backend_pid()')
+        parent_backend = db.session.execute(query).scalar()
+        db.session.commit()
+
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            # дочерний процесс только передаёт результат и завершается
+            try:
+                child_backend = db.session.execute(query).scalar()
+                os.write(write_fd, str(child_backend).encode())
+            finally:
+                os._exit(0)
+        os.close(write_fd)
+        os.waitpid(pid, 0)
+        with os.fdopen(read_fd) as file:
+            child_backend = int(file.read())
+
+        assert child_backend != parent_backend
+        assert db.session.execute(query).scalar() == parent_backend
+        db.session.rollback()
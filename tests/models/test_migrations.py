@@ -0,0 +1,95 @@
+import os
+from typing import TYPE_CHECKING
+
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config as AlembicConfig
+from alembic.migration import MigrationContext
+from sqlalchemy import inspect, text
+
+from src.utils.config import Config
+from src.utils.pre_extraction import backfill_frame_metadata
+
+if TYPE_CHECKING:
+    from flask import Flask
+    from flask.testing import FlaskClient
+    from flask_sqlalchemy import SQLAlchemy
+
+
+def test_migrations_upgrade(
+        client: 'FlaskClient',
+        app: 'Flask',
+        db: 'SQLAlchemy',
+        clean_frames_dir: None
+        ) -> None:
+    """Функция проверяет, что миграции приводят таблицу, созданную до
+    появления ключа хранилища и сведений о кадрах, к схеме моделей, а
+    остальные сведения о сохранённых кадрах заполняются отдельно.
+
+    Args:
+        client: Тестовый клиент.
+        app: Flask приложение.
+        db: Вызов фикстуры для очистки базы данных перед выполнением теста.
+        clean_frames_dir: Вызов фикстуры для удаления всех файлов в каталоге
+          с фреймами перед выполнением теста.
+    """
+    response = client.get('/api/frames?file_name=sample-1.mp4&time_in_video=0')
+    assert response.status_code == 200
+    frame_path = os.path.join(Config().flask['FRAMES_DIR_PATH'],
+                              'sample-1.mp4', '0', '3.png')
+    alembic_config = AlembicConfig('alembic.ini')
+    select_rows = text(
+        "SELECT frame_number, timestamp, width, height, file_size, format "
+        "FROM frame_service_information ORDER BY video_file_name")
+
+    with app.app_context():
+        try:
+            with db.engine.begin() as connection:
+                connection.execute(
+                    text("DROP TABLE frame_service_information"))
+                connection.execute(text("DROP TABLE IF EXISTS alembic_version"))
+                connection.execute(text(
+                    "CREATE TABLE frame_service_information ("
+                    "video_file_name VARCHAR NOT NULL, "
+                    "frame_number INTEGER NOT NULL, "
+                    "frame_file_path VARCHAR NOT NULL, "
+                    "PRIMARY KEY (video_file_name, frame_number))"))
+                connection.execute(text(
+                    "INSERT INTO frame_service_information VALUES "
+                    "('sample-1.mp4', 3, :frame_path), "
+                    "('deleted.mp4', 0, 'deleted.mp4/0/0.jpg')"),
+                    {'frame_path': frame_path})
+                alembic_config.attributes['connection'] = connection
+                command.upgrade(alembic_config, 'head')
+
+                diff = [x for x in compare_metadata(
+                            MigrationContext.configure(connection),
+                            db.metadata)
+                        if 'frame_service_information' in repr(x)]
+                assert diff == []
+                rows = connection.execute(select_rows).all()
+            assert rows[0] == (0, None, None, None, None, 'jpeg')
+            assert rows[1] == (3, None, None, None, None, 'png')
+
+            assert backfill_frame_metadata() == 2
+            with db.engine.begin() as connection:
+                rows = connection.execute(select_rows).all()
+            assert rows[0] == (0, None, None, None, None, 'jpeg')
+            assert rows[1][0] == 3
+            assert rows[1][1] == pytest.approx(3 / 30)
+            assert rows[1][2:] == (1920, 1080, os.path.getsize(frame_path),
+                                   'png')
+
+            with db.engine.begin() as connection:
+                alembic_config.attributes['connection'] = connection
+                command.downgrade(alembic_config, 'base')
+                columns = {x['name'] for x in inspect(connection).get_columns(
+                    'frame_service_information')}
+            assert columns == {'video_file_name', 'frame_number',
+                               'frame_file_path'}
+        finally:
+            with db.engine.begin() as connection:
+                connection.execute(text("DROP TABLE IF EXISTS alembic_version"))
+            db.drop_all()
+            db.create_all()
@@ -0,0 +1,142 @@
+import json
+import asyncio
+from typing import Iterator, List, Optional, Tuple, TYPE_CHECKING
+
+import pytest
+
+from src.asgi import AsgiApp, create_asgi_app
+from src.utils.config import Config
+
+if TYPE_CHECKING:
+    from flask import Flask
+
+
+@pytest.fixture(scope="module")
+def asgi_app(app: 'Flask') -> Iterator[AsgiApp]:
+    """Функция для создания ASGI приложения с конфигурацией тестового
+    Flask приложения.
+
+    Args:
+        app: Flask приложение.
+
+    Returns:
+        ASGI приложение.
+    """
+    asgi_app = create_asgi_app(Config().flask)
+    yield asgi_app
+    asgi_app.close()
+
+
+def _request(asgi_app: AsgiApp,
+             method: str,
+             path: str,
+             query_string: str = '',
+             body: bytes = b'') -> Tuple[int, dict, bytes]:
+    """Выполняет запрос к ASGI приложению.
+
+    Returns:
+        Код ответа, заголовки и тело ответа.
+    """
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "root_path": "",
+        "query_string": query_string.encode(),
+        "headers": [(b'host', b'localhost'),
+                    (b'content-type', b'application/json'),
+                    (b'content-length', str(len(body)).encode())],
+        "server": ("localhost", 80),
+        "client": ("127.0.0.1", 12345),
+    }
+    messages: List[dict] = []
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message: dict) -> None:
+        messages.append(message)
+
+    asyncio.run(asgi_app(scope, receive, send))
+    start = messages[0]
+    headers = {k.decode(): v.decode() for (k, v) in start['headers']}
+    data = b''.join(x.get('body', b'') for x in messages[1:])
+    return start['status'], headers, data
+
+
+def _get_frames(asgi_app: AsgiApp,
+                query_string: str) -> Tuple[int, Optional[dict]]:
+    status, headers, data = _request(asgi_app, 'GET', '/api/frames',
+                                     query_string)
+    if headers['content-type'] != 'application/json':
+        return status, None
+    return status, json.loads(data)
+
+
+def test_asgi_frames(
+        asgi_app: AsgiApp,
+        clean_frames_dir: None
+        ) -> None:
+    """Функция проверяет извлечение кадров в пуле процессов ASGI
+    приложения и ответ из кеша при повторном запросе.
+
+    Args:
+        asgi_app: ASGI приложение.
+        clean_frames_dir: Вызов фикстуры для удаления всех файлов в каталоге
+          с фреймами перед выполнением теста.
+    """
+    frames_dir_path = Config().flask['FRAMES_DIR_PATH']
+    save_frames_count = Config().flask['SAVE_FRAMES_COUNT']
+    expected = {
+        "first_frame": 0,
+        "file_paths": [
+            f"{frames_dir_path}/sample-1.mp4/0/{i}.png"
+            for i in range(save_frames_count)
+        ]
+    }
+
+    query_string = 'file_name=sample-1.mp4&time_in_video=0'
+    assert _get_frames(asgi_app, query_string) == (200, expected)
+    assert _get_frames(asgi_app, query_string) == (200, expected)
+
+    status, response_data = _get_frames(asgi_app,
+                                        'file_name=sample-1.mp4&count=0')
+    assert status == 400
+    assert response_data == {"time_in_video": "Required field."}
+
+
+def test_asgi_wsgi_fallback(
+        asgi_app: AsgiApp,
+        clean_frames_dir: None
+        ) -> None:
+    """Функция проверяет обработку Flask приложением запросов, для которых
+    нет асинхронных маршрутов.
+
+    Args:
+        asgi_app: ASGI приложение.
+        clean_frames_dir: Вызов фикстуры для удаления всех файлов в каталоге
+          с фреймами перед выполнением теста.
+    """
+    status, headers, data = _request(
+        asgi_app, 'POST', '/api/frames/batch', body=json.dumps({
+            "items": [{"file_name": "sample-1.mp4", "time_in_video": 1}],
+            "count": 2,
+        }).encode()
+    )
+    assert status == 200
+    assert headers['content-type'] == 'application/json'
+    assert json.loads(data)['items'][0]['first_frame'] == 30
+
+    status, headers, data = _request(
+        asgi_app, 'GET', '/api/frames',
+        'file_name=sample-1.mp4&time_in_video=0&stream=multipart&count=2'
+    )
+    assert status == 200
+    assert headers['x-first-frame'] == '0'
+    assert headers['content-type'].startswith('multipart/mixed')
+    assert data.count(b'Content-Type: image/png') == 2
+
+    status, _, _ = _request(asgi_app, 'GET', '/api/unknown')
+    assert status == 404
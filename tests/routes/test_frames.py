@@ -1,10 +1,24 @@
+import io
 import os
+import time
+import socket
+import zipfile
+import subprocess
 from typing import TYPE_CHECKING
 
+import cv2
+import numpy as np
+
+from src.models import ExtractionJob
 from src.utils.config import Config
 
 if TYPE_CHECKING:
+    from pathlib import Path
+
+    from flask import Flask
     from flask.testing import FlaskClient
+    from flask_sqlalchemy import SQLAlchemy
+    from pytest import MonkeyPatch
 
 
 def test_route_frames_empty_query(client: 'FlaskClient'):
@@ -64,6 +78,13 @@ def test_route_frames_forbidden_file_name(client: 'FlaskClient'):
         "file_name": "Forbidden file name."
     }
 
+    url = '/api/frames?file_name=/tmp/video.mp4&time_in_video=1'
+    response = client.get(url)
+    assert response.status_code == 400
+    assert response.get_json() == {
+        "file_name": "Forbidden file name."
+    }
+
 
 def test_route_frames_time_not_int(client: 'FlaskClient'):
     """Функция проверяет ответ сервера по маршруту /api/frames
@@ -139,12 +160,12 @@ def test_route_frames_file_name_with_space(client: 'FlaskClient'):
     assert response.get_json() == {
         "first_frame": 30,
         "file_paths": [
-            f"{frames_dir_path}/sample 0.mp4/{i}.png"
+            f"{frames_dir_path}/sample 0.mp4/0/{i}.png"
             for i in range(30, 30 + save_frames_count)
         ]
     }
     # check created files in FRAMES_DIR_PATH
-    file_names = set(os.listdir(f"{frames_dir_path}/sample 0.mp4"))
+    file_names = set(os.listdir(f"{frames_dir_path}/sample 0.mp4/0"))
     assert file_names == set(
         f"{i}.png"
         for i in range(30, 30 + save_frames_count)
@@ -172,12 +193,12 @@ def test_route_frames_en_filename_sec_0(
     assert response.get_json() == {
         "first_frame": 0,
         "file_paths": [
-            f"{frames_dir_path}/sample-1.mp4/{i}.png"
+            f"{frames_dir_path}/sample-1.mp4/0/{i}.png"
             for i in range(save_frames_count)
         ]
     }
     # check created files in FRAMES_DIR_PATH
-    file_names = set(os.listdir(f"{frames_dir_path}/sample-1.mp4"))
+    file_names = set(os.listdir(f"{frames_dir_path}/sample-1.mp4/0"))
     assert file_names == set(f"{i}.png" for i in range(save_frames_count))
 
     # check idempotent
@@ -186,11 +207,11 @@ def test_route_frames_en_filename_sec_0(
     assert response.get_json() == {
         "first_frame": 0,
         "file_paths": [
-            f"{frames_dir_path}/sample-1.mp4/{i}.png"
+            f"{frames_dir_path}/sample-1.mp4/0/{i}.png"
             for i in range(save_frames_count)
         ]
     }
-    file_names = set(os.listdir(f"{frames_dir_path}/sample-1.mp4"))
+    file_names = set(os.listdir(f"{frames_dir_path}/sample-1.mp4/0"))
     assert file_names == set(f"{i}.png" for i in range(save_frames_count))
 
 
@@ -215,12 +236,12 @@ def test_route_frames_en_filename_sec_2_fps_30(
     assert response.get_json() == {
         "first_frame": 60,
         "file_paths": [
-            f"{frames_dir_path}/sample-1.mp4/{i}.png"
+            f"{frames_dir_path}/sample-1.mp4/0/{i}.png"
             for i in range(60, 60 + save_frames_count)
         ]
     }
     # check created files in FRAMES_DIR_PATH
-    file_names = set(os.listdir(f"{frames_dir_path}/sample-1.mp4"))
+    file_names = set(os.listdir(f"{frames_dir_path}/sample-1.mp4/0"))
     assert file_names == set(
         f"{i}.png"
         for i in range(60, 60 + save_frames_count)
@@ -232,11 +253,11 @@ def test_route_frames_en_filename_sec_2_fps_30(
     assert response.get_json() == {
         "first_frame": 60,
         "file_paths": [
-            f"{frames_dir_path}/sample-1.mp4/{i}.png"
+            f"{frames_dir_path}/sample-1.mp4/0/{i}.png"
             for i in range(60, 60 + save_frames_count)
         ]
     }
-    file_names = set(os.listdir(f"{frames_dir_path}/sample-1.mp4"))
+    file_names = set(os.listdir(f"{frames_dir_path}/sample-1.mp4/0"))
     assert file_names == set(
         f"{i}.png"
         for i in range(60, 60 + save_frames_count)
@@ -290,12 +311,12 @@ def test_route_frames_ru_filename_sec_0(
     assert response.get_json() == {
         "first_frame": 0,
         "file_paths": [
-            f"{frames_dir_path}/пример-1.mp4/{i}.png"
+            f"{frames_dir_path}/пример-1.mp4/0/{i}.png"
             for i in range(save_frames_count)
         ]
     }
     # check created files in FRAMES_DIR_PATH
-    file_names = set(os.listdir(f"{frames_dir_path}/пример-1.mp4"))
+    file_names = set(os.listdir(f"{frames_dir_path}/пример-1.mp4/0"))
     assert file_names == set(f"{i}.png" for i in range(save_frames_count))
 
     # check idempotent
@@ -304,9 +325,693 @@ def test_route_frames_ru_filename_sec_0(
     assert response.get_json() == {
         "first_frame": 0,
         "file_paths": [
-            f"{frames_dir_path}/пример-1.mp4/{i}.png"
+            f"{frames_dir_path}/пример-1.mp4/0/{i}.png"
             for i in range(save_frames_count)
         ]
     }
-    file_names = set(os.listdir(f"{frames_dir_path}/пример-1.mp4"))
+    file_names = set(os.listdir(f"{frames_dir_path}/пример-1.mp4/0"))
     assert file_names == set(f"{i}.png" for i in range(save_frames_count))
+
+
+def test_route_frames_cache_hit(
+        client: 'FlaskClient',
+        clean_frames_dir: None,
+        monkeypatch: 'MonkeyPatch'
+        ) -> None:
+    """Функция проверяет, что повторный запрос тех же кадров обслуживается
+    из кеша без открытия видеофайла.
+
+    Args:
+        client: Тестовый клиент.
+        clean_frames_dir: Вызов фикстуры для удаления всех файлов в каталоге
+          с фреймами перед выполнением теста.
+        monkeypatch: Фикстура для подмены объектов.
+    """
+    config = Config()
+    frames_dir_path = config.flask['FRAMES_DIR_PATH']
+    save_frames_count = config.flask['SAVE_FRAMES_COUNT']
+    expected = {
+        "first_frame": 30,
+        "file_paths": [
+            f"{frames_dir_path}/sample-1.mp4/0/{i}.png"
+            for i in range(30, 30 + save_frames_count)
+        ]
+    }
+
+    response = client.get('/api/frames?file_name=sample-1.mp4&time_in_video=1')
+    assert response.status_code == 200
+    assert response.get_json() == expected
+    hits = client.get('/api/frames/cache').get_json()['hits']
+
+    def video_capture(*args, **kwargs):
+        raise AssertionError('Video file must not be opened.')
+
+    monkeypatch.setattr(cv2, 'VideoCapture', video_capture)
+    response = client.get('/api/frames?file_name=sample-1.mp4&time_in_video=1')
+    assert response.status_code == 200
+    assert response.get_json() == expected
+    assert client.get('/api/frames/cache').get_json()['hits'] == hits + 1
+
+
+def wait_frames_job(client: 'FlaskClient', job_id: str) -> dict:
+    """Функция ожидает завершения задачи на извлечение кадров.
+
+    Args:
+        client: Тестовый клиент.
+        job_id: Идентификатор задачи.
+
+    Returns:
+        Ответ сервера с состоянием завершённой задачи.
+    """
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        response = client.get(f'/api/frames/jobs/{job_id}')
+        assert response.status_code == 200
+        if response.get_json()['status'] != 'pending':
+            return response.get_json()
+        time.sleep(0.1)
+    raise TimeoutError(job_id)
+
+
+def test_route_frames_job(
+        client: 'FlaskClient',
+        db: 'SQLAlchemy',
+        clean_frames_dir: None
+        ) -> None:
+    """Функция проверяет извлечение кадров в задаче, выполняемой в пуле
+    процессов.
+
+    Args:
+        client: Тестовый клиент.
+        db: Вызов фикстуры для очистки базы данных перед выполнением теста.
+        clean_frames_dir: Вызов фикстуры для удаления всех файлов в каталоге
+          с фреймами перед выполнением теста.
+    """
+    config = Config()
+    frames_dir_path = config.flask['FRAMES_DIR_PATH']
+    save_frames_count = config.flask['SAVE_FRAMES_COUNT']
+
+    body = {'file_name': 'sample-3.mp4', 'time_in_video': 2}
+    response = client.post('/api/frames/jobs', json=body)
+    assert response.status_code == 202
+    job_id = response.get_json()['job_id']
+    assert response.headers['Location'] == f'/api/frames/jobs/{job_id}'
+
+    assert wait_frames_job(client, job_id) == {
+        "job_id": job_id,
+        "status": "done",
+        "first_frame": 60,
+        "file_paths": [
+            f"{frames_dir_path}/sample-3.mp4/0/{i}.png"
+            for i in range(60, 60 + save_frames_count)
+        ]
+    }
+    file_names = set(os.listdir(f"{frames_dir_path}/sample-3.mp4/0"))
+    assert file_names == set(
+        f"{i}.png"
+        for i in range(60, 60 + save_frames_count)
+    )
+
+    # frames from cache
+    response = client.post('/api/frames/jobs', json=body)
+    assert response.status_code == 200
+    response_json = response.get_json()
+    assert response_json['status'] == 'done'
+    assert response_json['first_frame'] == 60
+
+
+def test_route_frames_job_failed(
+        client: 'FlaskClient',
+        db: 'SQLAlchemy'
+        ) -> None:
+    """Функция проверяет состояние задачи, в которой не удалось извлечь
+    кадры, и ответ сервера для несуществующей задачи.
+
+    Args:
+        client: Тестовый клиент.
+        db: Вызов фикстуры для очистки базы данных перед выполнением теста.
+    """
+    body = {'file_name': 'corrupted_file.mp4', 'time_in_video': 1}
+    response = client.post('/api/frames/jobs', json=body)
+    assert response.status_code == 202
+    job_id = response.get_json()['job_id']
+    assert wait_frames_job(client, job_id) == {
+        "job_id": job_id,
+        "status": "failed",
+        "message": "Failed to extract frames."
+    }
+
+    response = client.get('/api/frames/jobs/404')
+    assert response.status_code == 404
+    assert response.get_json() == {"message": "Job doesn't exist."}
+
+    response = client.post('/api/frames/jobs', json={'file_name': '404'})
+    assert response.status_code == 400
+    assert response.get_json() == {"time_in_video": "Required field."}
+
+    response = client.post('/api/frames/jobs', json=[])
+    assert response.status_code == 400
+    assert response.get_json() == {
+        "file_name": "Required field.",
+        "time_in_video": "Required field."
+    }
+
+    response = client.post('/api/frames/jobs',
+                           json={'file_name': 5, 'time_in_video': 1})
+    assert response.status_code == 400
+    assert response.get_json() == {"file_name": "Required string type."}
+
+
+def test_route_frames_job_orphaned(
+        client: 'FlaskClient',
+        app: 'Flask',
+        db: 'SQLAlchemy',
+        clean_frames_dir: None
+        ) -> None:
+    """Функция проверяет перезапуск задачи, процесс которой был остановлен.
+
+    Args:
+        client: Тестовый клиент.
+        app: Flask приложение.
+        db: Вызов фикстуры для очистки базы данных перед выполнением теста.
+        clean_frames_dir: Вызов фикстуры для удаления всех файлов в каталоге
+          с фреймами перед выполнением теста.
+    """
+    stopped_process = subprocess.Popen(['true'])
+    stopped_process.wait()
+    with app.app_context():
+        owner = f'{socket.gethostname()}:{stopped_process.pid}'
+        db.session.add(ExtractionJob('orphaned', 'sample-1.mp4', 0, owner))
+        db.session.commit()
+
+    response = wait_frames_job(client, 'orphaned')
+    assert response['status'] == 'done'
+    assert response['first_frame'] == 0
+
+
+def test_route_frames_jpeg(
+        client: 'FlaskClient',
+        clean_frames_dir: None
+        ) -> None:
+    """Функция проверяет сохранение кадров в формате JPEG с заданным
+    качеством.
+
+    Args:
+        client: Тестовый клиент.
+        clean_frames_dir: Вызов фикстуры для удаления всех файлов в каталоге
+          с фреймами перед выполнением теста.
+    """
+    config = Config()
+    frames_dir_path = config.flask['FRAMES_DIR_PATH']
+    save_frames_count = config.flask['SAVE_FRAMES_COUNT']
+
+    url = '/api/frames?file_name=sample-1.mp4&time_in_video=0&format=jpeg'
+    response = client.get(f'{url}&quality=90')
+    assert response.status_code == 200
+    assert response.get_json() == {
+        "first_frame": 0,
+        "file_paths": [
+            f"{frames_dir_path}/sample-1.mp4/0/{i}.jpg"
+            for i in range(save_frames_count)
+        ]
+    }
+    file_names = set(os.listdir(f"{frames_dir_path}/sample-1.mp4/0"))
+    assert file_names == set(f"{i}.jpg" for i in range(save_frames_count))
+    image = cv2.imread(f"{frames_dir_path}/sample-1.mp4/0/0.jpg")
+    assert image.shape == (1080, 1920, 3)
+    size_90 = os.path.getsize(f"{frames_dir_path}/sample-1.mp4/0/0.jpg")
+
+    response = client.get(f'{url}&quality=10')
+    assert response.status_code == 200
+    assert os.path.getsize(f"{frames_dir_path}/sample-1.mp4/0/0.jpg") < size_90
+
+
+def test_route_frames_invalid_encoding(client: 'FlaskClient') -> None:
+    """Функция проверяет ответ сервера по маршруту /api/frames
+    при недопустимых значениях параметров format и quality.
+
+    Args:
+        client: Тестовый клиент.
+    """
+    url = '/api/frames?file_name=sample-1.mp4&time_in_video=0'
+    response = client.get(f'{url}&format=bmp')
+    assert response.status_code == 400
+    assert response.get_json() == {"format": "Unsupported format."}
+
+    response = client.get(f'{url}&format=png&quality=10')
+    assert response.status_code == 400
+    assert response.get_json() == {"quality": "Not in range 0-9."}
+
+    response = client.get(f'{url}&format=webp&quality=q')
+    assert response.status_code == 400
+    assert response.get_json() == {"quality": "Required number type"}
+
+    for quality in (True, 55.9, '55.9'):
+        response = client.post('/api/frames/batch', json={
+            'items': [], 'format': 'webp', 'quality': quality})
+        assert response.status_code == 400
+        assert response.get_json() == {"quality": "Required number type"}
+    response = client.post('/api/frames/batch', json={
+        'items': [], 'format': 'webp', 'quality': 55.0})
+    assert response.status_code == 200
+
+
+def test_route_frames_thumbnails(
+        client: 'FlaskClient',
+        clean_frames_dir: None
+        ) -> None:
+    """Функция проверяет сохранение уменьшенных кадров в подкаталог
+    с названием размера.
+
+    Args:
+        client: Тестовый клиент.
+        clean_frames_dir: Вызов фикстуры для удаления всех файлов в каталоге
+          с фреймами перед выполнением теста.
+    """
+    config = Config()
+    frames_dir_path = config.flask['FRAMES_DIR_PATH']
+    save_frames_count = config.flask['SAVE_FRAMES_COUNT']
+    url = '/api/frames?file_name=sample-1.mp4&time_in_video=0'
+
+    response = client.get(f'{url}&width=320')
+    assert response.status_code == 200
+    assert response.get_json() == {
+        "first_frame": 0,
+        "file_paths": [
+            f"{frames_dir_path}/sample-1.mp4/w320/0/{i}.png"
+            for i in range(save_frames_count)
+        ]
+    }
+    image = cv2.imread(f"{frames_dir_path}/sample-1.mp4/w320/0/0.png")
+    assert image.shape == (180, 320, 3)
+
+    response = client.get(f'{url}&scale=0.25&stream=zip')
+    assert response.status_code == 200
+    with zipfile.ZipFile(io.BytesIO(response.get_data())) as archive:
+        data = archive.read('0.png')
+    image = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+    assert image.shape == (270, 480, 3)
+
+    response = client.get(f'{url}&width=100&height=100')
+    assert response.status_code == 200
+    image = cv2.imread(f"{frames_dir_path}/sample-1.mp4/w100h100/0/0.png")
+    assert image.shape == (100, 100, 3)
+
+    # full-size frames are stored separately
+    response = client.get(url)
+    assert response.status_code == 200
+    image = cv2.imread(f"{frames_dir_path}/sample-1.mp4/0/0.png")
+    assert image.shape == (1080, 1920, 3)
+
+
+def test_route_frames_invalid_size(client: 'FlaskClient') -> None:
+    """Функция проверяет ответ сервера по маршруту /api/frames
+    при недопустимых значениях параметров width, height и scale.
+
+    Args:
+        client: Тестовый клиент.
+    """
+    url = '/api/frames?file_name=sample-1.mp4&time_in_video=0'
+    response = client.get(f'{url}&width=0&height=a')
+    assert response.status_code == 400
+    assert response.get_json() == {
+        "width": "Less than minimum value 1.",
+        "height": "Required number type"
+    }
+
+    response = client.post('/api/frames/batch', json={
+        'items': [], 'width': True, 'height': 10.5})
+    assert response.status_code == 400
+    assert response.get_json() == {
+        "width": "Required number type",
+        "height": "Required number type"
+    }
+    response = client.post('/api/frames/batch', json={
+        'items': [], 'width': 10.0})
+    assert response.status_code == 200
+
+    response = client.get(f'{url}&scale=2')
+    assert response.status_code == 400
+    assert response.get_json() == {"scale": "Not in range 0-1."}
+
+    response = client.post('/api/frames/batch', json={
+        'items': [], 'scale': True})
+    assert response.status_code == 400
+    assert response.get_json() == {"scale": "Required number type"}
+
+    response = client.get(f'{url}&scale=0.00001')
+    assert response.status_code == 400
+    assert response.get_json() == {"scale": "Not in range 0-1."}
+
+    response = client.get(f'{url}&scale=0.5&width=10')
+    assert response.status_code == 400
+    assert response.get_json() == {
+        "scale": "Not allowed with width or height."
+    }
+
+
+def test_route_frames_count_step(
+        client: 'FlaskClient',
+        clean_frames_dir: None
+        ) -> None:
+    """Функция проверяет извлечение заданного количества кадров с заданной
+    разницей номеров соседних кадров.
+
+    Args:
+        client: Тестовый клиент.
+        clean_frames_dir: Вызов фикстуры для удаления всех файлов в каталоге
+          с фреймами перед выполнением теста.
+    """
+    frames_dir_path = Config().flask['FRAMES_DIR_PATH']
+    url = '/api/frames?file_name=sample-1.mp4&time_in_video=1'
+
+    response = client.get(f'{url}&count=4&step=10')
+    assert response.status_code == 200
+    first_frame = response.get_json()['first_frame']
+    assert response.get_json()['file_paths'] == [
+        f"{frames_dir_path}/sample-1.mp4/0/{first_frame + i * 10}.png"
+        for i in range(4)
+    ]
+
+    response = client.get(f'{url}&count=4&step=10&stream=zip')
+    assert response.status_code == 200
+    with zipfile.ZipFile(io.BytesIO(response.get_data())) as archive:
+        assert archive.namelist() == [
+            f'{first_frame + i * 10}.png' for i in range(4)
+        ]
+
+    response = client.post('/api/frames/batch', json={
+        "items": [{"file_name": "sample-1.mp4", "time_in_video": 2}],
+        "count": 3,
+        "step": 5,
+    })
+    assert response.status_code == 200
+    item = response.get_json()['items'][0]
+    assert item['file_paths'] == [
+        f"{frames_dir_path}/sample-1.mp4/0/{item['first_frame'] + i * 5}.png"
+        for i in range(3)
+    ]
+
+
+def test_route_frames_invalid_count_step(client: 'FlaskClient') -> None:
+    """Функция проверяет ответ сервера по маршруту /api/frames
+    при недопустимых значениях параметров count и step.
+
+    Args:
+        client: Тестовый клиент.
+    """
+    max_frames_count = Config().flask['MAX_FRAMES_COUNT']
+    url = '/api/frames?file_name=sample-1.mp4&time_in_video=0'
+    response = client.get(f'{url}&count=0&step=a')
+    assert response.status_code == 400
+    assert response.get_json() == {
+        "count": "Less than minimum value 1.",
+        "step": "Required number type"
+    }
+
+    response = client.get(f'{url}&count={max_frames_count + 1}')
+    assert response.status_code == 400
+    assert response.get_json() == {
+        "count": f"Greater than maximum value {max_frames_count}."
+    }
+
+    response = client.post('/api/frames/batch', json={
+        'items': [], 'count': True, 'step': 2.7})
+    assert response.status_code == 400
+    assert response.get_json() == {
+        "count": "Required number type",
+        "step": "Required number type"
+    }
+    response = client.post('/api/frames/batch', json={
+        'items': [], 'count': 3.0, 'step': 2})
+    assert response.status_code == 200
+
+
+def test_route_frames_stream_multipart(
+        client: 'FlaskClient',
+        clean_frames_dir: None
+        ) -> None:
+    """Функция проверяет получение кадров в теле ответа multipart/mixed без
+    сохранения их на диск.
+
+    Args:
+        client: Тестовый клиент.
+        clean_frames_dir: Вызов фикстуры для удаления всех файлов в каталоге
+          с фреймами перед выполнением теста.
+    """
+    config = Config()
+    frames_dir_path = config.flask['FRAMES_DIR_PATH']
+    save_frames_count = config.flask['SAVE_FRAMES_COUNT']
+
+    url = '/api/frames?file_name=sample-3.mp4&time_in_video=1&stream=multipart'
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.mimetype == 'multipart/mixed'
+    assert response.headers['X-First-Frame'] == '30'
+
+    boundary = response.mimetype_params['boundary'].encode()
+    parts = response.data.split(b'--' + boundary)
+    assert parts[0] == b''
+    assert parts[-1] == b'--\r\n'
+    parts = parts[1:-1]
+    assert len(parts) == save_frames_count
+    for (i, part) in enumerate(parts, 30):
+        headers, data = part.split(b'\r\n\r\n', 1)
+        assert b'Content-Type: image/png' in headers
+        assert f'filename="{i}.png"'.encode() in headers
+        image = cv2.imdecode(np.frombuffer(data[:-2], np.uint8),
+                             cv2.IMREAD_COLOR)
+        assert image.shape == (360, 640, 3)
+
+    assert not os.path.exists(f"{frames_dir_path}/sample-3.mp4")
+
+
+def test_route_frames_stream_zip(
+        client: 'FlaskClient',
+        clean_frames_dir: None
+        ) -> None:
+    """Функция проверяет получение кадров в ZIP-архиве с сохранением их
+    на диск.
+
+    Args:
+        client: Тестовый клиент.
+        clean_frames_dir: Вызов фикстуры для удаления всех файлов в каталоге
+          с фреймами перед выполнением теста.
+    """
+    config = Config()
+    frames_dir_path = config.flask['FRAMES_DIR_PATH']
+    save_frames_count = config.flask['SAVE_FRAMES_COUNT']
+    expected = [f"{i}.jpg" for i in range(60, 60 + save_frames_count)]
+
+    url = ('/api/frames?file_name=sample-3.mp4&time_in_video=2&stream=zip'
+           '&format=jpeg&save=true')
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.mimetype == 'application/zip'
+    archive = zipfile.ZipFile(io.BytesIO(response.data))
+    assert archive.namelist() == expected
+    frame_dir = f"{frames_dir_path}/sample-3.mp4/0"
+    assert set(os.listdir(frame_dir)) == set(expected)
+    for file_name in expected:
+        frame_path = f"{frame_dir}/{file_name}"
+        with open(frame_path, 'rb') as file:
+            assert archive.read(file_name) == file.read()
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert zipfile.ZipFile(io.BytesIO(response.data)).namelist() == expected
+
+    response = client.get(url.replace('stream=zip', 'stream=tar'))
+    assert response.status_code == 400
+    assert response.get_json() == {"stream": "Unsupported stream format."}
+
+
+def test_route_frames_batch(
+        client: 'FlaskClient',
+        clean_frames_dir: None
+        ) -> None:
+    """Функция проверяет извлечение кадров для нескольких моментов времени
+    одним запросом.
+
+    Args:
+        client: Тестовый клиент.
+        clean_frames_dir: Вызов фикстуры для удаления всех файлов в каталоге
+          с фреймами перед выполнением теста.
+    """
+    config = Config()
+    frames_dir_path = config.flask['FRAMES_DIR_PATH']
+    save_frames_count = config.flask['SAVE_FRAMES_COUNT']
+
+    def frame_paths(file_name: str, first_frame: int) -> list:
+        return [
+            f"{frames_dir_path}/{file_name}/0/{i}.png"
+            for i in range(first_frame, first_frame + save_frames_count)
+        ]
+
+    body = {
+        'items': [
+            {'file_name': 'sample-3.mp4', 'time_in_video': 5},
+            {'file_name': 'sample-1.mp4', 'time_in_video': 0},
+            {'file_name': 'sample-3.mp4', 'time_in_video': 1},
+            {'file_name': 'sample-3.mp4', 'time_in_video': 999},
+            {'file_name': '../sample-3.mp4', 'time_in_video': 1},
+            {'file_name': 'sample-3.mp4'},
+            'sample-3.mp4',
+            {'file_name': 'sample-3.mp4', 'time_in_video': 5},
+        ]
+    }
+    response = client.post('/api/frames/batch', json=body)
+    assert response.status_code == 200
+    sample_3_sec_1 = frame_paths('sample-3.mp4', 30)
+    sample_3_sec_5 = frame_paths('sample-3.mp4', 150)
+    assert response.get_json() == {
+        "items": [
+            {"first_frame": 150, "file_paths": sample_3_sec_5},
+            {"first_frame": 0, "file_paths": frame_paths('sample-1.mp4', 0)},
+            {"first_frame": 30, "file_paths": sample_3_sec_1},
+            {"message": "Failed to extract frames."},
+            {"errors": {"file_name": "Forbidden file name."}},
+            {"errors": {"time_in_video": "Required field."}},
+            {"errors": {"item": "Required object type."}},
+            {"first_frame": 150, "file_paths": sample_3_sec_5},
+        ]
+    }
+    assert set(os.listdir(f"{frames_dir_path}/sample-3.mp4/0")) == set(
+        os.path.basename(p) for p in sample_3_sec_1 + sample_3_sec_5
+    )
+
+    response = client.post('/api/frames/batch', json={'items': {}})
+    assert response.status_code == 400
+    assert response.get_json() == {"items": "Required list type."}
+
+    response = client.post('/api/frames/batch', json=[])
+    assert response.status_code == 400
+    assert response.get_json() == {"items": "Required field."}
+
+    response = client.post('/api/frames/batch', json={'items': [
+        {'file_name': 5, 'time_in_video': 1},
+        {'file_name': 'sample-3.mp4', 'time_in_video': True},
+        {'file_name': 'sample-3.mp4', 'time_in_video': 1.9},
+    ]})
+    assert response.status_code == 200
+    assert response.get_json() == {
+        "items": [
+            {"errors": {"file_name": "Required string type."}},
+            {"errors": {"time_in_video": "Required number type"}},
+            {"errors": {"time_in_video": "Required number type"}},
+        ]
+    }
+
+
+def test_route_frames_file(
+        client: 'FlaskClient',
+        clean_frames_dir: None,
+        monkeypatch: 'MonkeyPatch'
+        ) -> None:
+    """Функция проверяет получение файла с кадром, условные запросы,
+    запросы части файла и передачу файла nginx.
+
+    Args:
+        client: Тестовый клиент.
+        clean_frames_dir: Вызов фикстуры для удаления всех файлов в каталоге
+          с фреймами перед выполнением теста.
+        monkeypatch: Фикстура для подмены объектов.
+    """
+    config = Config()
+    frames_dir_path = config.flask['FRAMES_DIR_PATH']
+    url = '/api/frames/file?file_name=sample-1.mp4&frame_number=31'
+
+    response = client.get(url)
+    assert response.status_code == 404
+    assert response.get_json() == {"message": "Frame doesn't exist."}
+
+    response = client.get('/api/frames?file_name=sample-1.mp4&time_in_video=1')
+    assert response.status_code == 200
+    with open(f"{frames_dir_path}/sample-1.mp4/0/31.png", 'rb') as file:
+        data = file.read()
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.mimetype == 'image/png'
+    assert response.data == data
+    assert response.cache_control.public
+    assert (response.cache_control.max_age
+            == config.flask['FRAME_HTTP_MAX_AGE'])
+    etag, weak = response.get_etag()
+    assert not weak
+
+    response = client.get(url, headers={'If-None-Match': f'"{etag}"'})
+    assert response.status_code == 304
+    assert response.data == b''
+
+    response = client.get(url, headers={'Range': 'bytes=10-19'})
+    assert response.status_code == 206
+    assert response.headers['Content-Range'] == f'bytes 10-19/{len(data)}'
+    assert response.data == data[10:20]
+
+    response = client.get(url, headers={'Range': f'bytes={len(data)}-'})
+    assert response.status_code == 416
+
+    response = client.get(f'{url}&format=jpeg')
+    assert response.status_code == 404
+
+    monkeypatch.setitem(config.flask, 'FRAME_X_ACCEL_REDIRECT', '/frames/')
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.headers['X-Accel-Redirect'] == (
+        '/frames/sample-1.mp4/0/31.png')
+    assert response.get_etag() == (etag, False)
+    assert response.data == b''
+    response = client.get(url, headers={'If-None-Match': f'"{etag}"'})
+    assert response.status_code == 304
+
+
+def test_route_frames_file_invalid(client: 'FlaskClient',
+                                   tmp_path: 'Path') -> None:
+    """Функция проверяет ответ сервера по маршруту /api/frames/file
+    при неверных параметрах запроса и путях к кадрам за пределами каталога
+    с кадрами.
+
+    Args:
+        client: Тестовый клиент.
+        tmp_path: Временный каталог.
+    """
+    response = client.get('/api/frames/file')
+    assert response.status_code == 400
+    assert response.get_json() == {"file_name": "Required field.",
+                                   "frame_number": "Required field."}
+
+    response = client.get('/api/frames/file?file_name=../config.yaml'
+                          '&frame_number=-1')
+    assert response.status_code == 400
+    assert response.get_json() == {
+        "file_name": "Forbidden file name.",
+        "frame_number": "Less than minimum value 0.",
+    }
+
+    # a frame outside the frames directory is neither read nor indexed
+    frame_dir = tmp_path / 'outside'
+    frame_dir.mkdir()
+    (frame_dir / '0.png').write_bytes(b'frame')
+    response = client.get(f'/api/frames/file?file_name={frame_dir}'
+                          '&frame_number=0')
+    assert response.status_code == 400
+    assert response.get_json() == {"file_name": "Forbidden file name."}
+    assert sorted(os.listdir(frame_dir)) == ['0.png']
+
+    # a link inside the frames directory to a directory outside it
+    link_path = os.path.join(Config().flask['FRAMES_DIR_PATH'], 'outside.mp4')
+    os.symlink(frame_dir, link_path)
+    try:
+        response = client.get('/api/frames/file?file_name=outside.mp4'
+                              '&frame_number=0')
+    finally:
+        os.remove(link_path)
+    assert response.status_code == 400
+    assert response.get_json() == {"file_name": "Forbidden file name."}
+    assert sorted(os.listdir(frame_dir)) == ['0.png']
+
+    response = client.get('/api/frames/file?file_name=sample-1.mp4'
+                          '&frame_number=1&format=gif')
+    assert response.status_code == 400
+    assert response.get_json() == {"format": "Unsupported format."}
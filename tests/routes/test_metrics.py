@@ -0,0 +1,71 @@
+import re
+import multiprocessing
+from typing import TYPE_CHECKING
+
+from src.utils.metrics import BYTES_WRITTEN
+
+if TYPE_CHECKING:
+    from flask.testing import FlaskClient
+
+
+def _metric_value(text: str, sample: str) -> float:
+    match = re.search(rf'^{re.escape(sample)} (\S+)$', text, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+
+def _write_bytes(count: int) -> None:
+    BYTES_WRITTEN.inc(count)
+
+
+def test_route_metrics(client: 'FlaskClient', clean_frames_dir: None) -> None:
+    """Проверяет метрики этапов извлечения кадров после запроса кадров.
+
+    Args:
+        client: Тестовый клиент.
+        clean_frames_dir: Очистка каталога с кадрами.
+    """
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    before = response.get_data(as_text=True)
+
+    response = client.get('/api/frames?file_name=sample-1.mp4&time_in_video=0')
+    assert response.status_code == 200
+
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    after = response.get_data(as_text=True)
+    for stage in ('index', 'open', 'decode', 'encode', 'write',
+                  'cache_lookup', 'cache_store'):
+        sample = f'frame_service_stage_seconds_count{{stage="{stage}"}}'
+        assert _metric_value(after, sample) > _metric_value(before, sample)
+    sample = 'frame_service_frames_returned_total'
+    assert _metric_value(after, sample) - _metric_value(before, sample) == 12
+    sample = 'frame_service_frames_decoded_total'
+    assert _metric_value(after, sample) - _metric_value(before, sample) >= 12
+    sample = 'frame_service_bytes_written_total'
+    assert _metric_value(after, sample) > _metric_value(before, sample)
+    sample = ('frame_service_request_seconds_count{endpoint="frames.get_frames"'
+              ',method="GET",status="200"}')
+    assert _metric_value(after, sample) > _metric_value(before, sample)
+
+
+def test_route_metrics_processes(client: 'FlaskClient') -> None:
+    """Проверяет суммирование метрик разных процессов.
+
+    Args:
+        client: Тестовый клиент.
+    """
+    sample = 'frame_service_bytes_written_total'
+    before = _metric_value(client.get('/metrics').get_data(as_text=True),
+                           sample)
+
+    process = multiprocessing.get_context('spawn').Process(
+        target=_write_bytes, args=(1000,))
+    process.start()
+    process.join()
+    assert process.exitcode == 0
+
+    after = _metric_value(client.get('/metrics').get_data(as_text=True),
+                          sample)
+    assert after - before == 1000
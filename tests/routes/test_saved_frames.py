@@ -1,11 +1,15 @@
 import os
+import logging
 from typing import TYPE_CHECKING
 
+import pytest
 from sqlalchemy import select
 
 from tests.conftest import create_frame_service_information
 from src.models import FrameServiceInformation
+from src.utils import metrics
 from src.utils.config import Config
+from src.utils.frame_store import file_content_hash
 
 if TYPE_CHECKING:
     from flask import Flask
@@ -209,7 +213,8 @@ def test_route_saved_frames_create(
     assert response.get_json() == {
         'file_path': 'sample-1.mp4',
         'frame_number': 1,
-        "frame_path": os.path.join(frames_dir_path, 'sample-1.mp4', '1.png')
+        "frame_path": os.path.join(frames_dir_path, 'sample-1.mp4', '0',
+                                   '1.png')
     }
 
     # read record from database
@@ -221,7 +226,15 @@ def test_route_saved_frames_create(
     assert frame_service_informations[0].video_file_name == 'sample-1.mp4'
     assert frame_service_informations[0].frame_number == 1
     assert (frame_service_informations[0].frame_file_path ==
-            os.path.join(frames_dir_path, 'sample-1.mp4', '1.png'))
+            os.path.join(frames_dir_path, 'sample-1.mp4', '0', '1.png'))
+    assert (frame_service_informations[0].content_hash ==
+            file_content_hash(frame_service_informations[0].frame_file_path))
+    assert frame_service_informations[0].timestamp == pytest.approx(1 / 30)
+    assert frame_service_informations[0].width == 1920
+    assert frame_service_informations[0].height == 1080
+    assert (frame_service_informations[0].file_size ==
+            os.path.getsize(frame_service_informations[0].frame_file_path))
+    assert frame_service_informations[0].format == 'png'
 
     # repeat request
     response = client.post('/api/saved_frames/new_frame', json=request_body)
@@ -234,4 +247,287 @@ def test_route_saved_frames_create(
     assert frame_service_informations[0].video_file_name == 'sample-1.mp4'
     assert frame_service_informations[0].frame_number == 1
     assert (frame_service_informations[0].frame_file_path ==
-            os.path.join(frames_dir_path, 'sample-1.mp4', '1.png'))
+            os.path.join(frames_dir_path, 'sample-1.mp4', '0', '1.png'))
+
+
+def test_route_saved_frames_create_jpeg(
+        client: 'FlaskClient',
+        db: 'SQLAlchemy',
+        clean_frames_dir: None
+) -> None:
+    """Функция проверяет ответ сервера по маршруту /api/saved_frames/new_file
+    при сохранении служебной информации о кадре в формате JPEG.
+
+    Args:
+        client: Тестовый клиент.
+        db: Вызов фикстуры для очистки базы данных перед выполнением теста.
+        clean_frames_dir: Вызов фикстуры для удаления всех файлов в каталоге с
+          фреймами перед выполнением теста.
+    """
+    url = '/api/frames?file_name=sample-1.mp4&time_in_video=0&format=jpeg'
+    response = client.get(url)
+    assert response.status_code == 200
+
+    request_body = {
+        'file_path': 'sample-1.mp4',
+        'frame_number': 1
+    }
+    response = client.post('/api/saved_frames/new_frame', json=request_body)
+    assert response.status_code == 400
+    assert response.get_json() == {
+        "message": "Frame doesn't exist."
+    }
+
+    request_body['format'] = 'jpeg'
+    response = client.post('/api/saved_frames/new_frame', json=request_body)
+    frames_dir_path = Config().flask['FRAMES_DIR_PATH']
+    assert response.status_code == 201
+    assert response.get_json() == {
+        'file_path': 'sample-1.mp4',
+        'frame_number': 1,
+        "frame_path": os.path.join(frames_dir_path, 'sample-1.mp4', '0',
+                                   '1.jpg')
+    }
+
+    request_body['format'] = 'gif'
+    response = client.post('/api/saved_frames/new_frame', json=request_body)
+    assert response.status_code == 400
+    assert response.get_json() == {"format": "Unsupported format."}
+
+
+def test_route_saved_frames_get_pages(
+        client: 'FlaskClient',
+        app: 'Flask',
+        db: 'SQLAlchemy'
+        ) -> None:
+    """Функция проверяет постраничное получение списка сохранённых кадров и
+    фильтры по имени видеофайла и номерам кадров.
+
+    Args:
+        client: Тестовый клиент.
+        app: Flask приложение.
+        db: Вызов фикстуры для очистки базы данных перед выполнением теста.
+    """
+    expected = [
+        {
+            "video_file_name": video_file_name,
+            "frame_number": frame_number,
+            "frame_file_path": f"{video_file_name}/{frame_number}.png",
+        }
+        for video_file_name in ('a.mp4', 'b.mp4')
+        for frame_number in (1, 2, 10, 11, 20)
+    ]
+    for frame_service_information in expected:
+        create_frame_service_information(app, db, **frame_service_information)
+
+    received = []
+    url = '/api/saved_frames?limit=3'
+    while True:
+        response = client.get(url)
+        assert response.status_code == 200
+        page = response.get_json()
+        assert len(page) <= 3
+        received.extend(page)
+        if 'X-Next-Cursor' not in response.headers:
+            break
+        cursor = response.headers['X-Next-Cursor']
+        url = f'/api/saved_frames?limit=3&cursor={cursor}'
+    assert received == expected
+
+    url = ('/api/saved_frames?video_file_name=b.mp4'
+           '&frame_number_from=2&frame_number_to=11&limit=2')
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.get_json() == expected[6:8]
+    next_url = response.headers['Link'][1:response.headers['Link'].index('>')]
+    response = client.get(next_url)
+    assert response.status_code == 200
+    assert response.get_json() == expected[8:9]
+    assert 'X-Next-Cursor' not in response.headers
+
+
+def test_route_saved_frames_get_invalid_params(client: 'FlaskClient') -> None:
+    """Функция проверяет ответ сервера при недопустимых параметрах
+    постраничного получения списка сохранённых кадров.
+
+    Args:
+        client: Тестовый клиент.
+    """
+    response = client.get('/api/saved_frames?limit=0&cursor=abc'
+                          '&frame_number_from=x')
+    assert response.status_code == 400
+    assert response.get_json() == {
+        "limit": "Less than minimum value 1.",
+        "cursor": "Invalid cursor.",
+        "frame_number_from": "Required number type",
+    }
+
+
+def test_route_saved_frames_range(
+        client: 'FlaskClient',
+        app: 'Flask',
+        db: 'SQLAlchemy'
+        ) -> None:
+    """Функция проверяет получение сохранённых кадров видеофайла в интервале
+    времени и номеров кадров с количеством и суммарным размером кадров.
+
+    Args:
+        client: Тестовый клиент.
+        app: Flask приложение.
+        db: Вызов фикстуры для очистки базы данных перед выполнением теста.
+    """
+    with app.app_context():
+        for video_file_name in ('a.mp4', 'b.mp4'):
+            for frame_number in range(0, 100, 10):
+                db.session.add(FrameServiceInformation(
+                    video_file_name, frame_number,
+                    f'{video_file_name}/{frame_number}.png',
+                    timestamp=frame_number / 10, width=320, height=240,
+                    file_size=100 + frame_number, format='png'))
+        db.session.commit()
+
+    url = '/api/saved_frames/range?video_file_name=a.mp4&time_from=2&time_to=5'
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.get_json() == {
+        "video_file_name": "a.mp4",
+        "count": 4,
+        "total_size": 100 * 4 + 20 + 30 + 40 + 50,
+        "frames": [
+            {
+                "frame_number": frame_number,
+                "timestamp": frame_number / 10,
+                "width": 320,
+                "height": 240,
+                "file_size": 100 + frame_number,
+                "format": "png",
+                "frame_file_path": f"a.mp4/{frame_number}.png",
+            }
+            for frame_number in (20, 30, 40, 50)
+        ],
+    }
+
+    url = ('/api/saved_frames/range?video_file_name=b.mp4'
+           '&frame_number_from=30&time_to=7&limit=3')
+    response = client.get(url)
+    assert response.status_code == 200
+    page = response.get_json()
+    assert page['count'] == 5
+    assert [x['frame_number'] for x in page['frames']] == [30, 40, 50]
+    next_url = response.headers['Link'][1:response.headers['Link'].index('>')]
+    response = client.get(next_url)
+    assert response.status_code == 200
+    assert [x['frame_number'] for x in response.get_json()['frames']] == [60,
+                                                                          70]
+    assert 'X-Next-Cursor' not in response.headers
+
+    response = client.get('/api/saved_frames/range?time_from=x')
+    assert response.status_code == 400
+    assert response.get_json() == {"video_file_name": "Required field."}
+    response = client.get('/api/saved_frames/range?video_file_name=a.mp4'
+                          '&time_from=x&cursor=abc')
+    assert response.status_code == 400
+    assert response.get_json() == {
+        "cursor": "Invalid cursor.",
+        "time_from": "Required number type",
+    }
+
+
+def test_route_saved_frames_create_bulk(
+        client: 'FlaskClient',
+        app: 'Flask',
+        db: 'SQLAlchemy',
+        clean_frames_dir: None
+) -> None:
+    """Функция проверяет ответ сервера по маршруту /api/saved_frames/new_frames
+    при сохранении служебной информации о нескольких кадрах.
+
+    Args:
+        client: Тестовый клиент.
+        app: Flask приложение.
+        db: Вызов фикстуры для очистки базы данных перед выполнением теста.
+        clean_frames_dir: Вызов фикстуры для удаления всех файлов в каталоге с
+          фреймами перед выполнением теста.
+    """
+    response = client.get('/api/frames?file_name=sample-1.mp4&time_in_video=0')
+    assert response.status_code == 200
+    frames_dir_path = Config().flask['FRAMES_DIR_PATH']
+    create_frame_service_information(
+        app, db, 'sample-1.mp4', 2,
+        os.path.join(frames_dir_path, 'sample-1.mp4', '0', '2.png')
+    )
+
+    def created(frame_number: int, status: str) -> dict:
+        return {
+            "file_path": 'sample-1.mp4',
+            "frame_number": frame_number,
+            "frame_path": os.path.join(frames_dir_path, 'sample-1.mp4', '0',
+                                       f'{frame_number}.png'),
+            "status": status,
+        }
+
+    request_body = {
+        'frames': [
+            {'file_path': 'sample-1.mp4', 'frame_number': 1},
+            {'file_path': 'sample-1.mp4', 'frame_number': 2},
+            {'file_path': 'sample-1.mp4', 'frame_number': 3},
+            {'file_path': 'sample-1.mp4', 'frame_number': 1},
+            {'file_path': 'sample-1.mp4', 'frame_number': 100},
+            {'file_path': 'sample-2.mp4', 'frame_number': 1},
+            {'file_path': 'sample-1.mp4', 'frame_number': -1},
+            {'file_path': 'sample-1.mp4'},
+            [],
+        ]
+    }
+    response = client.post('/api/saved_frames/new_frames', json=request_body)
+    assert response.status_code == 200
+    assert response.get_json() == {
+        "frames": [
+            created(1, 'created'),
+            created(2, 'exists'),
+            created(3, 'created'),
+            created(1, 'exists'),
+            {"message": "Frame doesn't exist."},
+            {"message": "Frame doesn't exist."},
+            {"errors": {"frame_number": "Less than minimum value 0."}},
+            {"errors": {"frame_number": "Required field."}},
+            {"errors": {
+                "file_path": "Required field.",
+                "frame_number": "Required field.",
+            }},
+        ]
+    }
+
+    with app.app_context():
+        stmt = select(FrameServiceInformation.frame_number).order_by(
+            FrameServiceInformation.frame_number)
+        assert db.session.execute(stmt).scalars().all() == [1, 2, 3]
+
+    response = client.post('/api/saved_frames/new_frames', json={})
+    assert response.status_code == 400
+    assert response.get_json() == {"frames": "Required field."}
+
+
+def test_route_saved_frames_slow_query_log(
+        client: 'FlaskClient',
+        db: 'SQLAlchemy',
+        caplog: pytest.LogCaptureFixture,
+        monkeypatch: pytest.MonkeyPatch
+        ) -> None:
+    """Функция проверяет запись медленных запросов к БД в журнал с именем
+    маршрута.
+
+    Args:
+        client: Тестовый клиент.
+        db: Вызов фикстуры для очистки базы данных перед выполнением теста.
+        caplog: Записи журнала.
+        monkeypatch: Подмена порога медленных запросов.
+    """
+    monkeypatch.setattr(metrics, '_slow_query_seconds', 0)
+    with caplog.at_level(logging.WARNING, logger='src.slow_queries'):
+        response = client.get('/api/saved_frames')
+    assert response.status_code == 200
+    messages = [x.getMessage() for x in caplog.records]
+    assert any(x.startswith('Slow query ')
+               and ' in saved_frames.get_saved_frames: SELECT ' in x
+               for x in messages)
@@ -1,16 +1,27 @@
+import os
 from typing import TYPE_CHECKING
 
 from src.utils.config import Config
 
 if TYPE_CHECKING:
     from flask.testing import FlaskClient
+    from flask_sqlalchemy import SQLAlchemy
 
 
-def test_route_videos(client: 'FlaskClient'):
+def _file_names_and_paths(response_json: list) -> list:
+    return sorted(
+        [{"file_name": x["file_name"], "file_path": x["file_path"]}
+         for x in response_json],
+        key=lambda x: x['file_name']
+    )
+
+
+def test_route_videos(client: 'FlaskClient', db: 'SQLAlchemy'):
     """Тестирует получаемый от сервера список файлов из папки с видео.
 
     Args:
         client: Тестовый клиент.
+        db: Экземпляр класса для работы с базой данных.
     """
     config = Config()
     video_dir_path = config.flask['VIDEOS_DIR_PATH']
@@ -44,9 +55,58 @@ def test_route_videos(client: 'FlaskClient'):
 
     response = client.get('/api/videos')
     assert response.status_code == 200
-    assert sorted(response.get_json(), key=lambda x: x['file_name']) == expected
+    assert _file_names_and_paths(response.get_json()) == expected
+    for x in response.get_json():
+        assert x['size'] == os.path.getsize(x['file_path'])
 
     # check idempotent
     response = client.get('/api/videos')
     assert response.status_code == 200
-    assert sorted(response.get_json(), key=lambda x: x['file_name']) == expected
+    assert _file_names_and_paths(response.get_json()) == expected
+
+
+def test_route_videos_pages(client: 'FlaskClient', db: 'SQLAlchemy'):
+    """Тестирует постраничное получение списка видеофайлов, фильтр по
+    началу имени файла и условные запросы с ETag.
+
+    Args:
+        client: Тестовый клиент.
+        db: Экземпляр класса для работы с базой данных.
+    """
+    response = client.get('/api/videos')
+    all_videos = response.get_json()
+    assert [x['file_name'] for x in all_videos] == sorted(
+        x['file_name'] for x in all_videos)
+
+    videos = []
+    url = '/api/videos?limit=4'
+    while url is not None:
+        response = client.get(url)
+        assert response.status_code == 200
+        videos.extend(response.get_json())
+        url = None
+        if 'X-Next-Cursor' in response.headers:
+            cursor = response.headers['X-Next-Cursor']
+            url = f'/api/videos?limit=4&cursor={cursor}'
+    assert videos == all_videos
+
+    response = client.get('/api/videos?prefix=sample-')
+    assert response.status_code == 200
+    assert [x['file_name'] for x in response.get_json()] == [
+        'sample-1.mp4', 'sample-2.mp4', 'sample-3.mp4']
+
+    response = client.get('/api/videos?prefix=%25')
+    assert response.status_code == 200
+    assert response.get_json() == []
+
+    etag = response.headers['ETag']
+    response = client.get('/api/videos?prefix=%25',
+                          headers={'If-None-Match': etag})
+    assert response.status_code == 304
+
+    response = client.get('/api/videos?limit=0&cursor=abc')
+    assert response.status_code == 400
+    assert response.get_json() == {
+        "limit": "Less than minimum value 1.",
+        "cursor": "Invalid cursor."
+    }
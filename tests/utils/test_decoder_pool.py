@@ -0,0 +1,87 @@
+import os
+import threading
+
+import numpy as np
+
+from src.utils.config import Config
+from src.utils.decoder_pool import (MAX_DECODE_AHEAD, DecoderPool,
+                                     get_decoder_pool)
+from src.utils.frame_cache import video_key
+from src.utils.get_frames import extract_frame
+from src.utils.metrics import DECODER_REUSES
+
+
+def test_decoder_pool_scrubbing() -> None:
+    """Функция проверяет, что последовательные запросы к одному видеофайлу
+    продолжают декодирование открытым видеофайлом и возвращают те же кадры,
+    что и последовательное чтение с начала файла.
+    """
+    video_path = os.path.join(Config().flask['VIDEOS_DIR_PATH'],
+                              'sample-2.mp4')
+    get_decoder_pool().close_idle()
+
+    reuses = DECODER_REUSES._value.get()
+    for time_in_video in range(0, 6):
+        first_frame, frames = extract_frame(video_path, time_in_video)
+        expected_first_frame, expected_frames = extract_frame(
+            video_path, time_in_video, seek=False)
+        assert first_frame == expected_first_frame
+        assert len(frames) == len(expected_frames)
+        for (frame, expected_frame) in zip(frames, expected_frames):
+            assert np.array_equal(frame, expected_frame)
+    assert DECODER_REUSES._value.get() > reuses
+
+
+def test_decoder_pool_limit() -> None:
+    """Функция проверяет ограничение количества открытых видеофайлов и
+    закрытие неиспользуемых видеофайлов.
+    """
+    video_dir_path = Config().flask['VIDEOS_DIR_PATH']
+    video_paths = [os.path.join(video_dir_path, file_name)
+                   for file_name in ('sample-1.mp4', 'sample-2.mp4')]
+    pool = DecoderPool(max_handles=1, idle_timeout=60)
+
+    first = pool.checkout(video_paths[0], video_key(video_paths[0]), 0, 0)
+    waiting = []
+
+    def checkout_second():
+        waiting.append(pool.checkout(video_paths[1],
+                                     video_key(video_paths[1]), 0, 0))
+
+    thread = threading.Thread(target=checkout_second)
+    thread.start()
+    thread.join(0.2)
+    # все видеофайлы используются
+    assert thread.is_alive()
+
+    pool.checkin(first)
+    thread.join(5)
+    assert not thread.is_alive()
+    assert first.cap.isOpened() is False
+    second = waiting[0]
+    assert second.video_path == video_paths[1]
+
+    pool.checkin(second)
+    pool.close_idle()
+    assert second.cap.isOpened() is False
+
+
+def test_decoder_pool_far_without_keyframe() -> None:
+    """Функция проверяет, что без известного ключевого кадра видеофайл
+    переиспользуется, только если нужный кадр недалеко от позиции декодера.
+    """
+    video_path = os.path.join(Config().flask['VIDEOS_DIR_PATH'],
+                              'sample-1.mp4')
+    key = video_key(video_path)
+    pool = DecoderPool(max_handles=2, idle_timeout=60)
+
+    handle = pool.checkout(video_path, key, 0, None)
+    handle.position = 10
+    pool.checkin(handle)
+    far = pool.checkout(video_path, key, 11 + MAX_DECODE_AHEAD, None)
+    assert far is not handle
+    pool.checkin(far)
+    assert pool.checkout(video_path, key, 10 + MAX_DECODE_AHEAD,
+                         None) is handle
+    pool.checkin(handle)
+    pool.close_idle()
@@ -0,0 +1,124 @@
+import os
+from typing import TYPE_CHECKING
+
+from src.utils.frame_cache import FrameCache, video_key
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def make_frames(frame_dir: 'Path',
+                first_frame: int,
+                frames_count: int,
+                size: int = 100) -> list:
+    """Функция создаёт файлы кадров заданного размера.
+
+    Args:
+        frame_dir: Каталог для файлов кадров.
+        first_frame: Номер первого кадра.
+        frames_count: Количество кадров.
+        size: Размер каждого файла в байтах.
+
+    Returns:
+        Список путей к созданным файлам.
+    """
+    frame_dir.mkdir(exist_ok=True)
+    frame_paths = []
+    for i in range(first_frame, first_frame + frames_count):
+        frame_path = frame_dir / f'{i}.png'
+        frame_path.write_bytes(b'\0' * size)
+        frame_paths.append(str(frame_path))
+    return frame_paths
+
+
+def test_frame_cache_hit_and_miss(tmp_path: 'Path') -> None:
+    """Функция проверяет попадания и промахи кеша кадров.
+
+    Args:
+        tmp_path: Временный каталог.
+    """
+    video_path = tmp_path / 'video.mp4'
+    video_path.write_bytes(b'video')
+    cache = FrameCache(str(tmp_path / 'index.sqlite3'), 10_000)
+
+    assert cache.get(str(video_path), 1, 3) is None
+    frame_paths = make_frames(tmp_path / 'video.mp4.frames', 30, 3)
+    cache.put(str(video_path), 1, 30, frame_paths)
+
+    assert cache.get(str(video_path), 1, 3) == (30, frame_paths)
+    assert cache.get(str(video_path), 2, 3) is None
+    assert cache.get(str(video_path), 1, 4) is None
+
+    stats = cache.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 3
+    assert stats['size'] == 300
+
+
+def test_frame_cache_video_changed(tmp_path: 'Path') -> None:
+    """Функция проверяет, что изменение видеофайла делает недействительными
+    кадры в кеше.
+
+    Args:
+        tmp_path: Временный каталог.
+    """
+    video_path = tmp_path / 'video.mp4'
+    video_path.write_bytes(b'video')
+    cache = FrameCache(str(tmp_path / 'index.sqlite3'), 10_000)
+    frame_paths = make_frames(tmp_path / 'frames', 0, 2)
+    cache.put(str(video_path), 0, 0, frame_paths)
+    key = video_key(str(video_path))
+
+    video_path.write_bytes(b'another video')
+    assert video_key(str(video_path)) != key
+    assert cache.get(str(video_path), 0, 2) is None
+
+
+def test_frame_cache_removed_file(tmp_path: 'Path') -> None:
+    """Функция проверяет промах кеша при удалении файла с кадром.
+
+    Args:
+        tmp_path: Временный каталог.
+    """
+    video_path = tmp_path / 'video.mp4'
+    video_path.write_bytes(b'video')
+    cache = FrameCache(str(tmp_path / 'index.sqlite3'), 10_000)
+    frame_paths = make_frames(tmp_path / 'frames', 0, 2)
+    cache.put(str(video_path), 0, 0, frame_paths)
+
+    os.remove(frame_paths[1])
+    assert cache.get(str(video_path), 0, 2) is None
+    assert cache.stats()['size'] == 100
+
+
+def test_frame_cache_lru_eviction(tmp_path: 'Path') -> None:
+    """Функция проверяет вытеснение давно не запрашиваемых кадров и
+    сохранение закреплённых кадров.
+
+    Args:
+        tmp_path: Временный каталог.
+    """
+    video_path = tmp_path / 'video.mp4'
+    video_path.write_bytes(b'video')
+    cache = FrameCache(str(tmp_path / 'index.sqlite3'), 400)
+
+    first_paths = make_frames(tmp_path / 'frames', 0, 2)
+    cache.put(str(video_path), 0, 0, first_paths)
+    second_paths = make_frames(tmp_path / 'frames', 10, 2)
+    cache.put(str(video_path), 1, 10, second_paths)
+    cache.pin(second_paths[0])
+    # первые кадры запрошены последними
+    assert cache.get(str(video_path), 0, 2) == (0, first_paths)
+
+    third_paths = make_frames(tmp_path / 'frames', 20, 2)
+    cache.put(str(video_path), 2, 20, third_paths)
+
+    assert os.path.isfile(second_paths[0])
+    assert not os.path.isfile(second_paths[1])
+    assert all(os.path.isfile(p) for p in first_paths[1:] + third_paths)
+    assert cache.get(str(video_path), 1, 2) is None
+    assert cache.get(str(video_path), 2, 2) == (20, third_paths)
+
+    stats = cache.stats()
+    assert stats['size'] <= 400
+    assert stats['evictions'] == 2
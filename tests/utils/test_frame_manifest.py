@@ -0,0 +1,143 @@
+import os
+from typing import TYPE_CHECKING
+
+from src.utils import frame_manifest
+from src.utils.config import Config
+from src.utils.frame_manifest import (MANIFEST_NAME, FrameManifest,
+                                      frame_file_path, get_frame_manifest)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from flask.testing import FlaskClient
+    from flask_sqlalchemy import SQLAlchemy
+
+
+def write_frame(frame_path: str, size: int = 10) -> str:
+    """Функция создаёт файл кадра заданного размера.
+
+    Returns:
+        Путь к файлу.
+    """
+    os.makedirs(os.path.dirname(frame_path), exist_ok=True)
+    with open(frame_path, 'wb') as file:
+        file.write(b'\0' * size)
+    return frame_path
+
+
+def test_frame_manifest_shared(tmp_path: 'Path') -> None:
+    """Функция проверяет, что манифест видит кадры, добавленные и удалённые
+    через другой экземпляр, например в другом процессе.
+
+    Args:
+        tmp_path: Временный каталог.
+    """
+    frame_dir = str(tmp_path)
+    bucket_size = Config().flask['FRAME_BUCKET_SIZE']
+    writer = FrameManifest(frame_dir)
+    reader = FrameManifest(frame_dir)
+    assert reader.find(5, 'png') is None
+
+    first_path = write_frame(frame_file_path(frame_dir, 5, 'png'))
+    second_path = write_frame(frame_file_path(frame_dir, bucket_size, 'png'),
+                              20)
+    assert first_path == os.path.join(frame_dir, '0', '5.png')
+    assert second_path == os.path.join(frame_dir, '1', f'{bucket_size}.png')
+    writer.add([first_path, second_path])
+    assert reader.find(5, 'png') == first_path
+    assert reader.find(5, 'jpg') is None
+    assert reader.entries() == {(5, 'png'): (first_path, 10),
+                                (bucket_size, 'png'): (second_path, 20)}
+
+    # line not finished before a crash
+    with open(os.path.join(frame_dir, MANIFEST_NAME), 'a') as file:
+        file.write('[7,"pn')
+    writer.remove([first_path])
+    assert reader.find(5, 'png') is None
+    assert list(FrameManifest(frame_dir).entries()) == [(bucket_size, 'png')]
+
+
+def test_frame_manifest_migration(
+        client: 'FlaskClient',
+        db: 'SQLAlchemy',
+        clean_frames_dir: None
+        ) -> None:
+    """Функция проверяет, что кадры, сохранённые в каталог видеофайла до
+    распределения по подкаталогам, попадают в манифест и остаются на месте.
+
+    Args:
+        client: Тестовый клиент.
+        db: Вызов фикстуры для очистки базы данных перед выполнением теста.
+        clean_frames_dir: Вызов фикстуры для удаления всех файлов в каталоге
+          с фреймами перед выполнением теста.
+    """
+    frame_dir = os.path.join(Config().flask['FRAMES_DIR_PATH'],
+                             'sample-1.mp4')
+    flat_path = write_frame(os.path.join(frame_dir, '100.png'))
+    write_frame(os.path.join(frame_dir, 'notes.txt'))
+
+    response = client.post('/api/saved_frames/new_frame',
+                           json={'file_path': 'sample-1.mp4',
+                                 'frame_number': 100})
+    assert response.status_code == 201
+    assert response.get_json()['frame_path'] == flat_path
+    # a lookup doesn't write to the directory
+    assert sorted(os.listdir(frame_dir)) == ['100.png', 'notes.txt']
+
+    response = client.get('/api/frames?file_name=sample-1.mp4&time_in_video=0')
+    assert response.status_code == 200
+    manifest = get_frame_manifest(frame_dir)
+    assert manifest.find(100, 'png') == flat_path
+    assert manifest.find(0, 'png') == frame_file_path(frame_dir, 0, 'png')
+    assert len(manifest.entries()) == Config().flask['SAVE_FRAMES_COUNT'] + 1
+
+
+def test_frame_manifest_legacy_scan_cached(tmp_path: 'Path',
+                                           monkeypatch) -> None:
+    """Функция проверяет, что каталог без манифеста перечисляется заново
+    только после изменения каталога.
+
+    Args:
+        tmp_path: Временный каталог.
+        monkeypatch: Фикстура для подмены атрибутов класса.
+    """
+    frame_dir = str(tmp_path)
+    write_frame(os.path.join(frame_dir, '100.png'))
+    scans = []
+    scan = FrameManifest._scan
+
+    def counting_scan(self):
+        scans.append(1)
+        return scan(self)
+
+    monkeypatch.setattr(FrameManifest, '_scan', counting_scan)
+    manifest = FrameManifest(frame_dir)
+    assert manifest.find(100, 'png') is not None
+    assert manifest.find(101, 'png') is None
+    assert len(scans) == 1
+
+    flat_path = write_frame(os.path.join(frame_dir, '101.png'))
+    assert manifest.find(101, 'png') == flat_path
+    assert len(scans) == 2
+    assert not os.path.exists(os.path.join(frame_dir, MANIFEST_NAME))
+
+
+def test_frame_manifest_compaction(tmp_path: 'Path', monkeypatch) -> None:
+    """Функция проверяет, что манифест переписывается без заменённых
+    записей.
+
+    Args:
+        tmp_path: Временный каталог.
+        monkeypatch: Фикстура для подмены атрибутов модуля.
+    """
+    monkeypatch.setattr(frame_manifest, '_COMPACT_SLACK', 5)
+    frame_dir = str(tmp_path)
+    frame_path = write_frame(frame_file_path(frame_dir, 1, 'png'))
+    manifest = FrameManifest(frame_dir)
+    reader = FrameManifest(frame_dir)
+    reader.entries()
+    for _ in range(10):
+        manifest.add([frame_path])
+
+    with open(os.path.join(frame_dir, MANIFEST_NAME)) as file:
+        assert len(file.readlines()) < 10
+    assert reader.entries() == {(1, 'png'): (frame_path, 10)}
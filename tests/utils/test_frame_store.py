@@ -0,0 +1,134 @@
+import os
+
+import cv2
+import numpy as np
+
+from src.utils.config import Config
+from src.utils.encode_frames import FRAME_FORMATS, write_frames
+from src.utils.frame_store import (OBJECTS_DIR_NAME, content_hash,
+                                   object_path, perceptual_hash,
+                                   remove_frame_file, write_frame_file)
+from src.utils.get_frames import save_frames
+
+
+def test_write_frame_file_deduplicated(clean_frames_dir: None) -> None:
+    """Функция проверяет, что одинаковые кадры хранятся на диске один раз,
+    а содержимое удаляется вместе с последним файлом, который на него
+    ссылается.
+
+    Args:
+        clean_frames_dir: Вызов фикстуры для удаления всех файлов в каталоге
+          с фреймами перед выполнением теста.
+    """
+    frame_dir = os.path.join(Config().flask['FRAMES_DIR_PATH'], 'video.mp4')
+    os.makedirs(frame_dir)
+    first_path = os.path.join(frame_dir, '0.png')
+    second_path = os.path.join(frame_dir, '1.png')
+    data = b'frame'
+
+    assert write_frame_file(first_path, data) == content_hash(data)
+    assert write_frame_file(second_path, data) == content_hash(data)
+    stored_path = object_path(first_path, content_hash(data))
+    assert os.path.samefile(first_path, stored_path)
+    assert os.path.samefile(second_path, stored_path)
+    with open(second_path, 'rb') as file:
+        assert file.read() == data
+
+    remove_frame_file(first_path, content_hash(data))
+    assert not os.path.exists(first_path)
+    assert os.path.isfile(stored_path)
+    remove_frame_file(second_path, content_hash(data))
+    assert not os.path.exists(stored_path)
+
+
+def test_write_frame_file_replaced(clean_frames_dir: None) -> None:
+    """Функция проверяет, что содержимое заменённого кадра удаляется из
+    хранилища, только когда на него больше не ссылаются другие файлы.
+
+    Args:
+        clean_frames_dir: Вызов фикстуры для удаления всех файлов в каталоге
+          с фреймами перед выполнением теста.
+    """
+    frame_dir = os.path.join(Config().flask['FRAMES_DIR_PATH'], 'video.mp4')
+    os.makedirs(frame_dir)
+    first_path = os.path.join(frame_dir, '0.png')
+    second_path = os.path.join(frame_dir, '1.png')
+
+    write_frame_file(first_path, b'old')
+    write_frame_file(second_path, b'old')
+    old_path = object_path(first_path, content_hash(b'old'))
+    write_frame_file(first_path, b'new')
+    assert os.path.isfile(old_path)
+
+    write_frame_file(second_path, b'newer')
+    assert not os.path.exists(old_path)
+    with open(second_path, 'rb') as file:
+        assert file.read() == b'newer'
+    write_frame_file(second_path, b'newer')
+    assert os.path.isfile(object_path(second_path, content_hash(b'newer')))
+
+
+def test_save_frames_deduplicated(clean_frames_dir: None) -> None:
+    """Функция проверяет, что повторное сохранение тех же кадров с другим
+    шагом ссылается на уже записанное содержимое.
+
+    Args:
+        clean_frames_dir: Вызов фикстуры для удаления всех файлов в каталоге
+          с фреймами перед выполнением теста.
+    """
+    config = Config()
+    video_path = os.path.join(config.flask['VIDEOS_DIR_PATH'], 'sample-1.mp4')
+    objects_dir = os.path.join(config.flask['FRAMES_DIR_PATH'],
+                               OBJECTS_DIR_NAME)
+    first_dir = os.path.join(config.flask['FRAMES_DIR_PATH'], 'first')
+    second_dir = os.path.join(config.flask['FRAMES_DIR_PATH'], 'second')
+
+    _, first_paths = save_frames(video_path, 0, first_dir, frames_count=4)
+    _, second_paths = save_frames(video_path, 0, second_dir, frames_count=2,
+                                  step=2)
+    assert os.path.samefile(first_paths[0], second_paths[0])
+    assert os.path.samefile(first_paths[2], second_paths[1])
+    stored = [name for (_, _, names) in os.walk(objects_dir) for name in names]
+    assert len(stored) == len({os.stat(p).st_ino for p in first_paths})
+
+
+def test_perceptual_hash() -> None:
+    """Функция проверяет, что перцептивный хеш не меняется от шума
+    и меняется при изменении изображения.
+    """
+    rng = np.random.default_rng(0)
+    gradient = np.tile(np.arange(0, 256, 2, dtype=np.uint8), (96, 1))
+    image = np.dstack([gradient] * 3)
+    noise = rng.integers(-2, 3, image.shape)
+    noisy = np.clip(image.astype(int) + noise, 0, 255).astype(np.uint8)
+
+    image_hash = perceptual_hash(image)
+    assert perceptual_hash(noisy) == image_hash
+    assert perceptual_hash(image[:, ::-1]) != image_hash
+
+
+def test_write_frames_flat_colours(clean_frames_dir: None,
+                                   monkeypatch) -> None:
+    """Функция проверяет, что однотонные кадры разного цвета с одинаковым
+    перцептивным хешем хранятся и читаются по отдельности.
+
+    Args:
+        clean_frames_dir: Вызов фикстуры для удаления всех файлов в каталоге
+          с фреймами перед выполнением теста.
+        monkeypatch: Фикстура для подмены настроек.
+    """
+    monkeypatch.setitem(Config().flask, 'FRAME_PERCEPTUAL_HASH', True)
+    frame_dir = os.path.join(Config().flask['FRAMES_DIR_PATH'], 'video.mp4')
+    os.makedirs(frame_dir)
+    colours = [(0, 0, 0), (255, 255, 255), (0, 0, 255)]
+    frames = [np.full((32, 48, 3), colour, dtype=np.uint8)
+              for colour in colours]
+    frame_paths = [os.path.join(frame_dir, f'{i}.png')
+                   for i in range(len(frames))]
+
+    written = write_frames(frames, frame_paths, FRAME_FORMATS['png'], 3)
+    assert len({key for (_, key, _) in written}) == len(frames)
+    assert len({image_hash for (_, _, image_hash) in written}) == 1
+    assert len({os.stat(p).st_ino for p in frame_paths}) == len(frames)
+    for (frame, frame_path) in zip(frames, frame_paths):
+        assert np.array_equal(cv2.imread(frame_path), frame)
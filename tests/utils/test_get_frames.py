@@ -0,0 +1,183 @@
+import os
+import threading
+
+import numpy as np
+import pytest
+
+from src.utils import get_frames
+from src.utils.config import Config
+from src.utils.get_frames import (FrameBuffers, extract_frame,
+                                  iter_encoded_frames, iter_frame_ranges,
+                                  iter_frames)
+
+
+@pytest.mark.parametrize('file_name', [
+    'sample-1.mp4',
+    'sample-2.mp4',
+    'sample-3.mp4',
+    'пример-1.mp4',
+])
+@pytest.mark.parametrize('time_in_video', [0, 1, 2, 5, 13, 29])
+def test_extract_frame_seek_equals_linear(
+        file_name: str,
+        time_in_video: int
+        ) -> None:
+    """Функция проверяет, что извлечение кадров с переходом к ключевому кадру
+    возвращает те же кадры, что и последовательное чтение с начала файла.
+
+    Args:
+        file_name: Имя видеофайла.
+        time_in_video: Время от начала видеофайла в секундах.
+    """
+    video_path = os.path.join(Config().flask['VIDEOS_DIR_PATH'], file_name)
+
+    seek_first_frame, seek_frames = extract_frame(video_path, time_in_video)
+    linear_first_frame, linear_frames = extract_frame(video_path,
+                                                      time_in_video,
+                                                      seek=False)
+
+    assert seek_first_frame == linear_first_frame
+    assert len(seek_frames) == len(linear_frames)
+    for seek_frame, linear_frame in zip(seek_frames, linear_frames):
+        assert np.array_equal(seek_frame, linear_frame)
+
+
+@pytest.mark.parametrize('seek', [True, False])
+@pytest.mark.parametrize('step', [2, 7, 45])
+def test_extract_frame_step(step: int, seek: bool) -> None:
+    """Функция проверяет, что извлечение каждого step-го кадра возвращает
+    те же кадры, что и извлечение всех кадров подряд.
+
+    Args:
+        step: Разница номеров соседних кадров.
+        seek: Переходить к ключевым кадрам.
+    """
+    video_path = os.path.join(Config().flask['VIDEOS_DIR_PATH'],
+                              'sample-2.mp4')
+    frames_count = 5
+
+    first_frame, frames = extract_frame(video_path, 1, seek,
+                                        frames_count=frames_count, step=step)
+    expected_first_frame, expected_frames = extract_frame(
+        video_path, 1, frames_count=(frames_count - 1) * step + 1
+    )
+    assert first_frame == expected_first_frame
+    assert len(frames) == frames_count
+    for (frame, expected_frame) in zip(frames, expected_frames[::step]):
+        assert np.array_equal(frame, expected_frame)
+
+
+@pytest.mark.parametrize('seek', [True, False])
+def test_iter_frames_reuses_buffers(seek: bool) -> None:
+    """Функция проверяет, что кадры декодируются в ограниченное количество
+    переиспользуемых буферов и совпадают с кадрами, извлечёнными без
+    переиспользования.
+
+    Args:
+        seek: Переходить к ключевым кадрам.
+    """
+    video_path = os.path.join(Config().flask['VIDEOS_DIR_PATH'],
+                              'sample-2.mp4')
+    buffers = FrameBuffers(2)
+    first_frame, frames = iter_frames(video_path, 1, seek, frames_count=20,
+                                      buffers=buffers)
+    expected_first_frame, expected_frames = extract_frame(video_path, 1,
+                                                          frames_count=20)
+
+    assert first_frame == expected_first_frame
+    addresses = set()
+    count = 0
+    for (frame, expected_frame) in zip(frames, expected_frames):
+        assert np.array_equal(frame, expected_frame)
+        addresses.add(frame.ctypes.data)
+        count += 1
+        buffers.release(frame)
+    assert count == 20
+    assert len(addresses) <= 2
+
+
+@pytest.mark.parametrize('seek', [True, False])
+def test_extract_frame_corrupted_file(seek: bool) -> None:
+    """Функция проверяет извлечение кадров из повреждённого видеофайла.
+
+    Args:
+        seek: Переходить к нужному кадру без декодирования всего файла.
+    """
+    video_path = os.path.join(Config().flask['VIDEOS_DIR_PATH'],
+                              'corrupted_file.mp4')
+    assert extract_frame(video_path, 1, seek=seek) == (None, [])
+
+
+@pytest.mark.parametrize('seek', [True, False])
+@pytest.mark.parametrize('file_name', ['sample-2.mp4', 'sample-3.mp4'])
+def test_iter_frame_ranges_equals_extract_frame(
+        file_name: str,
+        seek: bool
+        ) -> None:
+    """Функция проверяет, что извлечение кадров для нескольких моментов
+    времени возвращает те же кадры, что и извлечение для каждого момента
+    времени по отдельности, используя ограниченное количество буферов.
+
+    Args:
+        file_name: Имя видеофайла.
+        seek: Переходить к ключевым кадрам.
+    """
+    video_path = os.path.join(Config().flask['VIDEOS_DIR_PATH'], file_name)
+    times_in_video = [13, 0, 2, 1, 9, 2, 29, 100]
+    buffers = FrameBuffers(2)
+
+    returned_times = []
+    frame_ranges = iter_frame_ranges(video_path, times_in_video, seek,
+                                     buffers=buffers)
+    for (time_in_video, first_frame, frames) in frame_ranges:
+        returned_times.append(time_in_video)
+        expected_first_frame, expected_frames = extract_frame(video_path,
+                                                              time_in_video)
+        assert first_frame == expected_first_frame
+        count = 0
+        for (frame, expected_frame) in zip(frames, expected_frames):
+            assert np.array_equal(frame, expected_frame)
+            buffers.release(frame)
+            count += 1
+        assert count == len(expected_frames)
+        assert next(frames, None) is None
+    assert returned_times == sorted(set(times_in_video))
+
+
+def test_iter_encoded_frames_single_flight(clean_frames_dir: None,
+                                           monkeypatch) -> None:
+    """Функция проверяет, что одновременные запросы потока кадров
+    с сохранением на диск записывают кадры один раз и возвращают
+    одинаковые кадры.
+
+    Args:
+        clean_frames_dir: Вызов фикстуры для удаления всех файлов в каталоге
+          с фреймами перед выполнением теста.
+        monkeypatch: Фикстура для подмены атрибутов модуля.
+    """
+    config = Config()
+    video_path = os.path.join(config.flask['VIDEOS_DIR_PATH'], 'sample-1.mp4')
+    frame_dir = os.path.join(config.flask['FRAMES_DIR_PATH'], 'sample-1.mp4')
+    written = []
+    write_frame_file = get_frames.write_frame_file
+
+    def counting_write_frame_file(frame_path, data):
+        written.append(frame_path)
+        return write_frame_file(frame_path, data)
+
+    monkeypatch.setattr(get_frames, 'write_frame_file',
+                        counting_write_frame_file)
+    results = []
+
+    def run():
+        _, frames = iter_encoded_frames(video_path, 3, frame_dir)
+        results.append(list(frames))
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(written) == config.flask['SAVE_FRAMES_COUNT']
+    assert len(results) == 4
+    assert all(result == results[0] for result in results)
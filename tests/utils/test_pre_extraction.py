@@ -0,0 +1,99 @@
+import os
+import sys
+import json
+import subprocess
+from typing import TYPE_CHECKING
+
+import pytest
+from sqlalchemy import func, select
+
+from src.models import FrameServiceInformation
+from src.utils.config import Config
+from src.utils.pre_extraction import Schedule, pre_extract, read_journal
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from flask import Flask
+    from flask_sqlalchemy import SQLAlchemy
+
+
+def test_pre_extract_resume(
+        app: 'Flask',
+        db: 'SQLAlchemy',
+        clean_frames_dir: None,
+        tmp_path: 'Path'
+        ) -> None:
+    """Функция проверяет сохранение кадров в пуле процессов, сохранение
+    служебной информации о них в БД и продолжение работы по журналу.
+
+    Args:
+        app: Flask приложение.
+        db: Вызов фикстуры для очистки базы данных.
+        clean_frames_dir: Вызов фикстуры для удаления всех файлов в каталоге
+          с фреймами перед выполнением теста.
+        tmp_path: Временный каталог для журнала.
+    """
+    frames_dir_path = Config().flask['FRAMES_DIR_PATH']
+    journal_path = str(tmp_path / 'journal.jsonl')
+    schedule = Schedule(2, frames_count=3, step=5)
+
+    with app.app_context():
+        summary = pre_extract(schedule, journal_path,
+                              ['sample-1.mp4', 'corrupted_file.mp4'],
+                              processes=2, chunk_size=2, register=True,
+                              progress=None)
+        rows = db.session.execute(
+            select(func.count()).select_from(FrameServiceInformation)
+        ).scalar()
+    assert summary['videos'] == 1
+    assert summary['unreadable'] == 1
+    assert summary['failed'] == 0
+    assert summary['times'] == 3
+    assert summary['frames'] == summary['times'] * 3
+    assert rows == summary['registered'] == summary['frames']
+
+    with open(journal_path, 'r') as file:
+        entries = [json.loads(line) for line in file]
+    assert len(entries) == summary['times']
+    for entry in entries:
+        first_frame = entry['first_frame']
+        for frame_number in (first_frame, first_frame + 5, first_frame + 10):
+            assert os.path.isfile(
+                f'{frames_dir_path}/sample-1.mp4/0/{frame_number}.png')
+
+    # line not finished before a crash
+    with open(journal_path, 'a') as file:
+        file.write('{"file_name": "sample-1.mp4", "time_')
+    assert len(read_journal(journal_path, schedule.variant)) == len(entries)
+
+    resumed = pre_extract(schedule, journal_path, ['sample-1.mp4'],
+                          processes=1, progress=None)
+    assert resumed['times'] == 0
+    assert resumed['skipped'] == summary['times']
+
+    # other extraction parameters are not in the journal
+    other = pre_extract(Schedule(2, end=3, frames_count=1), journal_path,
+                        ['sample-1.mp4'], processes=1, progress=None)
+    assert other['times'] == 2
+    assert other['skipped'] == 0
+    assert len(read_journal(journal_path, schedule.variant)) == len(entries)
+
+
+@pytest.mark.parametrize('args, message', [
+    (['--start', '-1'], '--start must not be negative'),
+    (['--start', '5', '--end', '5'], '--end must be greater than --start'),
+    (['--start', '1000', 'sample-1.mp4'], '--start: sample-1.mp4 is'),
+    (['404.mp4'], "404.mp4: file doesn't exist"),
+])
+def test_pre_extract_frames_invalid_args(args: list, message: str) -> None:
+    """Функция проверяет, что скрипт отклоняет недопустимые моменты времени
+    до извлечения кадров.
+
+    Args:
+        args: Аргументы командной строки.
+        message: Начало сообщения об ошибке.
+    """
+    result = subprocess.run([sys.executable, 'pre_extract_frames.py', *args],
+                            capture_output=True, text=True)
+    assert result.returncode == 2
+    assert f'error: {message}' in result.stderr
@@ -0,0 +1,84 @@
+import os
+import sys
+import subprocess
+from typing import TYPE_CHECKING
+
+from flask import Flask
+
+from src.utils import video_catalog
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_routes_without_opencv() -> None:
+    """Функция проверяет, что создание приложения не импортирует OpenCV и
+    NumPy, а первое извлечение кадров импортирует.
+    """
+    code = (
+        "import sys\n"
+        "from src.utils.config import Config\n"
+        "config = Config('config.yaml')\n"
+        "config.flask['VIDEO_SCAN_INTERVAL'] = 0\n"
+        "from src import create_flask_app\n"
+        "create_flask_app(config.flask)\n"
+        "print('cv2' in sys.modules, 'numpy' in sys.modules)\n"
+        "from src.utils.get_frames import extract_frame\n"
+        "extract_frame('test_videos/sample-1.mp4', 0)\n"
+        "print('cv2' in sys.modules)\n"
+    )
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True,
+                            text=True, check=True).stdout
+    assert output.split() == ['False', 'False', 'True']
+
+
+def test_deferred_video_scanner(monkeypatch) -> None:
+    """Функция проверяет, что сканирование каталога с видео для приложения,
+    созданного после defer_video_scanner, запускается только вызовом
+    start_deferred_video_scanners.
+
+    Args:
+        monkeypatch: Фикстура для подмены атрибутов модуля.
+    """
+    scanned = []
+    monkeypatch.setattr(video_catalog, '_scan_forever',
+                        lambda app, interval: scanned.append(app))
+    monkeypatch.setattr(video_catalog, '_deferred_apps', [])
+    app = Flask(__name__)
+    app.config['VIDEO_SCAN_INTERVAL'] = 60
+
+    video_catalog.defer_video_scanner()
+    assert video_catalog.start_video_scanner(app) is None
+    assert scanned == []
+
+    video_catalog.start_deferred_video_scanners()
+    for thread in video_catalog.threading.enumerate():
+        if thread.name == 'video_scanner':
+            thread.join()
+    assert scanned == [app]
+    assert video_catalog.start_video_scanner(app) is not None
+
+
+def test_metrics_import_without_config(tmp_path: 'Path') -> None:
+    """Функция проверяет, что импорт метрик не читает конфигурационный файл,
+    поэтому работает вне корня репозитория и не мешает загрузить
+    конфигурацию из другого файла.
+
+    Args:
+        tmp_path: Временный каталог.
+    """
+    (tmp_path / 'other.yaml').write_text('flask:\n  PRELOAD_APP: false\n')
+    code = (
+        "import os\n"
+        "import src.utils.metrics\n"
+        "from src.utils.config import Config\n"
+        "print(Config('other.yaml').flask['PRELOAD_APP'])\n"
+        "print('PROMETHEUS_MULTIPROC_DIR' in os.environ)\n"
+    )
+    env = {k: v for (k, v) in os.environ.items()
+           if k != 'PROMETHEUS_MULTIPROC_DIR'}
+    env['PYTHONPATH'] = os.getcwd()
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True,
+                            text=True, check=True, cwd=tmp_path,
+                            env=env).stdout
+    assert output.split() == ['False', 'False']
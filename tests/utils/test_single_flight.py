@@ -0,0 +1,98 @@
+import os
+import time
+import threading
+import multiprocessing
+from typing import TYPE_CHECKING
+
+from src.utils.single_flight import flight_section, single_flight
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _compute_once(result_path: str, log_path: str) -> str:
+    """Функция выполняет вычисление, если его результата ещё нет, и
+    записывает каждое выполнение в журнал.
+    """
+    def lookup():
+        if os.path.exists(result_path):
+            with open(result_path) as file:
+                return file.read()
+        return None
+
+    def compute():
+        with open(log_path, 'a') as file:
+            file.write(f'{os.getpid()}\n')
+        time.sleep(0.2)
+        with open(result_path, 'w') as file:
+            file.write('result')
+        return 'result'
+
+    return single_flight(f'test:{result_path}', lookup, compute)
+
+
+def test_single_flight_threads() -> None:
+    """Функция проверяет, что одновременные вычисления в потоках одного
+    процесса объединяются в одно.
+    """
+    calls = []
+    results = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return 42
+
+    def run():
+        results.append(single_flight('test:threads', lambda: None, compute))
+
+    threads = [threading.Thread(target=run) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert calls == [1]
+    assert results == [42] * 8
+
+
+def test_flight_section_threads() -> None:
+    """Функция проверяет, что одновременное вычисление с тем же ключом ждёт
+    завершения блока flight_section и берёт готовый результат.
+    """
+    stored = []
+    results = []
+
+    def run():
+        results.append(single_flight('test:section', lambda: stored[0]
+                                     if stored else None, lambda: 'again'))
+
+    thread = threading.Thread(target=run)
+    with flight_section('test:section'):
+        thread.start()
+        time.sleep(0.2)
+        stored.append('result')
+    thread.join()
+    assert results == ['result']
+
+
+def test_single_flight_processes(tmp_path: 'Path') -> None:
+    """Функция проверяет, что одновременные вычисления в разных процессах
+    объединяются в одно через блокировку файла.
+
+    Args:
+        tmp_path: Временный каталог.
+    """
+    result_path = str(tmp_path / 'result')
+    log_path = str(tmp_path / 'log')
+    context = multiprocessing.get_context('spawn')
+    processes = [
+        context.Process(target=_compute_once, args=(result_path, log_path))
+        for _ in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+    with open(log_path) as file:
+        assert len(file.readlines()) == 1
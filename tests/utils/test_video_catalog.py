@@ -0,0 +1,43 @@
+from typing import TYPE_CHECKING
+
+from sqlalchemy import func, select
+
+from src.models import Video
+from src.utils import video_catalog
+
+if TYPE_CHECKING:
+    from flask import Flask
+    from flask_sqlalchemy import SQLAlchemy
+
+
+def test_sync_videos(app: 'Flask', db: 'SQLAlchemy') -> None:
+    """Функция проверяет, что каталог не сканируется повторно в течение
+    интервала и не сканируется, пока блокировку держит другой процесс.
+
+    Args:
+        app: Flask приложение.
+        db: Экземпляр класса для работы с базой данных.
+    """
+    with app.app_context():
+        assert video_catalog.sync_videos(60)
+        scanned_at = video_catalog.get_catalog_state().scanned_at
+        assert db.session.execute(
+            select(func.count()).where(Video.probed.is_(False))
+        ).scalar() == 0
+        db.session.rollback()
+
+        assert not video_catalog.sync_videos(60)
+        assert video_catalog.get_catalog_state().scanned_at == scanned_at
+        db.session.rollback()
+
+        with db.engine.connect() as connection:
+            connection.execution_options(isolation_level='AUTOCOMMIT')
+            connection.execute(select(func.pg_advisory_lock(
+                video_catalog._SCAN_LOCK_ID)))
+            assert not video_catalog.sync_videos(0)
+            assert not video_catalog.scan_videos()
+            connection.execute(select(func.pg_advisory_unlock(
+                video_catalog._SCAN_LOCK_ID)))
+
+        assert video_catalog.sync_videos(0)
+        assert video_catalog.get_catalog_state().scanned_at > scanned_at
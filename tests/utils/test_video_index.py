@@ -0,0 +1,63 @@
+import os
+import shutil
+from typing import TYPE_CHECKING
+
+from src.utils.config import Config
+from src.utils.video_index import get_video_index
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_video_index(tmp_path: 'Path') -> None:
+    """Функция проверяет параметры видеофайла и положение ключевых кадров
+    в индексе.
+
+    Args:
+        tmp_path: Временный каталог.
+    """
+    video_path = os.path.join(Config().flask['VIDEOS_DIR_PATH'],
+                              'sample-3.mp4')
+    index = get_video_index(video_path, str(tmp_path))
+
+    assert index.fps == 30
+    assert index.frame_count == 901
+    assert abs(index.duration - 901 / 30) < 1e-6
+    assert [n for (n, _) in index.keyframes][:4] == [0, 90, 180, 270]
+    assert index.keyframes[1][1] == 3.0
+    assert index.frame_number(4) == 120
+    assert index.keyframe_before(120) == 90
+    assert index.keyframe_before(180) == 180
+    assert len(os.listdir(tmp_path)) == 1
+
+
+def test_video_index_invalidation(tmp_path: 'Path') -> None:
+    """Функция проверяет перестроение индекса при изменении видеофайла.
+
+    Args:
+        tmp_path: Временный каталог.
+    """
+    videos_dir_path = Config().flask['VIDEOS_DIR_PATH']
+    video_path = str(tmp_path / 'video.mp4')
+    index_dir_path = str(tmp_path / 'index')
+    shutil.copyfile(os.path.join(videos_dir_path, 'sample-1.mp4'), video_path)
+
+    index = get_video_index(video_path, index_dir_path)
+    assert index.frame_count == 171
+    assert get_video_index(video_path, index_dir_path) is index
+
+    shutil.copyfile(os.path.join(videos_dir_path, 'sample-2.mp4'), video_path)
+    index = get_video_index(video_path, index_dir_path)
+    assert index.frame_count == 400
+    assert [n for (n, _) in index.keyframes] == [0, 250]
+
+
+def test_video_index_corrupted_file(tmp_path: 'Path') -> None:
+    """Функция проверяет индекс повреждённого видеофайла.
+
+    Args:
+        tmp_path: Временный каталог.
+    """
+    video_path = os.path.join(Config().flask['VIDEOS_DIR_PATH'],
+                              'corrupted_file.mp4')
+    assert get_video_index(video_path, str(tmp_path)) is None